@@ -0,0 +1,143 @@
+"""partition_news_articles_by_month
+
+Revision ID: 0c5d8e27b941
+Revises: f3a86c1d07e9
+Create Date: 2026-10-19 15:10:36.448021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c5d8e27b941'
+down_revision: Union[str, None] = 'f3a86c1d07e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ARTICLE_COLUMNS = (
+    "id, title, content, slug, summary, source_urls, image_url, image_variants, "
+    "ai_metadata, prompt_id, published_date, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    # Foreign keys can't reference a partitioned table without its partition key
+    op.drop_constraint('news_images_news_article_id_fkey', 'news_images', type_='foreignkey')
+    op.create_index(op.f('ix_news_images_news_article_id'), 'news_images', ['news_article_id'], unique=False)
+
+    # Move the old table and its constraint names out of the way
+    op.execute("ALTER TABLE news_articles RENAME CONSTRAINT news_articles_pkey TO news_articles_unpartitioned_pkey")
+    op.execute("ALTER TABLE news_articles RENAME CONSTRAINT news_articles_slug_key TO news_articles_unpartitioned_slug_key")
+    op.execute("ALTER TABLE news_articles RENAME CONSTRAINT news_articles_prompt_id_fkey TO news_articles_unpartitioned_prompt_id_fkey")
+    op.rename_table('news_articles', 'news_articles_unpartitioned')
+
+    op.create_table('news_articles',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('slug', sa.String(), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('source_urls', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('image_variants', sa.JSON(), nullable=True),
+    sa.Column('ai_metadata', sa.JSON(), nullable=True),
+    sa.Column('prompt_id', sa.UUID(), nullable=False),
+    sa.Column('published_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ),
+    sa.PrimaryKeyConstraint('id', 'published_date'),
+    sa.UniqueConstraint('slug', 'published_date'),
+    postgresql_partition_by='RANGE (published_date)'
+    )
+
+    # Monthly partitions from the oldest article up to two months ahead;
+    # app/tasks/partitions.py keeps creating them from then on
+    op.execute("""
+        DO $$
+        DECLARE
+            month date;
+            last_month date := (date_trunc('month', now()) + interval '2 months')::date;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(min(published_date), now()))::date
+            INTO month FROM news_articles_unpartitioned;
+
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF news_articles FOR VALUES FROM (%L) TO (%L)',
+                    'news_articles_p' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE news_articles_default PARTITION OF news_articles DEFAULT")
+
+    op.execute(
+        f"INSERT INTO news_articles ({ARTICLE_COLUMNS}) "
+        f"SELECT {ARTICLE_COLUMNS} FROM news_articles_unpartitioned"
+    )
+    op.drop_table('news_articles_unpartitioned')
+
+    op.create_table('news_articles_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('slug', sa.String(), nullable=False),
+    sa.Column('prompt_id', sa.UUID(), nullable=False),
+    sa.Column('published_date', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_news_articles_archive_published_date'), 'news_articles_archive', ['published_date'], unique=False)
+
+
+def downgrade() -> None:
+    # Archived payloads are compressed by the application and can't be
+    # restored in SQL
+    archived = op.get_bind().execute(sa.text("SELECT count(*) FROM news_articles_archive")).scalar()
+    if archived:
+        raise RuntimeError(f"{archived} archived articles must be restored before downgrading")
+
+    op.drop_index(op.f('ix_news_articles_archive_published_date'), table_name='news_articles_archive')
+    op.drop_table('news_articles_archive')
+
+    op.execute("ALTER TABLE news_articles RENAME CONSTRAINT news_articles_pkey TO news_articles_partitioned_pkey")
+    op.execute("ALTER TABLE news_articles RENAME CONSTRAINT news_articles_prompt_id_fkey TO news_articles_partitioned_prompt_id_fkey")
+    op.rename_table('news_articles', 'news_articles_partitioned')
+    op.create_table('news_articles',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('slug', sa.String(), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('source_urls', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('image_url', sa.String(), nullable=True),
+    sa.Column('image_variants', sa.JSON(), nullable=True),
+    sa.Column('ai_metadata', sa.JSON(), nullable=True),
+    sa.Column('prompt_id', sa.UUID(), nullable=False),
+    sa.Column('published_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['prompt_id'], ['prompts.id'], name='news_articles_prompt_id_fkey'),
+    sa.PrimaryKeyConstraint('id', name='news_articles_pkey'),
+    sa.UniqueConstraint('slug', name='news_articles_slug_key')
+    )
+    op.execute(
+        f"INSERT INTO news_articles ({ARTICLE_COLUMNS}) "
+        f"SELECT {ARTICLE_COLUMNS} FROM news_articles_partitioned"
+    )
+    op.execute("DROP TABLE news_articles_partitioned CASCADE")
+
+    op.drop_index(op.f('ix_news_images_news_article_id'), table_name='news_images')
+    op.create_foreign_key(
+        'news_images_news_article_id_fkey',
+        'news_images', 'news_articles',
+        ['news_article_id'], ['id']
+    )
@@ -0,0 +1,26 @@
+"""add_task_listing_index
+
+Revision ID: 2d6f0b8e5a17
+Revises: 7a2e9c4b1f60
+Create Date: 2026-10-19 16:21:05.517382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6f0b8e5a17'
+down_revision: Union[str, None] = '7a2e9c4b1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_created_at_id', 'tasks', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_created_at_id', table_name='tasks')
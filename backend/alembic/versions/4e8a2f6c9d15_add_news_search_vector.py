@@ -0,0 +1,39 @@
+"""add_news_search_vector
+
+Revision ID: 4e8a2f6c9d15
+Revises: 9b3c7e1d4f28
+Create Date: 2026-10-19 17:34:18.640275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a2f6c9d15'
+down_revision: Union[str, None] = '9b3c7e1d4f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Added on the partitioned parent, so every partition computes it;
+    # existing rows are filled in by the table rewrite
+    op.execute(
+        f"ALTER TABLE news_articles ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    op.create_index('ix_news_articles_search_vector', 'news_articles', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_articles_search_vector', table_name='news_articles')
+    op.drop_column('news_articles', 'search_vector')
@@ -0,0 +1,46 @@
+"""add_task_queue_notify_trigger
+
+Revision ID: 5e0b7d3c91a4
+Revises: 93141680c077
+Create Date: 2026-10-19 11:48:02.611870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b7d3c91a4'
+down_revision: Union[str, None] = '93141680c077'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_status_scheduled_at', 'tasks', ['status', 'scheduled_at'])
+
+    # Wake listening task workers whenever a task becomes pending; the
+    # channel name must match TASK_NOTIFY_CHANNEL in app/tasks/worker.py
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_task_queued() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('tasks_queued', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER tasks_queued_notify
+        AFTER INSERT OR UPDATE OF status, scheduled_at ON tasks
+        FOR EACH ROW
+        WHEN (NEW.status = 'pending')
+        EXECUTE FUNCTION notify_task_queued()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_queued_notify ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS notify_task_queued()")
+    op.drop_index('ix_tasks_status_scheduled_at', table_name='tasks')
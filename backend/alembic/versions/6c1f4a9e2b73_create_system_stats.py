@@ -0,0 +1,49 @@
+"""create_system_stats
+
+Revision ID: 6c1f4a9e2b73
+Revises: 4e8a2f6c9d15
+Create Date: 2026-10-19 21:12:08.514327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1f4a9e2b73'
+down_revision: Union[str, None] = '4e8a2f6c9d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('system_stats',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=True),
+    sa.Column('total_users', sa.Integer(), nullable=True),
+    sa.Column('active_users', sa.Integer(), nullable=True),
+    sa.Column('active_sessions', sa.Integer(), nullable=True),
+    sa.Column('total_prompts', sa.Integer(), nullable=True),
+    sa.Column('active_prompts', sa.Integer(), nullable=True),
+    sa.Column('total_news_articles', sa.Integer(), nullable=True),
+    sa.Column('articles_last_24h', sa.Integer(), nullable=True),
+    sa.Column('avg_news_generation_time', sa.Float(), nullable=True),
+    sa.Column('avg_image_generation_time', sa.Float(), nullable=True),
+    sa.Column('system_load', sa.Float(), nullable=True),
+    sa.Column('memory_usage', sa.Float(), nullable=True),
+    sa.Column('pending_tasks', sa.Integer(), nullable=True),
+    sa.Column('failed_tasks', sa.Integer(), nullable=True),
+    sa.Column('completed_tasks', sa.Integer(), nullable=True),
+    sa.Column('api_requests_count', sa.Integer(), nullable=True),
+    sa.Column('error_count', sa.Integer(), nullable=True),
+    sa.Column('detailed_metrics', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_system_stats_timestamp'), 'system_stats', ['timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_system_stats_timestamp'), table_name='system_stats')
+    op.drop_table('system_stats')
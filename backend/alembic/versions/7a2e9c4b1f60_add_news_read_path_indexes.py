@@ -0,0 +1,33 @@
+"""add_news_read_path_indexes
+
+Revision ID: 7a2e9c4b1f60
+Revises: 0c5d8e27b941
+Create Date: 2026-10-19 15:48:12.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2e9c4b1f60'
+down_revision: Union[str, None] = '0c5d8e27b941'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created on the partitioned parent, so every partition gets its own copy
+    op.create_index('ix_news_articles_prompt_id_published_date', 'news_articles', ['prompt_id', sa.text('published_date DESC')], unique=False)
+    op.create_index('ix_news_articles_published_date', 'news_articles', [sa.text('published_date DESC')], unique=False)
+    op.create_index(op.f('ix_prompts_type'), 'prompts', ['type'], unique=False)
+    op.create_index(op.f('ix_prompts_user_id'), 'prompts', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_prompts_user_id'), table_name='prompts')
+    op.drop_index(op.f('ix_prompts_type'), table_name='prompts')
+    op.drop_index('ix_news_articles_published_date', table_name='news_articles')
+    op.drop_index('ix_news_articles_prompt_id_published_date', table_name='news_articles')
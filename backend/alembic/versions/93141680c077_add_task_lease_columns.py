@@ -0,0 +1,30 @@
+"""add_task_lease_columns
+
+Revision ID: 93141680c077
+Revises: caa15f8289cc
+Create Date: 2026-10-19 11:04:27.309114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93141680c077'
+down_revision: Union[str, None] = 'caa15f8289cc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('locked_by', sa.String(), nullable=True))
+    op.add_column('tasks', sa.Column('locked_until', sa.DateTime(), nullable=True))
+    op.add_column('tasks', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'heartbeat_at')
+    op.drop_column('tasks', 'locked_until')
+    op.drop_column('tasks', 'locked_by')
@@ -0,0 +1,39 @@
+"""add_news_snapshots
+
+Revision ID: 9b3c7e1d4f28
+Revises: 2d6f0b8e5a17
+Create Date: 2026-10-19 16:55:41.286930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3c7e1d4f28'
+down_revision: Union[str, None] = '2d6f0b8e5a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('news_snapshots',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('prompt_type', postgresql.ENUM('PUBLIC', 'INTERNAL', 'PRIVATE', name='prompttype', create_type=False), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('article_count', sa.Integer(), nullable=False),
+    sa.Column('prompt_ids', postgresql.ARRAY(sa.UUID()), nullable=False),
+    sa.Column('source_updated_at', sa.DateTime(), nullable=True),
+    sa.Column('is_final', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('snapshot_date', 'prompt_type')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('news_snapshots')
@@ -0,0 +1,39 @@
+"""add_prompt_schedules
+
+Revision ID: b7f2c4e8a613
+Revises: 5e0b7d3c91a4
+Create Date: 2026-10-19 12:31:55.094217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f2c4e8a613'
+down_revision: Union[str, None] = '5e0b7d3c91a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('prompts', sa.Column('schedule_cron', sa.String(), nullable=True))
+    op.add_column('prompts', sa.Column('schedule_interval', sa.Integer(), nullable=True))
+    op.add_column('prompts', sa.Column('priority', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('prompts', sa.Column('next_run_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_prompts_next_run_at'), 'prompts', ['next_run_at'], unique=False)
+
+    # Prompts are now scheduled individually; drop the queued global batch
+    op.execute(
+        "DELETE FROM tasks WHERE name = 'Hourly News Generation' AND status = 'pending'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_prompts_next_run_at'), table_name='prompts')
+    op.drop_column('prompts', 'next_run_at')
+    op.drop_column('prompts', 'priority')
+    op.drop_column('prompts', 'schedule_interval')
+    op.drop_column('prompts', 'schedule_cron')
@@ -0,0 +1,26 @@
+"""add_image_variants_to_news_articles
+
+Revision ID: caa15f8289cc
+Revises: 340f4d676b98
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'caa15f8289cc'
+down_revision: Union[str, None] = '340f4d676b98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news_articles', sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('news_articles', 'image_variants')
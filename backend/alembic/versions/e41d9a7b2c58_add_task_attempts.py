@@ -0,0 +1,26 @@
+"""add_task_attempts
+
+Revision ID: e41d9a7b2c58
+Revises: b7f2c4e8a613
+Create Date: 2026-10-19 13:20:11.782305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41d9a7b2c58'
+down_revision: Union[str, None] = 'b7f2c4e8a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'attempts')
@@ -0,0 +1,26 @@
+"""add_task_checkpoint
+
+Revision ID: f3a86c1d07e9
+Revises: e41d9a7b2c58
+Create Date: 2026-10-19 14:02:48.127604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a86c1d07e9'
+down_revision: Union[str, None] = 'e41d9a7b2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('checkpoint', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'checkpoint')
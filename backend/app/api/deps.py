@@ -1,25 +1,42 @@
 # app/api/deps.py
 
-from typing import AsyncGenerator, Optional, Union, Annotated
-from fastapi import Depends, HTTPException, status, WebSocket
+from typing import AsyncGenerator, Optional, Union, Annotated, Tuple
+from fastapi import Depends, HTTPException, Query, Request, status, WebSocket
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.replicas import replica_router, recently_wrote
 from app.core.security import verify_token
 from app.models.user import User
 from app.models.task import Task, TaskStatus
 from app.core.config import settings
+from app.services.news_queries import parse_fields
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login",
     scheme_name="OAuth2PasswordBearer"
 )
 
+async def replica_reads(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
+) -> None:
+    """Send the request's plain reads to a read replica when one is fresh enough.
+
+    Only for GETs of clients that haven't just written, and never for a
+    session get_db has claimed for writing.
+    """
+    if request.method not in ("GET", "HEAD") or db.info.get("writer") or recently_wrote(request):
+        return
+    replica = replica_router.pick()
+    if replica is not None:
+        db.info["replica"] = replica
+
 async def get_current_user(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
     """Get current authenticated user."""
@@ -65,7 +82,7 @@ async def get_current_superuser(
 
 async def get_websocket_user(
     websocket: WebSocket,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Optional[User]:
     """Get user from WebSocket connection."""
     try:
@@ -95,7 +112,7 @@ async def get_websocket_user(
 async def validate_task_access(
     task_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Task:
     """Validate task access for current user."""
     task = await db.scalar(
@@ -117,6 +134,18 @@ async def validate_task_access(
         
     return task
 
+def get_article_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated article fields to return, or `card` for card views"
+    )
+) -> Optional[Tuple[str, ...]]:
+    """Projection requested for an article list; None returns full articles."""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
 async def get_rate_limit_key(
     current_user: Optional[User] = Depends(get_current_user)
 ) -> str:
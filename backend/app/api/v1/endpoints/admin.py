@@ -1,14 +1,15 @@
 # app/api/v1/endpoints/admin.py
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
-from app.api.deps import get_db, get_current_superuser
+from app.api.deps import get_db, get_read_db, get_current_superuser
 from app.core.security import get_password_hash
 from app.models.user import User
+from app.utils.pagination import Keyset, CountMode, count_rows
 from app.schemas.user import (
     User as UserSchema,
     UserCreate,
@@ -19,27 +20,28 @@ from app.schemas.user import (
 
 router = APIRouter()
 
+USER_KEYSET = Keyset(User.created_at, User.id)
+
 @router.get("/users", response_model=UserList)
 async def list_users(
     skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.EXACT,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_superuser)
 ) -> UserList:
-    """List all users (superuser only)."""
-    # Get total count
-    total = await db.scalar(select(func.count()).select_from(User))
-    
-    # Get users with pagination
-    query = select(User).offset(skip).limit(limit)
-    result = await db.execute(query)
-    users = result.scalars().all()
+    """List all users, newest first (superuser only)."""
+    query = select(User)
+    result = await db.execute(USER_KEYSET.apply(query, cursor, limit, skip))
+    users, next_cursor = USER_KEYSET.page(result.scalars().all(), limit)
     
     return UserList(
         users=users,
-        total=total,
+        total=await count_rows(db, query, count),
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/superuser/create", response_model=UserSchema)
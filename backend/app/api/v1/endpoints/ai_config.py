@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from uuid import UUID
 
-from app.api.deps import get_current_superuser, get_db
+from app.api.deps import get_current_superuser, get_db, get_read_db
 from app.models.user import User
 from app.services.ai_config import AIConfigService
 from app.schemas.ai_config import (
@@ -17,7 +17,7 @@ router = APIRouter()
 
 @router.get("/llm", response_model=List[LLMConfig])
 async def get_llm_configs(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_superuser)
 ):
     service = AIConfigService(db)
@@ -35,7 +35,7 @@ async def create_llm_config(
 
 @router.get("/image", response_model=List[ImageConfig])
 async def get_image_configs(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_superuser)
 ):
     service = AIConfigService(db)
@@ -1,62 +1,68 @@
 # app/api/v1/endpoints/news.py
 
-from datetime import date, datetime, time
-from typing import List
+from datetime import date, datetime
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
-from app.api.deps import get_db, get_current_active_user, get_current_user
+from app.api.deps import get_db, get_read_db, get_current_active_user, get_current_user, get_article_fields
+from app.core.serialization import dumps, article_data
 from app.models.news import NewsArticle
 from app.models.prompt import Prompt, PromptType
 from app.models.user import User
+from app.services.news_archive import NewsArchive
+from app.services.news_embeddings import related_index
+from app.services.news_queries import user_news_query, project, visible_to, KEY_FIELDS, CARD_FIELDS
+from app.services.news_search import NewsSearch
+from app.services.news_snapshots import NewsSnapshots, render_news_day
+from app.utils.dates import day_range
+from app.utils.pagination import Keyset, CountMode, count_rows
 from app.schemas.news import (
     NewsArticleResponse,
     NewsArticleList,
-    NewsDateResponse
+    NewsArticleCardList,
+    NewsDateResponse,
+    NewsFilter,
+    NewsSearchResponse,
+    RelatedNewsList
 )
 
 router = APIRouter()
 
-@router.get("/my", response_model=NewsArticleList)
+NEWS_KEYSET = Keyset(NewsArticle.published_date, NewsArticle.id)
+
+@router.get("/my", response_model=Union[NewsArticleList, NewsArticleCardList])
 async def get_my_news(
     current_user: User = Depends(get_current_user),
     skip: int = 0,
-    limit: int = 20,
-    db: AsyncSession = Depends(get_db)
-) -> NewsArticleList:
-    result = await db.execute(
-        select(NewsArticle, Prompt)
-        .join(Prompt, NewsArticle.prompt_id == Prompt.id)
-        .where(Prompt.user_id == current_user.id)
-        .order_by(NewsArticle.published_date.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    
-    articles = []
-    for news, prompt in result.all():
-        article_response = NewsArticleResponse(
-            **news.__dict__,
-            prompt_type=prompt.type,
-            prompt_name=prompt.name
-        )
-        articles.append(article_response)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.EXACT,
+    fields: Optional[Tuple[str, ...]] = Depends(get_article_fields),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List articles of the user's prompts, newest first.
 
-    total = await db.scalar(
-        select(func.count())
-        .select_from(NewsArticle)
-        .join(Prompt)
-        .where(Prompt.user_id == current_user.id)
-    )
+    With ``fields`` the items are NewsArticleCard projections holding only
+    those fields (NewsArticleCardList).
+    """
+    query = user_news_query(current_user.id)
+    page_query = project(query, fields, with_prompt=True) if fields else query
+    result = await db.execute(NEWS_KEYSET.apply(page_query, cursor, limit, skip))
+    rows, next_cursor = NEWS_KEYSET.page(result.all(), limit, item=lambda row: row[0])
+    total = await count_rows(db, query, count)
 
-    return NewsArticleList(
-        items=articles,
-        total=total or 0,
-        skip=skip,
-        limit=limit
+    # Rows go straight to JSON bytes; the schemas only document the shape
+    return Response(
+        content=dumps({
+            "items": [article_data(news, prompt, fields) for news, prompt in rows],
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }),
+        media_type="application/json"
     )
 
 @router.get("/private/{prompt_name}/{date}/{slug}", response_model=NewsArticleResponse)
@@ -64,13 +70,12 @@ async def get_private_news(
     prompt_name: str,
     date_filter: date,
     slug: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ) -> NewsArticle:
     """Get a specific private news article."""
     # Convert date to datetime range
-    start_date = datetime.combine(date_filter, time.min)
-    end_date = datetime.combine(date_filter, time.max)
+    start_date, end_date = day_range(date_filter)
     
     article = await db.scalar(
         select(NewsArticle)
@@ -78,7 +83,7 @@ async def get_private_news(
         .where(
             Prompt.name == prompt_name,
             NewsArticle.published_date >= start_date,
-            NewsArticle.published_date <= end_date,
+            NewsArticle.published_date < end_date,
             NewsArticle.slug == slug,
             Prompt.type == PromptType.PRIVATE
         )
@@ -99,67 +104,135 @@ async def get_private_news(
     
     return article
 
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    prompt_types: Optional[List[PromptType]] = Query(None),
+    prompt_ids: Optional[List[UUID]] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """Search accessible articles, best matches first.
+
+    ``q`` takes web search syntax: quoted phrases, ``or`` and ``-word``.
+    Title matches outrank summary matches, which outrank body matches.
+    """
+    filters = NewsFilter(
+        date_from=date_from,
+        date_to=date_to,
+        prompt_types=prompt_types,
+        prompt_ids=prompt_ids,
+        search_term=q
+    )
+    hits, has_more = await NewsSearch(db).search(filters, current_user.id, skip, limit)
+    return Response(
+        content=dumps({
+            "items": hits,
+            "query": q,
+            "skip": skip,
+            "limit": limit,
+            "has_more": has_more
+        }),
+        media_type="application/json"
+    )
+
+@router.get("/{article_id}/related", response_model=RelatedNewsList)
+async def get_related_news(
+    article_id: UUID,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """List the accessible articles closest in content to an article."""
+    source = await db.scalar(project(
+        select(NewsArticle)
+        .join(Prompt)
+        .where(NewsArticle.id == article_id, visible_to(current_user.id)),
+        KEY_FIELDS + ("title", "summary", "content")
+    ))
+    if not source:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found"
+        )
+
+    # Over-fetch, as some neighbours may be private to other users or gone
+    scores = dict(await related_index.related(source, limit * 3))
+    items = []
+    if scores:
+        result = await db.execute(project(
+            select(NewsArticle, Prompt)
+            .join(Prompt)
+            .where(NewsArticle.id.in_(list(scores)), visible_to(current_user.id)),
+            CARD_FIELDS,
+            with_prompt=True
+        ))
+        rows = sorted(result.all(), key=lambda row: scores[row[0].id], reverse=True)
+        items = [
+            {**article_data(news, prompt, CARD_FIELDS), "score": round(scores[news.id], 4)}
+            for news, prompt in rows[:limit]
+        ]
+
+    return Response(
+        content=dumps({"article_id": article_id, "items": items}),
+        media_type="application/json"
+    )
+
 @router.get("/{date}/full", response_model=NewsDateResponse)
 async def get_full_news(
     date_filter: date,
+    fields: Optional[Tuple[str, ...]] = Depends(get_article_fields),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
-) -> NewsDateResponse:
-    """Get all accessible news for a specific date."""
-    # Convert date to datetime range
-    start_date = datetime.combine(date_filter, time.min)
-    end_date = datetime.combine(date_filter, time.max)
+) -> Response:
+    """Get all accessible news for a specific date.
+
+    Public and internal articles come pre-serialized from the day's
+    snapshots; only the user's private articles are read per request.
+    With ``fields`` every list is cut down to those article fields.
+    """
+    start_date, end_date = day_range(date_filter)
+    snapshots = await NewsSnapshots(db).current(date_filter)
 
-    # Build query for accessible news with eager loading
+    private = (Prompt.type == PromptType.PRIVATE) & (Prompt.user_id == current_user.id)
     query = (
-        select(NewsArticle)
-        .options(selectinload(NewsArticle.prompt))
+        select(NewsArticle, Prompt)
         .join(Prompt)
         .where(
-            and_(
-                NewsArticle.published_date >= start_date,
-                NewsArticle.published_date <= end_date,
-                (
-                    (Prompt.type == PromptType.PUBLIC) |
-                    (Prompt.type == PromptType.INTERNAL) |
-                    ((Prompt.type == PromptType.PRIVATE) & (Prompt.user_id == current_user.id))
-                )
-            )
+            NewsArticle.published_date >= start_date,
+            NewsArticle.published_date < end_date,
+            private
         )
     )
-    
+    if fields:
+        query = project(query, fields, with_prompt=True)
     result = await db.execute(query)
-    articles = result.scalars().unique().all()
-    
-    # Organize articles by type
-    public_news = []
-    internal_news = []
-    private_news = []
-    
-    for article in articles:
-        if article.prompt.type == PromptType.PUBLIC:
-            public_news.append(NewsArticleResponse(
-                **article.__dict__,
-                prompt_type=article.prompt.type,
-                prompt_name=article.prompt.name
-            ))
-        elif article.prompt.type == PromptType.INTERNAL:
-            internal_news.append(NewsArticleResponse(
-                **article.__dict__,
-                prompt_type=article.prompt.type,
-                prompt_name=article.prompt.name
-            ))
-        else:  # PRIVATE
-            private_news.append(NewsArticleResponse(
-                **article.__dict__,
-                prompt_type=article.prompt.type,
-                prompt_name=article.prompt.name
-            ))
-    
-    return NewsDateResponse(
-        date=datetime.combine(date_filter, time.min),
-        public_news=public_news,
-        internal_news=internal_news,
-        private_news=private_news,
-        total_count=len(articles)
+    articles = [
+        (article_data(article, fields=fields), prompt)
+        for article, prompt in result.all()
+    ]
+
+    # Months past the archive cutoff are read through from the archive tier
+    archive = NewsArchive(db)
+    if archive.covers(start_date):
+        hot_ids = {data['id'] for data, _ in articles}
+        articles.extend(
+            (data, prompt)
+            for data, prompt in await archive.get_articles(start_date, end_date, private)
+            if UUID(str(data['id'])) not in hot_ids
+        )
+
+    private_news = sorted(
+        (article_data(data, prompt, fields) for data, prompt in articles),
+        key=lambda item: item["published_date"],
+        reverse=True
+    )
+
+    return Response(
+        content=render_news_day(date_filter, snapshots, private_news, fields),
+        media_type="application/json"
     )
\ No newline at end of file
@@ -1,16 +1,19 @@
 # app/api/v1/endpoints/prompts.py
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from uuid import UUID
 
-from app.api.deps import get_current_user, get_current_superuser, get_db
+from app.api.deps import get_current_user, get_current_superuser, get_db, get_read_db
+from app.core.cache import response_cache
+from app.services.news_snapshots import NewsSnapshots
 from app.models.user import User
 from app.models.prompt import Prompt, PromptType
 from app.models.prompt_template import PromptTemplate
+from app.utils.pagination import Keyset
 from app.schemas.prompt import (
     Prompt as PromptSchema,
     PromptCreate,
@@ -19,6 +22,8 @@ from app.schemas.prompt import (
 
 router = APIRouter()
 
+PROMPT_KEYSET = Keyset(Prompt.created_at, Prompt.id)
+
 @router.post("/", response_model=PromptSchema)
 async def create_prompt(
     *,
@@ -46,6 +51,7 @@ async def create_prompt(
         await db.commit()
         # Explicitly load the template relationship
         await db.refresh(prompt, ['template'])
+        await response_cache.invalidate()
         return prompt
     except Exception as e:
         await db.rollback()
@@ -56,13 +62,15 @@ async def create_prompt(
 
 @router.get("/", response_model=List[PromptSchema])
 async def get_prompts(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     prompt_type: Optional[PromptType] = None,
     current_user: User = Depends(get_current_user)
 ) -> List[Prompt]:
-    """Get all accessible prompts."""
+    """Get all accessible prompts, newest first; the next page's cursor is in X-Next-Cursor."""
     # Build query with eager loading of template
     query = (
         select(Prompt)
@@ -79,14 +87,16 @@ async def get_prompts(
             ((Prompt.type == PromptType.PRIVATE) & (Prompt.user_id == current_user.id))
         )
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().unique().all()
+    result = await db.execute(PROMPT_KEYSET.apply(query, cursor, limit, skip))
+    prompts, next_cursor = PROMPT_KEYSET.page(result.scalars().unique().all(), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return prompts
 
 @router.get("/{prompt_id}", response_model=PromptSchema)
 async def get_prompt(
     *,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     prompt_id: UUID,
     current_user: User = Depends(get_current_user)
 ) -> Prompt:
@@ -138,9 +148,18 @@ async def update_prompt(
     for field, value in update_data.items():
         setattr(prompt, field, value)
 
+    # Let the prompt scheduler compute a due time under the new schedule
+    if update_data.keys() & {'schedule_cron', 'schedule_interval', 'priority'}:
+        prompt.next_run_at = None
+
+    # Snapshots embed prompt names and are split by prompt type
+    if update_data.keys() & {'name', 'type'}:
+        await NewsSnapshots(db).invalidate_prompt(prompt.id, prompt.type)
+
     try:
         await db.commit()
         await db.refresh(prompt, ['template'])
+        await response_cache.invalidate()
         return prompt
     except Exception as e:
         await db.rollback()
@@ -171,8 +190,10 @@ async def delete_prompt(
         )
 
     try:
+        await NewsSnapshots(db).invalidate_prompt(prompt.id)
         await db.delete(prompt)
         await db.commit()
+        await response_cache.invalidate()
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -1,78 +1,104 @@
-from typing import List
-from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from datetime import date
 
-from app.api.deps import get_db
+from app.api.deps import get_read_db, get_article_fields
+from app.core.cache import response_cache, CachedResponse
+from app.core.serialization import dumps, article_data
 from app.models.news import NewsArticle
 from app.models.prompt import Prompt, PromptType
 from app.schemas.news import NewsArticle as NewsArticleSchema
 from app.schemas.prompt import Prompt as PromptSchema
+from app.services.news_queries import public_news_query, project
+from app.utils.dates import day_range
+from app.utils.pagination import Keyset
 
 router = APIRouter()
 
+NEWS_KEYSET = Keyset(NewsArticle.published_date, NewsArticle.id)
+
+# Serializer for the cached prompt list; articles skip the schemas
+PROMPT_LIST = TypeAdapter(List[PromptSchema])
+
 @router.get("/news", response_model=List[NewsArticleSchema])
 async def get_public_news(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    date_filter: date = None
+    cursor: Optional[str] = None,
+    date_filter: date = None,
+    fields: Optional[Tuple[str, ...]] = Depends(get_article_fields)
 ):
-    """Get public news articles"""
-    query = (
-        select(NewsArticle)
-        .join(Prompt)
-        .where(Prompt.type == PromptType.PUBLIC)
-        .order_by(NewsArticle.published_date.desc())
-    )
-    
-    if date_filter:
-        query = query.where(NewsArticle.published_date.cast(date) == date_filter)
-    
-    news = await db.scalars(
-        query.offset(skip).limit(limit)
-    )
-    return news.all()
+    """Get public news articles; the next page's cursor is in X-Next-Cursor.
+
+    With ``fields`` only those article fields are loaded and returned.
+    """
+    async def render() -> CachedResponse:
+        query = public_news_query(date_filter)
+        if fields:
+            query = project(query, fields)
+        news = await db.scalars(NEWS_KEYSET.apply(query, cursor, limit, skip))
+        items, next_cursor = NEWS_KEYSET.page(news.all(), limit)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return CachedResponse(
+            body=dumps([article_data(article, fields=fields) for article in items]),
+            headers=headers
+        )
+
+    return await response_cache.respond(request, render)
 
 @router.get("/news/{prompt_name}/{date}/{slug}", response_model=NewsArticleSchema)
 async def get_public_news_by_slug(
+    request: Request,
     prompt_name: str,
     date: date,
     slug: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific public news article by its slug"""
-    full_slug = f"{prompt_name}/{date}/{slug}"
-    news = await db.scalar(
-        select(NewsArticle)
-        .join(Prompt)
-        .where(
-            NewsArticle.slug == full_slug,
-            Prompt.type == PromptType.PUBLIC
+    async def render() -> CachedResponse:
+        full_slug = f"{prompt_name}/{date}/{slug}"
+        # The slug's date bounds the lookup to one day (and one partition)
+        start, end = day_range(date)
+        news = await db.scalar(
+            select(NewsArticle)
+            .join(Prompt)
+            .where(
+                NewsArticle.slug == full_slug,
+                NewsArticle.published_date >= start,
+                NewsArticle.published_date < end,
+                Prompt.type == PromptType.PUBLIC
+            )
         )
-    )
-    if not news:
-        raise HTTPException(status_code=404, detail="News article not found")
-    return news
+        if not news:
+            raise HTTPException(status_code=404, detail="News article not found")
+        return CachedResponse(body=dumps(article_data(news)))
+
+    return await response_cache.respond(request, render)
 
 @router.get("/prompts", response_model=List[PromptSchema])
 async def get_public_prompts(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100)
 ):
     """Get all public prompts"""
-    query = (
-        select(Prompt)
-        .options(selectinload(Prompt.template))  # Eager load the template relationship
-        .where(Prompt.type == PromptType.PUBLIC)
-        .order_by(Prompt.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    
-    result = await db.execute(query)
-    prompts = result.scalars().all()
-    return prompts
\ No newline at end of file
+    async def render() -> CachedResponse:
+        query = (
+            select(Prompt)
+            .options(selectinload(Prompt.template))  # Eager load the template relationship
+            .where(Prompt.type == PromptType.PUBLIC)
+            .order_by(Prompt.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return CachedResponse.from_model(PROMPT_LIST, result.scalars().all())
+
+    return await response_cache.respond(request, render)
\ No newline at end of file
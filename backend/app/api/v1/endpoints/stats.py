@@ -6,10 +6,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_superuser
+from app.api.deps import get_read_db, get_current_superuser
 from app.models.news import NewsArticle
 from app.models.prompt import Prompt
 from app.models.user import User
+from app.services.image_executor import image_executor
+from app.core.db_metrics import pool_metrics
+from app.core.replicas import replica_router
 
 router = APIRouter()
 
@@ -18,7 +21,7 @@ router = APIRouter()
     dependencies=[Depends(get_current_superuser)]
 )
 async def get_system_stats(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get system statistics including user counts, prompt counts, and news generation metrics."""
     
@@ -80,7 +83,7 @@ async def get_system_stats(
 )
 async def get_daily_stats(
     days: int = 7,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get daily statistics for the specified number of days."""
     start_date = datetime.utcnow() - timedelta(days=days)
@@ -113,4 +116,20 @@ async def get_daily_stats(
             "end_date": datetime.utcnow().date().isoformat(),
             "days": days
         }
-    }
\ No newline at end of file
+    }
+
+@router.get(
+    "/admin/stats/image-executor",
+    dependencies=[Depends(get_current_superuser)]
+)
+async def get_image_executor_stats():
+    """Get image processing queue depth and per-operation timings."""
+    return image_executor.metrics()
+
+@router.get(
+    "/admin/stats/database",
+    dependencies=[Depends(get_current_superuser)]
+)
+async def get_database_stats():
+    """Get connection pool gauges, checkout waits, per-route connection use and replica lag."""
+    return {**pool_metrics.metrics(), "replication": replica_router.metrics()}
\ No newline at end of file
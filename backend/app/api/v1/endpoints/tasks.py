@@ -1,13 +1,13 @@
 # app/api/v1/endpoints/tasks.py
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from datetime import datetime
 
-from app.api.deps import get_db, get_current_superuser
+from app.api.deps import get_db, get_read_db, get_current_superuser
 from app.models.task import Task, TaskType, TaskStatus
 from app.models.user import User
 from app.schemas.task import (
@@ -18,9 +18,12 @@ from app.schemas.task import (
     TaskStatusUpdate
 )
 from app.tasks.scheduler import TaskScheduler
+from app.utils.pagination import Keyset, CountMode, count_rows
 
 router = APIRouter()
 
+TASK_KEYSET = Keyset(Task.created_at, Task.id)
+
 @router.post(
     "/admin/tasks",
     response_model=TaskResponse,
@@ -51,12 +54,14 @@ async def create_task(
 )
 async def list_tasks(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    count: CountMode = CountMode.EXACT,
     task_type: TaskType = None,
     status: TaskStatus = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all tasks with optional filtering."""
+    """List all tasks, newest first, with optional filtering."""
     query = select(Task)
     
     if task_type:
@@ -64,19 +69,14 @@ async def list_tasks(
     if status:
         query = query.filter(Task.status == status)
     
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    tasks = result.scalars().all()
-    
-    total_query = select(func.count(Task.id))
-    if task_type:
-        total_query = total_query.filter(Task.type == task_type)
-    if status:
-        total_query = total_query.filter(Task.status == status)
-    
-    total = await db.scalar(total_query)
+    result = await db.execute(TASK_KEYSET.apply(query, cursor, limit, skip))
+    tasks, next_cursor = TASK_KEYSET.page(result.scalars().all(), limit)
     
-    return TaskList(tasks=tasks, total=total)
+    return TaskList(
+        tasks=tasks,
+        total=await count_rows(db, query, count),
+        next_cursor=next_cursor
+    )
 
 @router.get(
     "/admin/tasks/{task_id}",
@@ -85,7 +85,7 @@ async def list_tasks(
 )
 async def get_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific task."""
     task = await db.scalar(select(Task).filter(Task.id == task_id))
@@ -119,17 +119,52 @@ async def update_task_status(
     await db.refresh(task)
     return task
 
+@router.post(
+    "/admin/tasks/{task_id}/cancel",
+    response_model=TaskResponse,
+    dependencies=[Depends(get_current_superuser)]
+)
+async def cancel_task(
+    task_id: UUID,
+    stop_recurring: bool = Query(False, description="End a recurring task instead of skipping one run"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cancel a queued or running task; a running task stops at its next check.
+
+    Cancelling a recurring task that has not started yet skips only this run:
+    its next occurrence is queued in its place unless ``stop_recurring`` is set.
+    """
+    task = await db.scalar(select(Task).filter(Task.id == task_id).with_for_update())
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    if task.status not in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Task is already {task.status}"
+        )
+    
+    # Started runs have already queued their next occurrence when claimed
+    if task.is_recurring and task.cron_expression and not task.attempts and not stop_recurring:
+        db.add(task.next_occurrence(datetime.utcnow()))
+
+    task.update_status(TaskStatus.CANCELLED)
+    await db.commit()
+    await db.refresh(task)
+    return task
+
 @router.post(
     "/admin/tasks/news-generation",
     response_model=TaskResponse,
     dependencies=[Depends(get_current_superuser)]
 )
 async def trigger_news_generation(
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_superuser)
 ):
-    """Manually trigger news generation task."""
+    """Manually trigger news generation task; the next free worker runs it."""
     scheduler = TaskScheduler(db)
     
     task = await scheduler.schedule_task(
@@ -138,7 +173,6 @@ async def trigger_news_generation(
         parameters={"triggered_by": str(current_user.id)}
     )
     
-    background_tasks.add_task(scheduler.run_task, task)
     return task
 
 @router.delete(
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 
-from app.api.deps import get_db, get_current_superuser
+from app.api.deps import get_db, get_read_db, get_current_superuser
 from app.models.prompt_template import PromptTemplate
 from app.models.user import User
 from app.schemas.template import (
@@ -49,7 +49,7 @@ async def create_template(
 async def list_templates(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[PromptTemplate]:
     """List all prompt templates."""
     templates = await db.scalars(
@@ -66,7 +66,7 @@ async def list_templates(
 )
 async def get_template(
     template_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> PromptTemplate:
     """Get a specific prompt template."""
     template = await db.get(PromptTemplate, template_id)
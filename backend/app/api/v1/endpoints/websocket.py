@@ -3,14 +3,17 @@
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
-import json
 from datetime import datetime
 
 from app.api.deps import get_db, get_websocket_user
+from app.core.database import async_session
+from app.core.events import event_relay
+from app.core.serialization import dumps, article_data
+from app.models.news import NewsArticle
 from app.models.user import User
-from app.models.prompt import PromptType
-from app.schemas.news import NewsArticleResponse
+from app.models.prompt import Prompt, PromptType
 
 router = APIRouter()
 
@@ -62,21 +65,53 @@ class ConnectionManager:
 
     async def broadcast_news(
         self,
-        news: NewsArticleResponse,
+        news: Dict[str, Any],
         prompt_type: PromptType,
         user_id: Optional[UUID] = None
     ):
-        """Broadcast news to appropriate connections based on type."""
+        """Broadcast news to appropriate connections based on type.
+
+        ``news`` is a NewsArticleResponse-shaped dict (see article_data); the
+        message is encoded once and the same text goes to every connection.
+        """
         message = {
             "type": "news_update",
-            "data": news.dict(),
+            "data": news,
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        # Convert to JSON string
-        json_message = json.dumps(message)
+        json_message = dumps(message).decode()
         
-        # Broadcast based on prompt type
+        await self._broadcast_by_type(json_message, prompt_type, user_id)
+
+    async def broadcast_image_ready(
+        self,
+        article_id: UUID,
+        image_url: str,
+        prompt_type: PromptType,
+        user_id: Optional[UUID] = None,
+        image_variants: Optional[Dict[str, Dict[str, str]]] = None
+    ):
+        """Notify connections that an article's generated image is available."""
+        message = {
+            "type": "image_ready",
+            "data": {
+                "article_id": str(article_id),
+                "image_url": image_url,
+                "image_variants": image_variants
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        
+        await self._broadcast_by_type(dumps(message).decode(), prompt_type, user_id)
+
+    async def _broadcast_by_type(
+        self,
+        json_message: str,
+        prompt_type: PromptType,
+        user_id: Optional[UUID] = None
+    ):
+        """Route a message to the connections allowed to see the prompt type."""
         if prompt_type == PromptType.PUBLIC:
             await self._broadcast_to_connections(self.active_connections["public"], json_message)
         
@@ -132,9 +167,66 @@ async def websocket_endpoint(
         manager.disconnect(websocket, user)
 
 async def broadcast_new_article(
-    article: NewsArticleResponse,
+    article: Dict[str, Any],
     prompt_type: PromptType,
     user_id: Optional[UUID] = None
 ):
-    """Helper function to broadcast new articles."""
-    await manager.broadcast_news(article, prompt_type, user_id)
\ No newline at end of file
+    """Broadcast a new article from any process to every API process.
+
+    Only the article key travels (NOTIFY payloads are small); each API
+    process loads the article once for all its connections.
+    """
+    await event_relay.publish("news_update", {
+        "article_id": str(article["id"]),
+        "published_date": article["published_date"].isoformat(),
+        "prompt_type": prompt_type.value,
+        "user_id": str(user_id) if user_id else None
+    })
+
+async def broadcast_image_ready(
+    article_id: UUID,
+    image_url: str,
+    prompt_type: PromptType,
+    user_id: Optional[UUID] = None,
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
+):
+    """Broadcast a generated image from any process to every API process."""
+    await event_relay.publish("image_ready", {
+        "article_id": str(article_id),
+        "image_url": image_url,
+        "image_variants": image_variants,
+        "prompt_type": prompt_type.value,
+        "user_id": str(user_id) if user_id else None
+    })
+
+async def _deliver_news_update(data: Dict[str, Any]) -> None:
+    if not manager.active_connections["public"]:
+        return  # every connection is in "public"; nobody to send to
+    async with async_session() as db:
+        row = (await db.execute(
+            select(NewsArticle, Prompt)
+            .join(Prompt, NewsArticle.prompt_id == Prompt.id)
+            .where(and_(
+                NewsArticle.id == data["article_id"],
+                NewsArticle.published_date == datetime.fromisoformat(data["published_date"])
+            ))
+        )).first()
+    if row is None:
+        return
+    await manager.broadcast_news(
+        article_data(row.NewsArticle, row.Prompt),
+        PromptType(data["prompt_type"]),
+        data.get("user_id")
+    )
+
+async def _deliver_image_ready(data: Dict[str, Any]) -> None:
+    await manager.broadcast_image_ready(
+        data["article_id"],
+        data["image_url"],
+        PromptType(data["prompt_type"]),
+        data.get("user_id"),
+        data.get("image_variants")
+    )
+
+event_relay.subscribe("news_update", _deliver_news_update)
+event_relay.subscribe("image_ready", _deliver_image_ready)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # app/api/v1/router.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from app.api.deps import replica_reads
 from app.api.v1.endpoints import (
     auth,
     news,
@@ -17,14 +18,15 @@ api_router = APIRouter()
 
 # Add all routers
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(public.router, prefix="/public", tags=["Public"])
-api_router.include_router(news.router, prefix="/news", tags=["News"])
+# Read-mostly routers whose GETs may be served from a read replica
+api_router.include_router(public.router, prefix="/public", tags=["Public"], dependencies=[Depends(replica_reads)])
+api_router.include_router(news.router, prefix="/news", tags=["News"], dependencies=[Depends(replica_reads)])
 api_router.include_router(prompts.router, prefix="/prompts", tags=["Prompts"])
 api_router.include_router(ai_config.router, prefix="/admin/ai-config", tags=["AI Configuration"])
 
 # Add new routers
 api_router.include_router(templates.router, tags=["Templates"])
-api_router.include_router(stats.router, tags=["System Stats"])
+api_router.include_router(stats.router, tags=["System Stats"], dependencies=[Depends(replica_reads)])
 api_router.include_router(tasks.router, tags=["Task Management"])
 
 # WebSocket routes
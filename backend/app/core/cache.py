@@ -0,0 +1,259 @@
+# app/core/cache.py
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.events import event_relay
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+
+@dataclass
+class CachedResponse:
+    """A pre-serialized JSON response body with its ETag and extra headers."""
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    etag: str = ""
+
+    def __post_init__(self):
+        if not self.etag:
+            self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+
+    @classmethod
+    def from_model(cls, adapter: TypeAdapter, value: Any, headers: Dict[str, str] = None) -> "CachedResponse":
+        """Validate ORM objects against a response schema and serialize them once."""
+        model = adapter.validate_python(value, from_attributes=True)
+        return cls(body=adapter.dump_json(model), headers=headers or {})
+
+    def pack(self) -> bytes:
+        meta = json.dumps({"etag": self.etag, "headers": self.headers}).encode()
+        return meta + b"\n" + self.body
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "CachedResponse":
+        meta, body = data.split(b"\n", 1)
+        meta = json.loads(meta)
+        return cls(body=body, headers=meta["headers"], etag=meta["etag"])
+
+class LocalCache:
+    """In-process LRU of packed responses with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self.generation = 0
+        self.invalidated_at = 0.0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes, ttl: int) -> None:
+        self.entries[key] = (time.monotonic() + min(ttl, self.ttl), data)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self.invalidated_at = time.time()
+        self.entries.clear()
+
+class ResponseCache:
+    """Read-through cache of serialized public API responses.
+
+    Entries live in Redis when REDIS_URL is set, shared by every API and
+    worker process, and in an in-process LRU otherwise or while Redis is
+    unreachable. Keys embed a generation counter; invalidation bumps it so
+    all older entries become unreachable at once and simply expire.
+
+    Responses rendered within ``settle_time`` of an invalidation may come
+    from a replica that hasn't replayed the change yet, so they are only
+    cached for that long. A replica is used while its lag at the last check
+    was within DB_REPLICA_MAX_LAG, and checks run every
+    DB_REPLICA_CHECK_INTERVAL seconds, so the window covers both.
+    """
+
+    # Seconds to stay on the local cache after a Redis error
+    REDIS_RETRY_AFTER = 30
+
+    def __init__(
+        self,
+        redis_url: str = settings.REDIS_URL,
+        prefix: str = settings.CACHE_PREFIX,
+        ttl: int = settings.CACHE_TTL,
+        max_age: int = settings.PUBLIC_CACHE_MAX_AGE,
+        settle_time: float = (
+            settings.DB_REPLICA_MAX_LAG + settings.DB_REPLICA_CHECK_INTERVAL
+            if settings.DATABASE_REPLICA_URLS else 0
+        )
+    ):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.max_age = max_age
+        self.settle_time = settle_time
+        self.local = LocalCache(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_TTL)
+        self.redis = None
+        if redis_url and aioredis:
+            self.redis = aioredis.from_url(redis_url)
+        elif redis_url:
+            logger.warning("REDIS_URL is set but the redis package is not installed; caching in-process")
+        self._redis_down_until = 0.0
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.prefix}response:generation"
+
+    @property
+    def _invalidated_key(self) -> str:
+        return f"{self.prefix}response:invalidated_at"
+
+    def _use_redis(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"Response cache falling back to in-process LRU: {str(error)}")
+        self._redis_down_until = time.monotonic() + self.REDIS_RETRY_AFTER
+
+    @staticmethod
+    def request_key(request: Request) -> str:
+        """Cache key part for a request: path plus sorted query string."""
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    async def generation(self) -> str:
+        """The current generation; read once per request, before rendering.
+
+        Keying both the lookup and the store with it means a response
+        rendered while an invalidation lands is stored under the old
+        generation, where nobody looks any more.
+        """
+        if self._use_redis():
+            try:
+                return (await self.redis.get(self._generation_key) or b"0").decode()
+            except Exception as e:
+                self._redis_failed(e)
+        return f"local{self.local.generation}"
+
+    async def get(self, key: str, generation: str) -> Optional[CachedResponse]:
+        if generation.startswith("local"):
+            data = self.local.get(f"{generation}:{key}")
+            return CachedResponse.unpack(data) if data else None
+        try:
+            data = await self.redis.get(f"{self.prefix}response:{generation}:{key}")
+            return CachedResponse.unpack(data) if data else None
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    async def set(self, key: str, generation: str, response: CachedResponse, ttl: Optional[int] = None) -> None:
+        data = response.pack()
+        ttl = ttl or self.ttl
+        if generation.startswith("local"):
+            self.local.set(f"{generation}:{key}", data, ttl)
+            return
+        try:
+            await self.redis.set(f"{self.prefix}response:{generation}:{key}", data, ex=ttl)
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def invalidate(self) -> None:
+        """Drop every cached response; call after public content changes.
+
+        Other processes' in-process caches are cleared through the event relay.
+        """
+        self.local.invalidate()
+        try:
+            await event_relay.publish("cache_invalidated")
+        except Exception as e:
+            logger.warning(f"Could not relay cache invalidation: {str(e)}")
+        if self.redis is not None:
+            try:
+                await self.redis.incr(self._generation_key)
+                if self.settle_time:
+                    await self.redis.set(self._invalidated_key, self.local.invalidated_at, ex=self.ttl)
+            except Exception as e:
+                self._redis_failed(e)
+
+    async def _settling(self) -> bool:
+        """Whether an invalidation happened within the last settle_time seconds."""
+        if not self.settle_time:
+            return False
+        invalidated_at = self.local.invalidated_at
+        if self._use_redis():
+            try:
+                invalidated_at = max(invalidated_at, float(await self.redis.get(self._invalidated_key) or 0))
+            except Exception as e:
+                self._redis_failed(e)
+        return time.time() - invalidated_at < self.settle_time
+
+    async def respond(
+        self,
+        request: Request,
+        render: Callable[[], Awaitable[CachedResponse]]
+    ) -> Response:
+        """Serve a request from the cache, rendering and storing it on a miss.
+
+        Concurrent misses for the same key in one process render once.
+        Answers 304 when the client's If-None-Match still matches.
+        """
+        key = self.request_key(request)
+        generation = await self.generation()
+        cached = await self.get(key, generation)
+        if cached is None:
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                cached = await self.get(key, generation)
+                if cached is None:
+                    cached = await render()
+                    settling = await self._settling()
+                    await self.set(key, generation, cached, math.ceil(self.settle_time) if settling else None)
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+        headers = {
+            **cached.headers,
+            "ETag": cached.etag,
+            "Cache-Control": f"public, max-age={self.max_age}"
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if cached.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        return Response(content=cached.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+    async def close(self) -> None:
+        if self.redis is not None:
+            await self.redis.close()
+
+response_cache = ResponseCache()
+
+async def _invalidate_local(data: Dict[str, Any]) -> None:
+    response_cache.local.invalidate()
+
+event_relay.subscribe("cache_invalidated", _invalidate_local, own_events=False)
\ No newline at end of file
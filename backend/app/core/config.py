@@ -12,6 +12,17 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_POOL_SIZE: int = 10  # connections kept open per process
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, reconnect before server or proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout, drops dead ones after restarts
+    DB_STATEMENT_CACHE_SIZE: int = 100  # prepared statements per connection, 0 behind pgbouncer
+    DATABASE_REPLICA_URLS: List[str] = []  # read replicas for GET traffic; empty reads from primary
+    DB_REPLICA_MAX_LAG: float = 2.0  # seconds of replay lag before a replica is skipped
+    DB_REPLICA_CHECK_INTERVAL: int = 5  # seconds between replica lag checks
+    DB_READ_AFTER_WRITE_SECONDS: int = 10  # a client's reads stay on primary this long after it writes
     
     # JWT
     SECRET_KEY: str
@@ -33,17 +44,46 @@ class Settings(BaseSettings):
     # Task Scheduler
     TASK_CHECK_INTERVAL: int = 60  # seconds
     MAX_TASK_RETRIES: int = 3
-    TASK_TIMEOUT: int = 300  # seconds
+    TASK_TIMEOUT: int = 300  # seconds, per attempt; override with parameters["timeout"]
+    TASK_RETRY_BACKOFF: int = 30  # seconds before the first retry, doubled per attempt
+    TASK_RETRY_BACKOFF_MAX: int = 1800  # seconds
+    
+    # Task Worker
+    TASK_WORKER_CONCURRENCY: int = 2
+    TASK_LEASE_SECONDS: int = 120  # visibility timeout of a claimed task
+    TASK_HEARTBEAT_INTERVAL: int = 30  # seconds, must be well below the lease
+    RUN_TASK_WORKER_IN_API: bool = False  # single-node setups without `cli.py worker`
+    TASK_LISTEN_NOTIFY: bool = True  # wake on Postgres NOTIFY, TASK_CHECK_INTERVAL is the fallback
+    EVENT_CHANNEL: str = "app_events"  # NOTIFY channel relaying worker events to the API processes
+    SYSTEM_METRICS_INTERVAL: int = 60  # seconds between system statistics snapshots
     
     # News Generation
     NEWS_GENERATION_INTERVAL: int = 3600  # 1 hour in seconds
     NEWS_GENERATION_CRON: str = "0 * * * *"  # Every hour
+    PROMPT_SCHEDULE_JITTER: float = 0.1  # +/- fraction of the interval
+    PROMPT_MIN_INTERVAL: int = 300  # seconds, floor for priority-shortened intervals
+    PROMPT_SCHEDULE_REFRESH: int = 60  # seconds between schedule heap reloads
     MAX_RSS_ITEMS_PER_SOURCE: int = 10
     CONTENT_MAX_LENGTH: int = 10000
     
     # System Monitoring
     STATS_COLLECTION_INTERVAL: int = 300  # 5 minutes in seconds
     MONITORING_RETENTION_DAYS: int = 30
+    
+    # Retention (0 days keeps rows forever)
+    TASK_RETENTION_DAYS: int = 7
+    ARTICLE_RETENTION_DAYS: int = 0
+    RETENTION_BATCH_SIZE: int = 1000  # rows per DELETE statement
+    MAINTENANCE_CRON: str = "30 3 * * *"  # daily at 03:30 UTC
+    
+    # News Partitioning
+    NEWS_PARTITION_MONTHS_AHEAD: int = 2  # monthly partitions created in advance
+    NEWS_PARTITION_LOCK_TIMEOUT: int = 5  # seconds partition DDL may wait for its locks
+    ARTICLE_ARCHIVE_AFTER_MONTHS: int = 12  # 0 keeps every month in news_articles
+    NEWS_SNAPSHOT_BACKFILL_DAYS: int = 7  # closed days finalized by maintenance
+    NEWS_SNAPSHOT_COMPRESSION_LEVEL: int = 6
+    NEWS_SNAPSHOT_MERGE_OVERLAP: int = 300  # seconds re-read before a snapshot's watermark
+    ARTICLE_ARCHIVE_COMPRESSION_LEVEL: int = 6  # zlib level of archived payloads
     ALERT_THRESHOLDS: Dict[str, float] = {
         "cpu_usage": 80.0,        # percentage
         "memory_usage": 80.0,     # percentage
@@ -64,10 +104,56 @@ class Settings(BaseSettings):
     DEFAULT_IMAGE_SIZE: str = "1024x1024"
     DEFAULT_IMAGE_QUALITY: str = "standard"
     IMAGE_STORAGE_PATH: str = "media/images"
+    MEDIA_ROOT: str = "media"
+    MEDIA_URL: str = "/media"
+    
+    # Image Pipeline
+    IMAGE_WORKER_CONCURRENCY: int = 2
+    IMAGE_QUEUE_SIZE: int = 100
+    IMAGE_PLACEHOLDER_URL: str = "/media/images/placeholder.png"
+    IMAGE_JOB_RECOVERY_DELAY: int = 600  # seconds before any task worker runs a job its process never started
+    IMAGE_DRAIN_TIMEOUT: int = 60  # seconds to finish queued jobs on shutdown
+    
+    # Image Cache
+    IMAGE_CACHE_ENABLED: bool = True
+    IMAGE_CACHE_INDEX_PATH: str = "media/images/cache_index.json"
+    IMAGE_CACHE_MAX_ENTRIES: int = 5000
+    IMAGE_CACHE_TTL: int = 604800  # 7 days in seconds
+    IMAGE_CACHE_REMOTE_TTL: int = 1800  # provider URLs expire, keep reuse short
+    IMAGE_CACHE_FUZZY: bool = True
+    IMAGE_CACHE_SIMILARITY: float = 0.85  # shingle Jaccard threshold
+    IMAGE_CACHE_SAVE_INTERVAL: int = 60  # seconds between index writes for hit statistics
+    
+    # Image Derivatives
+    IMAGE_DERIVATIVE_WIDTHS: List[int] = [320, 640, 1024]
+    IMAGE_DERIVATIVE_FORMATS: List[str] = ["avif", "webp", "jpeg"]
+    IMAGE_DERIVATIVE_QUALITY: int = 80
+    IMAGE_PROCESS_WORKERS: int = 2
+    IMAGE_EXECUTOR_QUEUE_SIZE: int = 32  # queued + running Pillow operations
+    
+    # Remote Image Persistence
+    IMAGE_DOWNLOAD_TIMEOUT: int = 60  # seconds
+    IMAGE_DOWNLOAD_MAX_BYTES: int = 20 * 1024 * 1024
+    IMAGE_DOWNLOAD_CHUNK_SIZE: int = 64 * 1024
+    MEDIA_CACHE_MAX_AGE: int = 31536000  # 1 year, media paths are immutable
+    
+    # Related Articles
+    EMBEDDING_INDEX_PATH: str = "data/embeddings"
+    EMBEDDING_MODEL: str = ""  # sentence-transformers model run on CPU; empty uses hashed TF-IDF
+    EMBEDDING_DIM: int = 256  # hashed TF-IDF dimensions
+    EMBEDDING_MAX_CHARS: int = 4000  # of article content embedded
+    EMBEDDING_LSH_TABLES: int = 8
+    EMBEDDING_LSH_BITS: int = 12
+    EMBEDDING_EXACT_MAX_ROWS: int = 20000  # up to this many rows lookups scan the whole matrix
+    EMBEDDING_REBUILD_BATCH_SIZE: int = 500
     
     # Cache
     CACHE_TTL: int = 3600  # 1 hour in seconds
     CACHE_PREFIX: str = "news_summarizer:"
+    REDIS_URL: str = ""  # empty keeps the response cache in-process
+    CACHE_LOCAL_MAX_ENTRIES: int = 2048
+    CACHE_LOCAL_TTL: int = 60  # bounds staleness when a relayed invalidation is missed
+    PUBLIC_CACHE_MAX_AGE: int = 30  # Cache-Control max-age of public responses
     
     # Rate Limiting
     RATE_LIMIT_WINDOW: int = 3600  # 1 hour in seconds
@@ -1,18 +1,84 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+# app/core/database.py
+
+from typing import Any, AsyncGenerator
+from fastapi import Depends
+from sqlalchemy.sql import Select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.db_metrics import InstrumentedPool, pool_metrics
+
+def make_engine(url: str = settings.DATABASE_URL, name: str = "primary", **options: Any) -> AsyncEngine:
+    """Async engine with the configured pool, instrumented for pool metrics.
+
+    ``options`` override the DB_* settings, e.g. a smaller pool for a CLI.
+    """
+    url = make_url(url)
+    engine_options = {
+        "echo": settings.DB_ECHO,
+        "poolclass": InstrumentedPool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+    if url.get_driver_name() == "asyncpg":
+        # SQLAlchemy's prepared statement cache and asyncpg's own, per connection
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+        engine_options["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    engine_options.update(options)
+
+    engine = create_async_engine(url, **engine_options)
+    pool_metrics.instrument(engine, name)
+    return engine
+
+class RoutingSession(Session):
+    """Session that runs plain reads on the replica engine in info["replica"].
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    Flushes, DML, locking reads and raw SQL always go to the primary, as
+    does everything once get_db has claimed the session for writing.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if (
+            replica is not None
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+engine = make_engine()
+async_session = sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False
+)
 Base = declarative_base()
 
-async def get_db() -> AsyncSession:
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Session for handlers that only read; closed without a commit."""
     async with async_session() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
\ No newline at end of file
+        yield session
+
+async def get_db(session: AsyncSession = Depends(get_read_db)) -> AsyncGenerator[AsyncSession, None]:
+    """Session committed after the handler returns.
+
+    Built on get_read_db, so a request that also resolves get_read_db (as
+    get_current_user does) shares this one session and connection.
+    """
+    # Writers read their own writes: no replica for the rest of the request
+    session.info["writer"] = True
+    session.info.pop("replica", None)
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
\ No newline at end of file
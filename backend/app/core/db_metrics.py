@@ -0,0 +1,198 @@
+# app/core/db_metrics.py
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.datastructures import MutableHeaders
+
+# Upper bounds, in seconds, of the checkout wait histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+@dataclass
+class RequestDatabaseStats:
+    """Connection use of one request."""
+    checkouts: int = 0
+    wait: float = 0.0
+    max_wait: float = 0.0
+    held: float = 0.0
+
+    def server_timing(self) -> str:
+        return (
+            f'db-wait;dur={self.wait * 1000:.1f}, '
+            f'db-held;dur={self.held * 1000:.1f};desc="{self.checkouts} checkouts"'
+        )
+
+_request_stats: ContextVar[Optional[RequestDatabaseStats]] = ContextVar("request_database_stats", default=None)
+
+class PoolMetrics:
+    """Checkout waits and connection hold times per engine and per route.
+
+    Waits are timed around the pool's own checkout, so they include queueing
+    for a free connection and opening new ones; hold time runs from checkout
+    to checkin. Little's law sizes the pool: busy connections are about
+    requests per second times average hold time.
+    """
+
+    def __init__(self):
+        self.engines: Dict[str, AsyncEngine] = {}
+        self.counters: Dict[str, Dict[str, Any]] = {}
+        self.routes: Dict[str, Dict[str, float]] = {}
+
+    def _engine_counters(self, name: str) -> Dict[str, Any]:
+        return self.counters.setdefault(name, {
+            "checkouts": 0,
+            "timeouts": 0,
+            "connects": 0,
+            "invalidations": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+            "total_held": 0.0,
+            "wait_histogram": [0] * (len(WAIT_BUCKETS) + 1)
+        })
+
+    def instrument(self, engine: AsyncEngine, name: str) -> None:
+        self.engines[name] = engine
+        counters = self._engine_counters(name)
+
+        def on_connect(dbapi_connection, connection_record):
+            counters["connects"] += 1
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            connection_record.info["checked_out_at"] = time.perf_counter()
+
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out_at = connection_record.info.pop("checked_out_at", None)
+            if checked_out_at is None:
+                return
+            held = time.perf_counter() - checked_out_at
+            counters["total_held"] += held
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.held += held
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            counters["invalidations"] += 1
+
+        event.listen(engine.sync_engine, "connect", on_connect)
+        event.listen(engine.sync_engine, "checkout", on_checkout)
+        event.listen(engine.sync_engine, "checkin", on_checkin)
+        event.listen(engine.sync_engine, "invalidate", on_invalidate)
+
+    def record_checkout(self, name: str, wait: float, timed_out: bool = False) -> None:
+        counters = self._engine_counters(name)
+        if timed_out:
+            counters["timeouts"] += 1
+        else:
+            counters["checkouts"] += 1
+        counters["total_wait"] += wait
+        counters["max_wait"] = max(counters["max_wait"], wait)
+        bucket = next((i for i, bound in enumerate(WAIT_BUCKETS) if wait <= bound), len(WAIT_BUCKETS))
+        counters["wait_histogram"][bucket] += 1
+
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.checkouts += 1
+            stats.wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+
+    def record_request(self, route: str, stats: RequestDatabaseStats) -> None:
+        totals = self.routes.setdefault(route, {
+            "requests": 0,
+            "checkouts": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+            "total_held": 0.0
+        })
+        totals["requests"] += 1
+        totals["checkouts"] += stats.checkouts
+        totals["total_wait"] += stats.wait
+        totals["max_wait"] = max(totals["max_wait"], stats.max_wait)
+        totals["total_held"] += stats.held
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool gauges, checkout wait and hold statistics, and per-route averages."""
+        engines = {}
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            counters = self._engine_counters(name)
+            checkouts = counters["checkouts"]
+            engines[name] = {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+                "checkouts": checkouts,
+                "timeouts": counters["timeouts"],
+                "connects": counters["connects"],
+                "invalidations": counters["invalidations"],
+                "avg_wait": round(counters["total_wait"] / checkouts, 4) if checkouts else None,
+                "max_wait": round(counters["max_wait"], 4),
+                "avg_held": round(counters["total_held"] / checkouts, 4) if checkouts else None,
+                "wait_histogram": {
+                    **{f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, counters["wait_histogram"])},
+                    "inf": counters["wait_histogram"][-1]
+                }
+            }
+        return {
+            "engines": engines,
+            "routes": {
+                route: {
+                    "requests": totals["requests"],
+                    "checkouts_per_request": round(totals["checkouts"] / totals["requests"], 2),
+                    "avg_wait": round(totals["total_wait"] / totals["requests"], 4),
+                    "max_wait": round(totals["max_wait"], 4),
+                    "avg_held": round(totals["total_held"] / totals["requests"], 4)
+                }
+                for route, totals in self.routes.items()
+            }
+        }
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout, reporting under its logging name."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_checkout(self._orig_logging_name, time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record_checkout(self._orig_logging_name, time.perf_counter() - started)
+        return connection
+
+class DatabaseTimingMiddleware:
+    """Collects each request's connection use, reports it in a Server-Timing
+    header and adds it to the per-route totals."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDatabaseStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and stats.checkouts:
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            if stats.checkouts:
+                route = scope.get("route")
+                pool_metrics.record_request(
+                    f"{scope['method']} {getattr(route, 'path', scope['path'])}", stats
+                )
\ No newline at end of file
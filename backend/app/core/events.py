@@ -0,0 +1,99 @@
+# app/core/events.py
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+import asyncio
+import json
+import logging
+
+import asyncpg
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes and more
+MAX_PAYLOAD_BYTES = 7900
+
+EventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class EventRelay:
+    """Carries application events between processes over Postgres LISTEN/NOTIFY.
+
+    Articles and images are produced by ``cli.py worker`` while WebSocket
+    clients and in-process caches live in the API processes. Producers
+    ``publish`` an event; every process running ``listen`` (the API, from its
+    lifespan) hands it to the handlers subscribed to its type. Delivery is
+    at-most-once and only reaches processes listening at the time.
+    """
+
+    def __init__(self, channel: str = settings.EVENT_CHANNEL):
+        self.channel = channel
+        self.origin = uuid4().hex
+        self.handlers: Dict[str, List[Tuple[EventHandler, bool]]] = {}
+        self._dispatching: Set[asyncio.Task] = set()
+
+    def subscribe(self, event_type: str, handler: EventHandler, own_events: bool = True) -> None:
+        """Call ``handler(data)`` for each event of the type; ``own_events=False``
+        skips events this process published itself."""
+        self.handlers.setdefault(event_type, []).append((handler, own_events))
+
+    async def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Send an event to every listening process, this one included."""
+        payload = dumps({"type": event_type, "origin": self.origin, "data": data or {}}).decode()
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            raise ValueError(f"Event {event_type} payload exceeds {MAX_PAYLOAD_BYTES} bytes")
+
+        async with async_session() as db:
+            await db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload}
+            )
+            await db.commit()
+
+    async def listen(self) -> None:
+        """Dispatch events until cancelled, reconnecting after connection loss."""
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+                try:
+                    await conn.add_listener(self.channel, self._on_notify)
+                    logger.info(f"Listening for events on {self.channel}")
+                    while True:
+                        await asyncio.sleep(settings.TASK_HEARTBEAT_INTERVAL)
+                        await conn.execute("SELECT 1")  # detect dropped connections
+                finally:
+                    await conn.close()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event listener lost its connection: {str(e)}")
+                await asyncio.sleep(5)  # Brief pause before reconnecting
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        task = asyncio.create_task(self._dispatch(payload))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed event: {payload[:200]}")
+            return
+
+        own = event.get("origin") == self.origin
+        for handler, own_events in self.handlers.get(event.get("type"), []):
+            if own and not own_events:
+                continue
+            try:
+                await handler(event.get("data") or {})
+            except Exception as e:
+                logger.error(f"Handler for event {event.get('type')} failed: {str(e)}")
+
+event_relay = EventRelay()
\ No newline at end of file
@@ -0,0 +1,197 @@
+# app/core/replicas.py
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.database import engine, make_engine
+
+logger = logging.getLogger(__name__)
+
+# Position of the primary's WAL when a check starts
+PRIMARY_LSN_QUERY = text("SELECT pg_current_wal_lsn()::text")
+
+# Seconds of replay lag; 0 once the replica has replayed up to the primary's
+# position, which a replica whose streaming stopped never reaches
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_replay_lsn() >= CAST(CAST(:primary_lsn AS text) AS pg_lsn) THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+READ_AFTER_WRITE_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    lag: Optional[float] = None
+    checked_at: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.error is None and self.lag is not None
+
+class ReplicaRouter:
+    """Picks a read replica for a request, or None for the primary.
+
+    Replicas are used round-robin while their replay lag is within
+    ``max_lag``. Lag is measured against the primary's current WAL position
+    and checked in the background at most every ``check_interval`` seconds,
+    so picking never waits on it; until the first check, once a replica's
+    last check is older than ``STALE_CHECKS`` intervals, and whenever no
+    replica qualifies, reads fall back to the primary.
+    """
+
+    # Seconds a lag check may take before the replica counts as down
+    CHECK_TIMEOUT = 2.0
+    # Check intervals after which a replica's last lag reading is not trusted
+    STALE_CHECKS = 2
+
+    def __init__(
+        self,
+        urls: List[str] = settings.DATABASE_REPLICA_URLS,
+        max_lag: float = settings.DB_REPLICA_MAX_LAG,
+        check_interval: int = settings.DB_REPLICA_CHECK_INTERVAL,
+        primary: AsyncEngine = engine
+    ):
+        self.primary = primary
+        self.replicas = [
+            Replica(name=f"replica-{i}", engine=make_engine(url, name=f"replica-{i}"))
+            for i, url in enumerate(urls)
+        ]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._checked_at = 0.0
+        self._check: Optional[asyncio.Task] = None
+        self._next = 0
+        self.routed = 0
+        self.fallbacks = 0
+
+    async def _primary_lsn(self) -> str:
+        async with self.primary.connect() as conn:
+            return await conn.scalar(PRIMARY_LSN_QUERY)
+
+    @staticmethod
+    async def _lag(replica: Replica, primary_lsn: str) -> Optional[float]:
+        async with replica.engine.connect() as conn:
+            return await conn.scalar(LAG_QUERY, {"primary_lsn": primary_lsn})
+
+    async def _check_replica(self, replica: Replica, primary_lsn: str) -> None:
+        try:
+            lag = await asyncio.wait_for(self._lag(replica, primary_lsn), self.CHECK_TIMEOUT)
+            replica.lag = float(lag) if lag is not None else None
+            replica.error = None if lag is not None else "nothing replayed yet"
+        except Exception as e:
+            if replica.error is None:
+                logger.warning(f"Read replica {replica.name} unavailable: {str(e)}")
+            replica.error = str(e) or type(e).__name__
+        replica.checked_at = time.time()
+
+    async def check(self) -> None:
+        """Refresh every replica's lag."""
+        try:
+            primary_lsn = await asyncio.wait_for(self._primary_lsn(), self.CHECK_TIMEOUT)
+        except Exception as e:
+            # Lag can't be told without the primary; the last readings go stale
+            logger.warning(f"Could not read the primary's WAL position: {str(e)}")
+            return
+        await asyncio.gather(*(self._check_replica(replica, primary_lsn) for replica in self.replicas))
+
+    def _is_current(self, replica: Replica) -> bool:
+        """Whether the replica was checked recently enough to trust its lag."""
+        return replica.checked_at is not None and time.time() - replica.checked_at <= self.STALE_CHECKS * self.check_interval
+
+    def _schedule_check(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval or (self._check and not self._check.done()):
+            return
+        self._checked_at = now
+        self._check = asyncio.get_running_loop().create_task(self.check())
+
+    def pick(self) -> Optional[AsyncEngine]:
+        if not self.replicas:
+            return None
+        self._schedule_check()
+        usable = [
+            replica for replica in self.replicas
+            if replica.healthy and replica.lag <= self.max_lag and self._is_current(replica)
+        ]
+        if not usable:
+            self.fallbacks += 1
+            return None
+        self._next = (self._next + 1) % len(usable)
+        self.routed += 1
+        return usable[self._next].engine
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "max_lag": self.max_lag,
+            "routed": self.routed,
+            "fallbacks": self.fallbacks,
+            "replicas": {
+                replica.name: {
+                    "healthy": replica.healthy,
+                    "current": self._is_current(replica),
+                    "lag": round(replica.lag, 3) if replica.lag is not None else None,
+                    "checked_at": replica.checked_at,
+                    "error": replica.error
+                }
+                for replica in self.replicas
+            }
+        }
+
+    async def close(self) -> None:
+        if self._check:
+            self._check.cancel()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+replica_router = ReplicaRouter()
+
+def recently_wrote(request: Request) -> bool:
+    """Whether the client wrote within the read-after-write window."""
+    try:
+        return float(request.cookies.get(READ_AFTER_WRITE_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+class ReadAfterWriteMiddleware:
+    """Sets a short-lived cookie on successful writes so that the client's
+    next reads go to the primary and see them.
+
+    The cookie only ever moves reads to the primary, so a forged one costs
+    replica offload, never correctness.
+    """
+
+    def __init__(self, app, window: int = settings.DB_READ_AFTER_WRITE_SECONDS):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not replica_router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_AFTER_WRITE_COOKIE}={int(time.time()) + self.window}; "
+                    f"Max-Age={self.window}; Path=/; HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
\ No newline at end of file
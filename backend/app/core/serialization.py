@@ -0,0 +1,54 @@
+# app/core/serialization.py
+
+from typing import Any, Dict, Optional, Sequence, Union
+import json
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    orjson = None
+    DefaultResponse = JSONResponse
+
+# Fields of an article response, in NewsArticleResponse order
+ARTICLE_FIELDS = (
+    "id", "prompt_id", "published_date", "slug", "title", "summary", "content",
+    "source_urls", "image_url", "image_variants", "ai_metadata", "created_at", "updated_at"
+)
+
+def _default(value: Any) -> Any:
+    # Only reached on the stdlib fallback; orjson encodes these natively
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return str(value)
+
+def dumps(value: Any) -> bytes:
+    """JSON bytes for plain data; UUIDs, datetimes and enums are encoded natively."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+def article_data(
+    article: Union[Any, Dict[str, Any]],
+    prompt: Any = None,
+    fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Response dict for an article row or archived row dict, without a schema.
+
+    Matches NewsArticleResponse when ``prompt`` is given, and NewsArticleCard
+    when ``fields`` limits it; on projected rows only the loaded columns
+    named by ``fields`` are read.
+    """
+    names = fields or ARTICLE_FIELDS
+    if isinstance(article, dict):
+        data = {name: article.get(name) for name in names}
+    else:
+        data = {name: getattr(article, name) for name in names}
+    if prompt is not None:
+        data["prompt_type"] = prompt.type
+        data["prompt_name"] = prompt.name
+    return data
\ No newline at end of file
@@ -0,0 +1,20 @@
+# app/core/static.py
+
+from fastapi.staticfiles import StaticFiles
+from app.core.config import settings
+
+class MediaFiles(StaticFiles):
+    """Serves MEDIA_ROOT with long-lived caching.
+
+    Stored media is written once under a unique or content-addressed name,
+    so responses can be cached by browsers and the CDN indefinitely.
+    """
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        # Revalidations get the same lifetime, or caches fall back to heuristics
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = (
+                f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable"
+            )
+        return response
\ No newline at end of file
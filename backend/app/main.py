@@ -3,14 +3,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import os
 from fastapi.openapi.utils import get_openapi
 from fastapi.security import OAuth2PasswordBearer
 
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.tasks.scheduler import TaskScheduler
-from app.core.database import get_db
+from app.tasks.worker import TaskWorker, run_worker
+from app.core.static import MediaFiles
+from app.core.cache import response_cache
+from app.core.db_metrics import DatabaseTimingMiddleware
+from app.core.events import event_relay
+from app.core.replicas import ReadAfterWriteMiddleware, replica_router
+from app.core.serialization import DefaultResponse
+from app.services.image_pipeline import image_pipeline
+from app.services.image_executor import image_executor
 
 # Configure logging
 logging.basicConfig(
@@ -25,20 +34,30 @@ oauth2_scheme = OAuth2PasswordBearer(
     scheme_name="OAuth2PasswordBearer"
 )
 
-# Global task scheduler instance
-scheduler = None
+# In-process task worker, only when no dedicated `cli.py worker` runs
+worker = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global scheduler
-    async for db in get_db():
-        scheduler = TaskScheduler(db)
-        break
-    logger.info("Task scheduler initialized")
+    global worker
+    worker_task = None
+    # Worker events (new articles, images, cache invalidations) for this process
+    listener = asyncio.create_task(event_relay.listen())
+    if settings.RUN_TASK_WORKER_IN_API:
+        worker = TaskWorker()
+        worker_task = asyncio.create_task(run_worker(worker))
+        logger.info("Task worker started")
     yield
-    if scheduler:
-        scheduler.stop()
-        logger.info("Task scheduler stopped")
+    if worker:
+        worker.stop()
+        await worker_task
+        logger.info("Task worker stopped")
+    await image_pipeline.stop()
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+    image_executor.shutdown()
+    await response_cache.close()
+    await replica_router.close()
 
 def custom_openapi():
     if app.openapi_schema:
@@ -79,6 +98,7 @@ app = FastAPI(
     version=settings.VERSION,
     description=settings.DESCRIPTION,
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
@@ -96,6 +116,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request connection pool use, reported in Server-Timing
+app.add_middleware(DatabaseTimingMiddleware)
+
+# Keeps a client's reads on the primary right after it writes
+app.add_middleware(ReadAfterWriteMiddleware)
+
 # Root router for version check
 @app.get("/")
 async def root():
@@ -112,6 +138,14 @@ app.include_router(
     prefix=settings.API_V1_STR
 )
 
+# Serve generated media with long cache lifetimes
+os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+app.mount(
+    settings.MEDIA_URL,
+    MediaFiles(directory=settings.MEDIA_ROOT),
+    name="media"
+)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.1", port=8000)
\ No newline at end of file
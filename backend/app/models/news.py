@@ -1,20 +1,32 @@
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON
-from sqlalchemy.dialects.postgresql import UUID as PGUUID, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, Date, DateTime, ForeignKey, Text, JSON, LargeBinary, PrimaryKeyConstraint, UniqueConstraint, Index, Computed, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.core.database import Base
+from app.models.prompt import PromptType
+
+# Text search configuration of news_articles.search_vector; queries must match it
+SEARCH_CONFIG = "english"
+
+# Title outranks summary, which outranks body text
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(summary, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'C')"
+)
 
 class NewsArticle(Base):
     __tablename__ = "news_articles"
 
-    id = Column(PGUUID, primary_key=True, default=uuid4)
+    id = Column(PGUUID, default=uuid4)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    slug = Column(String, nullable=False, unique=True)
+    slug = Column(String, nullable=False)
     summary = Column(Text)
     source_urls = Column(ARRAY(String), nullable=False)
     image_url = Column(String)
+    image_variants = Column(JSON)  # {format: {"<width>w": url}} responsive derivatives
     
     # Metadata
     ai_metadata = Column(JSON)  # Stores LLM config used, tokens, etc.
@@ -23,14 +35,60 @@ class NewsArticle(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Maintained by Postgres; deferred so article reads never fetch it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)))
+
     # Relationships
     prompt = relationship("Prompt", back_populates="news_articles")
 
+    # Range-partitioned by month on published_date, so the partition key is
+    # part of every unique constraint; the ORM still identifies rows by id
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "published_date"),
+        UniqueConstraint("slug", "published_date"),
+        # Newest-first read paths: per prompt, and across prompts by date
+        Index("ix_news_articles_prompt_id_published_date", "prompt_id", published_date.desc()),
+        Index("ix_news_articles_published_date", published_date.desc()),
+        Index("ix_news_articles_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (published_date)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+class NewsArticleArchive(Base):
+    __tablename__ = "news_articles_archive"
+
+    id = Column(PGUUID, primary_key=True)
+    slug = Column(String, nullable=False)
+    prompt_id = Column(PGUUID, ForeignKey("prompts.id"), nullable=False)
+    published_date = Column(DateTime, nullable=False, index=True)
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON of the article row
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    prompt = relationship("Prompt")
+
+class NewsSnapshot(Base):
+    __tablename__ = "news_snapshots"
+
+    id = Column(PGUUID, primary_key=True, default=uuid4)
+    snapshot_date = Column(Date, nullable=False)
+    prompt_type = Column(SQLEnum(PromptType), nullable=False)
+    payload = Column(LargeBinary, nullable=False)  # gzip-compressed JSON list of NewsArticleResponse
+    article_count = Column(Integer, nullable=False, default=0)
+    prompt_ids = Column(ARRAY(PGUUID), nullable=False, default=list)  # prompts with articles in the payload
+    source_updated_at = Column(DateTime, nullable=True)  # newest article updated_at included
+    is_final = Column(Boolean, nullable=False, default=False)  # built after the day closed
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("snapshot_date", "prompt_type"),
+    )
+
 class NewsImage(Base):
     __tablename__ = "news_images"
 
     id = Column(PGUUID, primary_key=True, default=uuid4)
-    news_article_id = Column(PGUUID, ForeignKey("news_articles.id"), nullable=False)
+    # No foreign key: news_articles is partitioned and old rows move to the archive
+    news_article_id = Column(PGUUID, nullable=False, index=True)
     image_prompt = Column(Text, nullable=False)
     provider = Column(String, nullable=False)
     storage_path = Column(String, nullable=False)
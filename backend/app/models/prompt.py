@@ -1,7 +1,7 @@
 # app/models/prompt.py
 
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, ForeignKey, Enum as SQLEnum, ARRAY
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, JSON, ForeignKey, Enum as SQLEnum, ARRAY
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,7 +26,7 @@ class Prompt(Base):
     id = Column(PGUUID, primary_key=True, default=uuid4)
     name = Column(String, nullable=False)
     content = Column(String, nullable=False)
-    type = Column(SQLEnum(PromptType), nullable=False)
+    type = Column(SQLEnum(PromptType), nullable=False, index=True)
     generate_image = Column(Boolean, default=False)
     display_style = Column(SQLEnum(DisplayStyle), nullable=False)
     
@@ -35,11 +35,18 @@ class Prompt(Base):
     
     # Configuration
     template_id = Column(PGUUID, ForeignKey("prompt_templates.id"), nullable=False)
-    user_id = Column(PGUUID, ForeignKey("users.id"), nullable=True)
+    user_id = Column(PGUUID, ForeignKey("users.id"), nullable=True, index=True)
     is_active = Column(Boolean, default=True)
 
     user = relationship("User", back_populates="prompts")
     
+    # Scheduling; without a cron expression or interval the prompt runs
+    # every NEWS_GENERATION_INTERVAL seconds
+    schedule_cron = Column(String, nullable=True)
+    schedule_interval = Column(Integer, nullable=True)  # seconds
+    priority = Column(Integer, default=0, nullable=False)
+    next_run_at = Column(DateTime, nullable=True, index=True)
+    
     # Tracking
     last_run_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
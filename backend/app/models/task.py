@@ -1,10 +1,11 @@
 # app/models/task.py
 
 from uuid import UUID, uuid4
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from croniter import croniter
 import enum
 
 from app.core.database import Base
@@ -30,6 +31,7 @@ class Task(Base):
     status = Column(String, default=TaskStatus.PENDING)
     parameters = Column(JSON, nullable=True)
     result = Column(JSON, nullable=True)
+    checkpoint = Column(JSON, nullable=True)  # progress of a resumable run
     error_message = Column(String, nullable=True)
     scheduled_at = Column(DateTime, nullable=True)
     started_at = Column(DateTime, nullable=True)
@@ -37,10 +39,21 @@ class Task(Base):
     next_run_at = Column(DateTime, nullable=True)
     is_recurring = Column(Boolean, default=False)
     cron_expression = Column(String, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     created_by = Column(PGUUID, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
+    __table_args__ = (
+        # Due-task lookups by the task worker
+        Index("ix_tasks_status_scheduled_at", "status", "scheduled_at"),
+        # Newest-first keyset pages of the admin task list
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+    )
+
     def update_status(self, new_status: TaskStatus, error: str | None = None, result: dict | None = None) -> None:
         """Update task status and optionally set error message and result"""
         self.status = new_status
@@ -50,10 +63,24 @@ class Task(Base):
             self.result = result
         self.updated_at = datetime.utcnow()
         
-        # If the task is complete or failed, set completed_at
-        if new_status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
+        # If the task is complete, failed or cancelled, set completed_at
+        if new_status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
             self.completed_at = datetime.utcnow()
         
         # If the task is starting, set started_at
         if new_status == TaskStatus.IN_PROGRESS and not self.started_at:
-            self.started_at = datetime.utcnow()
\ No newline at end of file
+            self.started_at = datetime.utcnow()
+
+    def next_occurrence(self, now: datetime) -> "Task":
+        """The pending task of this recurring task's next cron run after ``now``."""
+        base = max(now, self.scheduled_at or now)
+        return Task(
+            name=self.name,
+            type=self.type,
+            status=TaskStatus.PENDING,
+            parameters=self.parameters,
+            scheduled_at=croniter(self.cron_expression, base).get_next(datetime),
+            is_recurring=True,
+            cron_expression=self.cron_expression,
+            created_by=self.created_by
+        )
\ No newline at end of file
@@ -12,6 +12,7 @@ class NewsArticleBase(BaseModel):
     summary: Optional[str] = None
     source_urls: List[str]
     image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
     ai_metadata: Optional[Dict[str, Any]] = None
 
 class NewsArticleCreate(NewsArticleBase):
@@ -53,12 +54,61 @@ class NewsArticleResponse(NewsArticleInDBBase):
     prompt_type: str
     prompt_name: str
 
+class NewsArticleCard(BaseModel):
+    """Partial article for list views; serialized with only the requested fields."""
+    id: UUID
+    prompt_id: UUID
+    published_date: datetime
+    slug: Optional[str] = None
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    content: Optional[str] = None
+    source_urls: Optional[List[str]] = None
+    image_url: Optional[str] = None
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
+    ai_metadata: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    prompt_type: Optional[str] = None
+    prompt_name: Optional[str] = None
+
 class NewsArticleList(BaseModel):
     """Schema for paginated news list."""
     items: List[NewsArticleResponse]
-    total: int
+    total: Optional[int] = None  # None when counting was skipped (count=none)
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+
+class NewsArticleCardList(BaseModel):
+    """Schema for paginated news list projected to selected fields."""
+    items: List[NewsArticleCard]
+    total: Optional[int] = None
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
+
+class NewsSearchHit(NewsArticleCard):
+    """A search match with its relevance and a highlighted excerpt."""
+    rank: float
+    headline: str
+
+class NewsSearchResponse(BaseModel):
+    """Schema for one page of search results, best matches first."""
+    items: List[NewsSearchHit]
+    query: str
+    skip: int
+    limit: int
+    has_more: bool
+
+class RelatedNewsHit(NewsArticleCard):
+    """A related article with its cosine similarity to the source article."""
+    score: float
+
+class RelatedNewsList(BaseModel):
+    """Schema for the articles most related to one article, closest first."""
+    article_id: UUID
+    items: List[RelatedNewsHit]
 
 class NewsDateResponse(BaseModel):
     """Schema for all news articles on a specific date."""
@@ -82,11 +132,11 @@ class NewsStats(BaseModel):
 
 class NewsFilter(BaseModel):
     """Schema for news filtering options."""
-    date_from: Optional[datetime]
-    date_to: Optional[datetime]
-    prompt_types: Optional[List[str]]
-    prompt_ids: Optional[List[UUID]]
-    search_term: Optional[str]
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    prompt_types: Optional[List[str]] = None
+    prompt_ids: Optional[List[UUID]] = None
+    search_term: Optional[str] = None
 
     @field_serializer('prompt_ids')
     def serialize_uuids(self, prompt_ids: Optional[List[UUID]], _info):
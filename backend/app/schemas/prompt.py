@@ -3,7 +3,8 @@
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from croniter import croniter
 from enum import Enum
 from app.models.prompt import PromptType
 from app.schemas.template import Template
@@ -13,6 +14,11 @@ class DisplayStyle(str, Enum):
     RECTANGLE = "rectangle"
     HIGHLIGHT = "highlight"
 
+def validate_cron(v: Optional[str]) -> Optional[str]:
+    if v is not None and not croniter.is_valid(v):
+        raise ValueError(f"Invalid cron expression: {v}")
+    return v
+
 class PromptBase(BaseModel):
     name: str
     content: str
@@ -21,6 +27,14 @@ class PromptBase(BaseModel):
     display_style: DisplayStyle
     news_sources: List[str]
     template_id: UUID
+    schedule_cron: Optional[str] = None
+    schedule_interval: Optional[int] = Field(None, ge=60)  # seconds
+    priority: int = 0
+
+    @field_validator('schedule_cron')
+    @classmethod
+    def validate_schedule_cron(cls, v: Optional[str]) -> Optional[str]:
+        return validate_cron(v)
 
 class PromptCreate(PromptBase):
     pass
@@ -33,10 +47,27 @@ class PromptUpdate(BaseModel):
     display_style: Optional[DisplayStyle] = None
     news_sources: Optional[List[str]] = None
     template_id: Optional[UUID] = None
+    schedule_cron: Optional[str] = None
+    schedule_interval: Optional[int] = Field(None, ge=60)  # seconds
+    priority: Optional[int] = None
+
+    @field_validator('schedule_cron')
+    @classmethod
+    def validate_schedule_cron(cls, v: Optional[str]) -> Optional[str]:
+        return validate_cron(v)
+
+    @field_validator('priority')
+    @classmethod
+    def validate_priority(cls, v: Optional[int]) -> Optional[int]:
+        # Optional only so updates can leave it out; the column is not nullable
+        if v is None:
+            raise ValueError("priority cannot be null")
+        return v
 
 class PromptInDBBase(PromptBase):
     id: UUID
     user_id: UUID
+    next_run_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
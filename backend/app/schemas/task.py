@@ -44,6 +44,10 @@ class TaskInDBBase(TaskBase):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     next_run_at: Optional[datetime] = None
+    attempts: int = 0
+    locked_by: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     created_by: Optional[UUID] = None
@@ -58,7 +62,8 @@ class TaskResponse(TaskInDBBase):
 
 class TaskList(BaseModel):
     tasks: list[TaskResponse]
-    total: int
+    total: Optional[int] = None  # None when counting was skipped (count=none)
+    next_cursor: Optional[str] = None
 
 class TaskStatusUpdate(BaseModel):
     status: TaskStatus
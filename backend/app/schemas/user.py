@@ -38,9 +38,10 @@ class User(UserInDBBase):
 class UserList(BaseModel):
     """Schema for paginated user list."""
     users: List[User]
-    total: int
+    total: Optional[int] = None  # None when counting was skipped (count=none)
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 class UserInDB(UserInDBBase):
     """Schema for user in database."""
@@ -1,6 +1,6 @@
 # app/services/content_processor.py
 
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
@@ -11,12 +11,16 @@ from app.models.prompt_template import PromptTemplate
 from app.services.source_aggregator import SourceAggregator
 from app.services.llm_service import LLMService
 from app.services.image_service import ImageService
+from app.services.image_pipeline import image_pipeline, ImageJob, image_task
 from app.models.news import NewsArticle
 from app.models.prompt import Prompt, PromptType
-from app.models.task import Task, TaskStatus
 from app.utils.slug import generate_news_slug
 from app.api.v1.endpoints.websocket import broadcast_new_article
-from app.schemas.news import NewsArticleResponse
+from app.core.serialization import article_data
+from app.core.config import settings
+from app.core.cache import response_cache
+from app.services.news_snapshots import NewsSnapshots, SNAPSHOT_TYPES
+from app.services.news_embeddings import related_index
 
 logger = logging.getLogger(__name__)
 
@@ -32,13 +36,29 @@ class ContentProcessor:
         self.llm_service = llm_service
         self.image_service = image_service
 
+    async def fetch_sources(self, prompt: Prompt) -> List[Dict]:
+        """Fetch and aggregate the source articles of a prompt."""
+        logger.info(f"Fetching articles from sources: {prompt.news_sources}")
+        return await self.aggregator.aggregate_sources(prompt.news_sources)
+
+    async def load_sources(self, references: List[Dict]) -> List[Dict]:
+        """Load source articles kept as references (see ``source_reference``)."""
+        return await self.aggregator.load_sources(references)
+
     async def process_prompt(
         self,
         prompt: Prompt,
-        task_id: Optional[UUID] = None
+        task_id: Optional[UUID] = None,
+        articles: Optional[List[Dict]] = None,
+        on_article: Optional[Callable[[NewsArticle], None]] = None
     ) -> NewsArticle:
-        """Process a prompt and create a news article with task tracking."""
-        task = None
+        """Process a prompt and create a news article.
+
+        Already fetched source ``articles`` (e.g. from a task checkpoint) are
+        used as-is instead of fetching the prompt's sources again.
+        ``on_article`` is called with the flushed article right before it
+        commits, to record it in the same transaction.
+        """
         try:
             # Get current time once
             current_time = datetime.utcnow().replace(tzinfo=None)
@@ -50,20 +70,9 @@ class ContentProcessor:
             if not template:
                 raise ValueError(f"Template {prompt.template_id} not found")
 
-            # Update task status if provided
-            if task_id:
-                task = await self.db.scalar(
-                    select(Task).where(Task.id == task_id)
-                )
-                if task:
-                    task.status = TaskStatus.IN_PROGRESS
-                    await self.db.commit()
-
             # Fetch and aggregate source content
-            logger.info(f"Fetching articles from sources: {prompt.news_sources}")
-            articles = await self.aggregator.aggregate_sources(
-                prompt.news_sources
-            )
+            if articles is None:
+                articles = await self.fetch_sources(prompt)
             
             if not articles:
                 logger.warning(f"No articles found for prompt {prompt.id}")
@@ -105,71 +114,73 @@ class ContentProcessor:
                 }
             )
 
-            # Generate image if required
+            # Image generation runs in the image pipeline after commit;
+            # until then the article carries a placeholder
+            image_prompt = None
+            private_user_id = prompt.user_id if prompt.type == PromptType.PRIVATE else None
             if prompt.generate_image and content_result.get('image_prompt'):
-                try:
-                    image_result = await self.image_service.generate_image(
-                        content_result['image_prompt']
-                    )
-                    news.image_url = image_result['url']
-                    news.ai_metadata['image_generation'] = image_result['metadata']
-                except Exception as e:
-                    logger.error(f"Error generating image: {str(e)}")
-                    news.ai_metadata['image_error'] = str(e)
+                image_prompt = content_result['image_prompt']
+                news.image_url = settings.IMAGE_PLACEHOLDER_URL
+                news.ai_metadata['image_status'] = 'pending'
 
             self.db.add(news)
+
+            # The job's task row commits with the article, so it survives restarts
+            image_job_task = None
+            if image_prompt:
+                await self.db.flush()
+                image_job_task = image_task(news, image_prompt, prompt.type, private_user_id)
+                self.db.add(image_job_task)
             
             # Update prompt's last run time
             prompt.last_run_at = current_time
+
+            if on_article:
+                await self.db.flush()
+                on_article(news)
             
             await self.db.commit()
             await self.db.refresh(news)
 
-            # Convert to response schema before broadcasting
-            news_response = NewsArticleResponse(
-                id=news.id,
-                title=news.title,
-                content=news.content,
-                summary=news.summary,
-                source_urls=news.source_urls,
-                image_url=news.image_url,
-                slug=news.slug,
-                ai_metadata=news.ai_metadata,
-                prompt_id=news.prompt_id,
-                published_date=news.published_date,
-                created_at=news.created_at,
-                updated_at=news.updated_at,
-                prompt_type=prompt.type,
-                prompt_name=prompt.name
-            )
-            
+            if prompt.type == PromptType.PUBLIC:
+                await response_cache.invalidate()
+
+            # Fold the article into its day's snapshot while it's cheap
+            if prompt.type in SNAPSHOT_TYPES:
+                try:
+                    # A savepoint, so a failure leaves the session usable
+                    async with self.db.begin_nested():
+                        await NewsSnapshots(self.db).current(news.published_date.date())
+                    await self.db.commit()
+                except Exception as e:
+                    logger.warning(f"Could not update news snapshot: {str(e)}")
+
+            try:
+                await related_index.add([news])
+            except Exception as e:
+                logger.warning(f"Could not add article to related index: {str(e)}")
+
             # Broadcast new article
             await broadcast_new_article(
-                article=news_response,
+                article=article_data(news, prompt),
                 prompt_type=prompt.type,
-                user_id=prompt.user_id if prompt.type == PromptType.PRIVATE else None
+                user_id=private_user_id
             )
 
-            # Update task status if provided
-            if task_id and task:
-                task.status = TaskStatus.COMPLETED
-                task.result = {
-                    'article_id': str(news.id),
-                    'completion_time': current_time.isoformat()
-                }
-                await self.db.commit()
-            
+            if image_prompt:
+                await image_pipeline.enqueue(ImageJob(
+                    task_id=image_job_task.id,
+                    article_id=news.id,
+                    image_prompt=image_prompt,
+                    prompt_type=prompt.type,
+                    user_id=private_user_id,
+                    image_service=self.image_service
+                ))
+
             return news
 
         except Exception as e:
             logger.error(f"Error processing prompt {prompt.id}: {str(e)}")
-            
-            # Update task status if provided
-            if task_id and task:
-                task.status = TaskStatus.FAILED
-                task.error_message = str(e)
-                await self.db.commit()
-            
             raise
 
     async def process_batch(
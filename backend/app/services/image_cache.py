@@ -0,0 +1,291 @@
+# app/services/image_cache.py
+
+from typing import Dict, Optional, Any, Set, List, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.news import NewsImage
+from app.utils.media_storage import media_path
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; the index is then only process-safe
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class ImageCache:
+    """Reuses generated images for identical or near-identical image prompts.
+
+    Entries are keyed by a hash of the normalized prompt and the image size,
+    kept in LRU order and persisted to a JSON index so reuse survives restarts.
+    The index is shared by the API and worker processes: every write merges
+    with the file under a lock, new entries are written at once and hit
+    statistics at most every ``save_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        index_path: str = settings.IMAGE_CACHE_INDEX_PATH,
+        max_entries: int = settings.IMAGE_CACHE_MAX_ENTRIES,
+        ttl: int = settings.IMAGE_CACHE_TTL,
+        remote_ttl: int = settings.IMAGE_CACHE_REMOTE_TTL,
+        fuzzy: bool = settings.IMAGE_CACHE_FUZZY,
+        similarity_threshold: float = settings.IMAGE_CACHE_SIMILARITY,
+        save_interval: int = settings.IMAGE_CACHE_SAVE_INTERVAL
+    ):
+        self.index_path = index_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.remote_ttl = remote_ttl
+        self.fuzzy = fuzzy
+        self.similarity_threshold = similarity_threshold
+        self.save_interval = save_interval
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._shingles: Dict[str, Set[str]] = {}
+        self._loaded = False
+        self._saved_at = 0.0
+        self._touched: Set[str] = set()  # hit or stored since the last save
+        self._stored: Set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Lowercase, strip punctuation and collapse whitespace."""
+        normalized = re.sub(r'[^\w\s]', ' ', prompt.lower())
+        return re.sub(r'\s+', ' ', normalized).strip()
+
+    @classmethod
+    def prompt_key(cls, prompt: str, size: str) -> str:
+        """Hash of the normalized prompt and requested size."""
+        normalized = cls.normalize_prompt(prompt)
+        return hashlib.sha256(f"{size}|{normalized}".encode()).hexdigest()
+
+    @staticmethod
+    def shingles(normalized_prompt: str, size: int = 3) -> Set[str]:
+        """Word n-gram shingles used for fuzzy matching."""
+        words = normalized_prompt.split()
+        if len(words) < size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+    @staticmethod
+    def _jaccard(a: Set[str], b: Set[str]) -> float:
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+    async def lookup(self, prompt: str, size: str) -> Optional[Dict[str, Any]]:
+        """Return a reusable image result for the prompt, if any."""
+        async with self._lock:
+            await self._ensure_loaded()
+            self._evict_expired()
+
+            key = self.prompt_key(prompt, size)
+            similarity = 1.0
+            entry = self.entries.get(key)
+
+            if entry is None and self.fuzzy:
+                key, similarity = self._find_similar(prompt, size)
+                entry = self.entries.get(key) if key else None
+
+            if entry is None:
+                return None
+
+            # Another process may have evicted it and removed the file
+            if entry.get('storage_path') and not os.path.exists(media_path(entry['storage_path'])):
+                del self.entries[key]
+                self._shingles.pop(key, None)
+                return None
+
+            self.entries.move_to_end(key)
+            self._touched.add(key)
+            entry['hits'] = entry.get('hits', 0) + 1
+            entry['last_used_at'] = datetime.utcnow().isoformat()
+            if time.monotonic() - self._saved_at >= self.save_interval:
+                await self._save()
+
+        return {
+            "url": entry['url'],
+            "storage_path": entry.get('storage_path'),
+            "metadata": {
+                **entry['metadata'],
+                "cache": {
+                    "hit": True,
+                    "key": key,
+                    "similarity": round(similarity, 3),
+                    "matched_prompt": entry['prompt'],
+                    "generated_at": entry['created_at']
+                }
+            }
+        }
+
+    async def store(self, prompt: str, size: str, result: Dict[str, Any]) -> None:
+        """Remember a freshly generated image for later reuse."""
+        key = self.prompt_key(prompt, size)
+        now = datetime.utcnow().isoformat()
+
+        async with self._lock:
+            await self._ensure_loaded()
+            self.entries[key] = {
+                "prompt": prompt,
+                "size": size,
+                "url": result['url'],
+                "storage_path": result.get('storage_path'),
+                "metadata": result.get('metadata', {}),
+                "created_at": now,
+                "last_used_at": now,
+                "hits": 0
+            }
+            self._shingles[key] = self.shingles(self.normalize_prompt(prompt))
+            self.entries.move_to_end(key)
+            self._touched.add(key)
+            self._stored.add(key)
+            await self._save()
+
+    def _find_similar(self, prompt: str, size: str) -> tuple:
+        """Best fuzzy match above the similarity threshold."""
+        candidate = self.shingles(self.normalize_prompt(prompt))
+        best_key, best_score = None, 0.0
+
+        for key, entry in self.entries.items():
+            if entry['size'] != size:
+                continue
+            score = self._jaccard(candidate, self._shingles.get(key, set()))
+            if score > best_score:
+                best_key, best_score = key, score
+
+        if best_score >= self.similarity_threshold:
+            return best_key, best_score
+        return None, 0.0
+
+    def _is_expired(self, entry: Dict[str, Any], now: datetime) -> bool:
+        # Remote provider URLs (e.g. DALL-E) expire long before our own files
+        is_local = entry['url'].startswith(settings.MEDIA_URL)
+        ttl = self.ttl if is_local else self.remote_ttl
+        created_at = datetime.fromisoformat(entry['created_at'])
+        return (now - created_at).total_seconds() > ttl
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries from memory; the next save removes them from disk."""
+        now = datetime.utcnow()
+        for key in [k for k, e in self.entries.items() if self._is_expired(e, now)]:
+            del self.entries[key]
+            self._shingles.pop(key, None)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            self._replace_entries(await asyncio.to_thread(self._read_index))
+        except Exception as e:
+            logger.error(f"Error loading image cache index: {str(e)}")
+
+    def _replace_entries(self, data: Dict[str, Any]) -> None:
+        self.entries = OrderedDict(data)
+        self._shingles = {
+            key: self._shingles.get(key) or self.shingles(self.normalize_prompt(entry['prompt']))
+            for key, entry in self.entries.items()
+        }
+
+    def _read_index(self) -> Dict[str, Any]:
+        with open(self.index_path) as f:
+            return json.load(f, object_pairs_hook=OrderedDict)
+
+    async def _save(self) -> None:
+        """Merge into the shared index, then drop the files of evicted images."""
+        self._saved_at = time.monotonic()
+        touched = {key: self.entries[key] for key in self._touched if key in self.entries}
+        stored, self._touched, self._stored = self._stored, set(), set()
+        try:
+            merged, evicted_paths = await asyncio.to_thread(self._merge_index, touched, stored)
+        except Exception as e:
+            logger.error(f"Error saving image cache index: {str(e)}")
+            return
+        self._replace_entries(merged)
+        if evicted_paths:
+            await self._remove_files(evicted_paths)
+
+    def _merge_index(self, touched: Dict[str, Any], stored: Set[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """Merge our changes into the on-disk index, evict, and write it back atomically.
+
+        Entries that another process has evicted are only brought back when
+        they were stored again here, not merely hit.
+        """
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        with open(f"{self.index_path}.lock", 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                merged = self._read_index() if os.path.exists(self.index_path) else {}
+                for key, entry in touched.items():
+                    on_disk = merged.get(key)
+                    if on_disk is None and key not in stored:
+                        continue
+                    if on_disk is None or on_disk['last_used_at'] <= entry['last_used_at']:
+                        merged[key] = entry
+
+                # LRU order across processes is by last use
+                now = datetime.utcnow()
+                ordered = sorted(merged.items(), key=lambda item: item[1]['last_used_at'])
+                live = [item for item in ordered if not self._is_expired(item[1], now)]
+                evicted = [entry for _, entry in ordered if self._is_expired(entry, now)]
+                if len(live) > self.max_entries:
+                    evicted += [entry for _, entry in live[:len(live) - self.max_entries]]
+                    live = live[len(live) - self.max_entries:]
+                result = OrderedDict(live)
+
+                tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(result, f)
+                os.replace(tmp_path, self.index_path)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+        kept = {entry.get('storage_path') for entry in result.values()}
+        evicted_paths = {
+            entry['storage_path'] for entry in evicted
+            if entry.get('storage_path') and entry['storage_path'] not in kept
+        }
+        return result, sorted(evicted_paths)
+
+    async def _remove_files(self, storage_paths: List[str]) -> None:
+        """Delete evicted images that no article uses."""
+        try:
+            async with async_session() as db:
+                in_use = set((await db.execute(
+                    select(NewsImage.storage_path)
+                    .where(NewsImage.storage_path.in_(storage_paths))
+                    .distinct()
+                )).scalars())
+        except Exception as e:
+            logger.error(f"Error checking evicted cache images: {str(e)}")
+            return
+
+        for storage_path in storage_paths:
+            if storage_path in in_use:
+                continue
+            try:
+                await asyncio.to_thread(os.remove, media_path(storage_path))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove evicted image {storage_path}: {str(e)}")
+
+image_cache = ImageCache()
\ No newline at end of file
@@ -0,0 +1,90 @@
+# app/services/image_derivatives.py
+
+from typing import Dict, List
+import hashlib
+import json
+import logging
+import os
+
+from app.core.config import settings
+from app.utils.image_optimizer import ImageOptimizer
+from app.utils.media_storage import media_path, media_url, content_address, store_bytes
+from app.services.image_executor import image_executor
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_PREFIX = "images/derivatives"
+DERIVATIVE_EXTENSIONS = {
+    'jpeg': 'jpg',
+    'webp': 'webp',
+    'avif': 'avif'
+}
+
+def render_derivatives(
+    source_path: str,
+    widths: List[int],
+    formats: List[str],
+    quality: int
+) -> Dict[str, Dict[str, str]]:
+    """Render and store all derivatives of a stored image.
+
+    Runs inside the process pool. Returns ``{format: {"<width>w": path}}``
+    with paths relative to MEDIA_ROOT.
+    """
+    with open(media_path(source_path), 'rb') as f:
+        image_data = f.read()
+
+    # Derivatives of identical source bytes are rendered once
+    digest = hashlib.sha256(image_data).hexdigest()
+    manifest_path = media_path(content_address(digest, 'json', DERIVATIVE_PREFIX))
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    rendered = ImageOptimizer.create_derivatives(image_data, widths, formats, quality)
+
+    variants: Dict[str, Dict[str, str]] = {}
+    for format, by_width in rendered.items():
+        for width, payload in by_width.items():
+            variants.setdefault(format, {})[f"{width}w"] = store_bytes(
+                payload,
+                DERIVATIVE_EXTENSIONS[format],
+                DERIVATIVE_PREFIX
+            )
+
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(variants, f)
+
+    return variants
+
+class ImageDerivativeService:
+    """Produces responsive size/format variants of stored images on the image executor"""
+
+    def __init__(
+        self,
+        widths: List[int] = settings.IMAGE_DERIVATIVE_WIDTHS,
+        formats: List[str] = settings.IMAGE_DERIVATIVE_FORMATS,
+        quality: int = settings.IMAGE_DERIVATIVE_QUALITY
+    ):
+        self.widths = widths
+        self.formats = formats
+        self.quality = quality
+
+    async def create_variants(self, storage_path: str) -> Dict[str, Dict[str, str]]:
+        """Render variants for a stored image and return a srcset-style URL map"""
+        variants = await image_executor.run(
+            "render_derivatives",
+            render_derivatives,
+            storage_path,
+            self.widths,
+            self.formats,
+            self.quality
+        )
+
+        return {
+            format: {width: media_url(path) for width, path in by_width.items()}
+            for format, by_width in variants.items()
+        }
+
+image_derivatives = ImageDerivativeService()
\ No newline at end of file
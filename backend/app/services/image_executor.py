@@ -0,0 +1,167 @@
+# app/services/image_executor.py
+
+from typing import Any, Callable, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.utils.image_optimizer import ImageOptimizer
+
+logger = logging.getLogger(__name__)
+
+class ImageExecutorBusy(Exception):
+    """Raised when the image executor queue is full and the caller won't wait."""
+    pass
+
+def _timed_call(func: Callable, args: tuple, kwargs: dict) -> tuple:
+    """Run ``func`` in the worker process and report its CPU-side duration."""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+class ImageExecutor:
+    """Runs Pillow work in a process pool behind a bounded queue.
+
+    At most ``max_queue`` operations are queued or running at once; further
+    submissions wait for a slot (backpressure) or fail fast with
+    ``ImageExecutorBusy``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.IMAGE_PROCESS_WORKERS,
+        max_queue: int = settings.IMAGE_EXECUTOR_QUEUE_SIZE
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_queue)
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        self._op_stats: Dict[str, Dict[str, float]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(
+        self,
+        op: str,
+        func: Callable,
+        *args: Any,
+        wait: bool = True,
+        **kwargs: Any
+    ) -> Any:
+        """Run a picklable callable in the pool and return its result."""
+        if not wait and self._slots.locked():
+            self._rejected += 1
+            raise ImageExecutorBusy(f"Image executor queue is full ({self.max_queue})")
+
+        submitted = time.perf_counter()
+        async with self._slots:
+            self._pending += 1
+            self._running = min(self._pending, self.max_workers)
+            try:
+                loop = asyncio.get_running_loop()
+                result, duration = await loop.run_in_executor(
+                    self._get_executor(),
+                    _timed_call,
+                    func,
+                    args,
+                    kwargs
+                )
+            except Exception:
+                self._record(op, None, time.perf_counter() - submitted)
+                raise
+            finally:
+                self._pending -= 1
+                self._running = min(self._pending, self.max_workers)
+
+        self._record(op, duration, time.perf_counter() - submitted)
+        return result
+
+    def _record(self, op: str, duration: Optional[float], elapsed: float) -> None:
+        stats = self._op_stats.setdefault(op, {
+            "count": 0,
+            "errors": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+            "total_wait": 0.0
+        })
+        if duration is None:
+            stats["errors"] += 1
+            return
+        stats["count"] += 1
+        stats["total_time"] += duration
+        stats["max_time"] = max(stats["max_time"], duration)
+        stats["total_wait"] += max(0.0, elapsed - duration)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and per-operation timings."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self._pending - self._running,
+            "running": self._running,
+            "rejected": self._rejected,
+            "operations": {
+                op: {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "avg_time": round(stats["total_time"] / stats["count"], 4) if stats["count"] else None,
+                    "max_time": round(stats["max_time"], 4),
+                    "avg_wait": round(stats["total_wait"] / stats["count"], 4) if stats["count"] else None
+                }
+                for op, stats in self._op_stats.items()
+            }
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+image_executor = ImageExecutor()
+
+class AsyncImageOptimizer:
+    """Async counterparts of ImageOptimizer that run on the image executor."""
+
+    async def optimize_for_web(self, *args, **kwargs) -> bytes:
+        return await image_executor.run("optimize_for_web", ImageOptimizer.optimize_for_web, *args, **kwargs)
+
+    async def create_thumbnail(self, *args, **kwargs) -> bytes:
+        return await image_executor.run("create_thumbnail", ImageOptimizer.create_thumbnail, *args, **kwargs)
+
+    async def create_thumbnails(self, *args, **kwargs) -> dict:
+        return await image_executor.run("create_thumbnails", ImageOptimizer.create_thumbnails, *args, **kwargs)
+
+    async def add_watermark(self, *args, **kwargs) -> bytes:
+        return await image_executor.run("add_watermark", ImageOptimizer.add_watermark, *args, **kwargs)
+
+    async def compress_image(self, *args, **kwargs) -> bytes:
+        return await image_executor.run("compress_image", ImageOptimizer.compress_image, *args, **kwargs)
+
+    async def convert_format(self, *args, **kwargs) -> bytes:
+        return await image_executor.run("convert_format", ImageOptimizer.convert_format, *args, **kwargs)
+
+    async def analyze_image(self, *args, **kwargs) -> dict:
+        return await image_executor.run("analyze_image", ImageOptimizer.analyze_image, *args, **kwargs)
+
+    async def analyze_image_vectorized(self, *args, **kwargs) -> dict:
+        return await image_executor.run("analyze_image_vectorized", ImageOptimizer.analyze_image_vectorized, *args, **kwargs)
+
+    async def batch_analyze_images(self, *args, **kwargs) -> dict:
+        return await image_executor.run("batch_analyze_images", ImageOptimizer.batch_analyze_images, *args, **kwargs)
+
+    async def auto_enhance(self, *args, **kwargs) -> bytes:
+        return await image_executor.run("auto_enhance", ImageOptimizer.auto_enhance, *args, **kwargs)
+
+    async def create_derivatives(self, *args, **kwargs) -> dict:
+        return await image_executor.run("create_derivatives", ImageOptimizer.create_derivatives, *args, **kwargs)
+
+async_image_optimizer = AsyncImageOptimizer()
\ No newline at end of file
@@ -0,0 +1,281 @@
+# app/services/image_pipeline.py
+
+from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+import asyncio
+import logging
+import os
+import socket
+
+from sqlalchemy import select, update, and_, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.ai_config import ImageConfig
+from app.models.news import NewsArticle, NewsImage
+from app.models.prompt import PromptType
+from app.models.task import Task, TaskStatus, TaskType
+from app.services.image_service import ImageService
+from app.services.image_derivatives import image_derivatives
+from app.services.news_snapshots import NewsSnapshots, SNAPSHOT_TYPES
+from app.api.v1.endpoints.websocket import broadcast_image_ready
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ImageJob:
+    """A pending image generation for an already committed article."""
+    task_id: UUID
+    article_id: UUID
+    image_prompt: str
+    prompt_type: PromptType
+    user_id: Optional[UUID]
+    image_service: ImageService
+
+def image_task(article: NewsArticle, image_prompt: str, prompt_type: PromptType, user_id: Optional[UUID]) -> Task:
+    """The durable record of an image job, to be committed with its article.
+
+    It is scheduled ``IMAGE_JOB_RECOVERY_DELAY`` ahead: the process that
+    queued the job claims and completes it long before, and only a job lost
+    with its process (crash, restart) is left for a task worker to run.
+    """
+    return Task(
+        name=f"Image for article {article.id}",
+        type=TaskType.IMAGE_GENERATION,
+        status=TaskStatus.PENDING,
+        parameters={
+            "article_id": str(article.id),
+            "image_prompt": image_prompt,
+            "prompt_type": prompt_type.value,
+            "user_id": str(user_id) if user_id else None
+        },
+        scheduled_at=datetime.utcnow() + timedelta(seconds=settings.IMAGE_JOB_RECOVERY_DELAY)
+    )
+
+class ImagePipeline:
+    """Generates article images in a bounded worker pool, off the article path.
+
+    Every job is backed by an IMAGE_GENERATION task row (see ``image_task``),
+    so jobs still queued or running when the process goes away are picked up
+    again by the task worker instead of leaving the placeholder forever. A
+    claimed job holds a task lease that is renewed while it runs, the same way
+    the task worker's heartbeats keep its own tasks.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = settings.IMAGE_WORKER_CONCURRENCY,
+        queue_size: int = settings.IMAGE_QUEUE_SIZE,
+        lease_seconds: int = settings.TASK_LEASE_SECONDS,
+        heartbeat_interval: int = settings.TASK_HEARTBEAT_INTERVAL
+    ):
+        self.concurrency = concurrency
+        self.lease = timedelta(seconds=lease_seconds)
+        self.heartbeat_interval = heartbeat_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.workers: List[asyncio.Task] = []
+        self.owner = f"image-pipeline:{socket.gethostname()}:{os.getpid()}"
+
+    def start(self) -> None:
+        """Start the worker pool if it is not already running."""
+        if self.workers:
+            return
+        for worker_id in range(self.concurrency):
+            self.workers.append(asyncio.create_task(self._worker(worker_id)))
+        logger.info(f"Image pipeline started with {self.concurrency} workers")
+
+    async def stop(self, timeout: float = settings.IMAGE_DRAIN_TIMEOUT) -> None:
+        """Finish queued jobs for up to ``timeout`` seconds, then cancel the pool.
+
+        Jobs cut off here keep their task rows and are recovered later.
+        """
+        if self.workers and not self.queue.empty():
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Image pipeline stopped with {self.queue.qsize()} jobs queued")
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        logger.info("Image pipeline stopped")
+
+    async def enqueue(self, job: ImageJob) -> None:
+        """Queue an image job; waits when the queue is full."""
+        self.start()
+        await self.queue.put(job)
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                if await self._claim(job.task_id):
+                    await self._run_leased(job)
+            except Exception as e:
+                logger.error(
+                    f"Image worker {worker_id} failed for article {job.article_id}: {str(e)}"
+                )
+            finally:
+                self.queue.task_done()
+
+    async def _claim(self, task_id: UUID) -> bool:
+        """Take the job's task, unless a task worker already recovered it."""
+        now = datetime.utcnow()
+        async with async_session() as db:
+            result = await db.execute(
+                update(Task)
+                .where(and_(Task.id == task_id, Task.status == TaskStatus.PENDING))
+                .values(
+                    status=TaskStatus.IN_PROGRESS,
+                    attempts=Task.attempts + 1,
+                    locked_by=self.owner,
+                    locked_until=now + self.lease,
+                    heartbeat_at=now,
+                    started_at=now,
+                    updated_at=now
+                )
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def _run_leased(self, job: ImageJob) -> None:
+        """Process a claimed job while its lease is renewed."""
+        running = asyncio.create_task(self._process(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job.task_id))
+        try:
+            await asyncio.wait({running})
+        finally:
+            # Cut off by stop(); the lease runs out and a task worker recovers the job
+            running.cancel()
+            heartbeat.cancel()
+            await asyncio.gather(running, heartbeat, return_exceptions=True)
+        running.result()
+
+    async def _heartbeat(self, task_id: UUID) -> None:
+        """Extend the job's lease until it settles or is no longer ours."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                now = datetime.utcnow()
+                async with async_session() as db:
+                    result = await db.execute(
+                        update(Task)
+                        .where(and_(
+                            Task.id == task_id,
+                            Task.status == TaskStatus.IN_PROGRESS,
+                            Task.locked_by == self.owner
+                        ))
+                        .values(locked_until=now + self.lease, heartbeat_at=now)
+                    )
+                    await db.commit()
+                if result.rowcount == 0:
+                    return
+
+            except Exception as e:
+                logger.error(f"Heartbeat for image task {task_id} failed: {str(e)}")
+
+    async def run_task(self, task: Task, db: AsyncSession) -> None:
+        """Run a recovered IMAGE_GENERATION task with the default image config."""
+        image_config = await db.scalar(
+            select(ImageConfig).where(ImageConfig.is_default == True)
+        )
+        if not image_config:
+            raise ValueError("No default image configuration found")
+
+        parameters = task.parameters
+        await self._process(ImageJob(
+            task_id=task.id,
+            article_id=UUID(parameters["article_id"]),
+            image_prompt=parameters["image_prompt"],
+            prompt_type=PromptType(parameters["prompt_type"]),
+            user_id=UUID(parameters["user_id"]) if parameters.get("user_id") else None,
+            image_service=ImageService(image_config)
+        ))
+
+    async def _process(self, job: ImageJob) -> None:
+        """Generate the image, persist it and notify subscribers."""
+        error = None
+        try:
+            image_result = await job.image_service.generate_image(job.image_prompt)
+        except Exception as e:
+            logger.error(f"Error generating image: {str(e)}")
+            image_result, error = None, str(e)
+
+        # Responsive variants can only be rendered from locally stored images
+        image_variants = None
+        if image_result and image_result.get('storage_path'):
+            try:
+                image_variants = await image_derivatives.create_variants(
+                    image_result['storage_path']
+                )
+            except Exception as e:
+                logger.error(f"Error creating image derivatives: {str(e)}")
+
+        async with async_session() as db:
+            # The article and its task settle in one transaction
+            await db.execute(
+                update(Task)
+                .where(Task.id == job.task_id)
+                .values(
+                    status=TaskStatus.COMPLETED,
+                    result={"image_status": "failed" if error else "ready"},
+                    error_message=error,
+                    # A task worker releases its own lease when the run returns
+                    locked_by=case((Task.locked_by == self.owner, None), else_=Task.locked_by),
+                    completed_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                )
+            )
+
+            article = await db.get(NewsArticle, job.article_id)
+            if not article:
+                logger.warning(f"Article {job.article_id} disappeared before its image was ready")
+                await db.commit()
+                return
+
+            if job.prompt_type in SNAPSHOT_TYPES:
+                # Rebuilt with the image (or its failure) on the next read
+                await NewsSnapshots(db).drop_final(article.published_date.date(), job.prompt_type)
+
+            # JSON columns are not mutation-tracked, so always assign a new dict
+            ai_metadata: Dict[str, Any] = dict(article.ai_metadata or {})
+
+            if error:
+                ai_metadata['image_status'] = 'failed'
+                ai_metadata['image_error'] = error
+                article.ai_metadata = ai_metadata
+                await db.commit()
+                return
+
+            db.add(NewsImage(
+                news_article_id=article.id,
+                image_prompt=job.image_prompt,
+                provider=image_result['metadata']['provider'],
+                storage_path=image_result.get('storage_path') or image_result['url'],
+                ai_metadata=image_result['metadata']
+            ))
+
+            article.image_url = image_result['url']
+            if image_variants:
+                article.image_variants = image_variants
+            ai_metadata['image_status'] = 'ready'
+            ai_metadata['image_generation'] = image_result['metadata']
+            article.ai_metadata = ai_metadata
+            await db.commit()
+
+        if job.prompt_type == PromptType.PUBLIC:
+            await response_cache.invalidate()
+
+        await broadcast_image_ready(
+            article_id=job.article_id,
+            image_url=image_result['url'],
+            image_variants=image_variants,
+            prompt_type=job.prompt_type,
+            user_id=job.user_id
+        )
+
+image_pipeline = ImagePipeline()
\ No newline at end of file
@@ -4,6 +4,7 @@ from io import BytesIO
 import numpy as np
 from fastapi import HTTPException
 import httpx
+from app.services.image_executor import image_executor
 
 class ImageProcessor:
     """Handles image processing and optimization"""
@@ -19,23 +20,16 @@ class ImageProcessor:
             # Fetch image
             image_data = await self._fetch_image(image_url)
             
-            # Open image
-            image = Image.open(BytesIO(image_data))
-            
-            # Resize if needed
-            if target_size:
-                image = self._resize_image(image, target_size)
-            
-            # Optimize
-            if optimize:
-                image = self._optimize_image(image)
-            
-            # Save to buffer
-            buffer = BytesIO()
-            image.save(buffer, format="PNG", optimize=True)
-            buffer.seek(0)
+            # Pillow work runs in the image executor's process pool
+            processed = await image_executor.run(
+                "process_image",
+                ImageProcessor.transform,
+                image_data,
+                target_size,
+                optimize
+            )
             
-            return buffer
+            return BytesIO(processed)
 
         except Exception as e:
             raise HTTPException(
@@ -43,6 +37,33 @@ class ImageProcessor:
                 detail=f"Image processing failed: {str(e)}"
             )
 
+    @staticmethod
+    def transform(
+        image_data: bytes,
+        target_size: Optional[tuple] = None,
+        optimize: bool = True
+    ) -> bytes:
+        """Resize and optimize image bytes, returning PNG bytes"""
+        # Open image
+        image = Image.open(BytesIO(image_data))
+        
+        # JPEG can decode at a reduced scale that still covers the target
+        if target_size:
+            image.draft('RGB', target_size)
+        
+        # Resize if needed
+        if target_size:
+            image = ImageProcessor._resize_image(image, target_size)
+        
+        # Optimize
+        if optimize:
+            image = ImageProcessor._optimize_image(image)
+        
+        # Save to buffer
+        buffer = BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
     async def _fetch_image(self, url: str) -> bytes:
         """Fetch image from URL"""
         async with httpx.AsyncClient() as client:
@@ -54,8 +75,8 @@ class ImageProcessor:
                 )
             return response.content
 
+    @staticmethod
     def _resize_image(
-        self,
         image: Image.Image,
         target_size: tuple
     ) -> Image.Image:
@@ -76,7 +97,7 @@ class ImageProcessor:
             new_width = int(new_height * image_ratio)
         
         # Resize
-        resized = image.resize((new_width, new_height), Image.LANCZOS)
+        resized = image.resize((new_width, new_height), Image.LANCZOS, reducing_gap=3.0)
         
         # Create new image with padding if needed
         if (new_width, new_height) != target_size:
@@ -89,16 +110,15 @@ class ImageProcessor:
         
         return resized
 
-    def _optimize_image(self, image: Image.Image) -> Image.Image:
+    @staticmethod
+    def _optimize_image(image: Image.Image) -> Image.Image:
         """Optimize image for web delivery"""
         # Convert to RGB if needed
         if image.mode in ("RGBA", "P"):
             image = image.convert("RGB")
         
-        # Perform basic optimization
-        image = image.copy()  # Create a copy to avoid modifying original
-        
-        # Apply subtle sharpening
+        # Apply subtle sharpening (enhance() returns a new image, so the
+        # caller's image is never modified)
         from PIL import ImageEnhance
         enhancer = ImageEnhance.Sharpness(image)
         image = enhancer.enhance(1.2)
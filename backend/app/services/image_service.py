@@ -1,14 +1,27 @@
 from typing import Dict, Optional, Any
 import openai
 import httpx
-from PIL import Image
-from io import BytesIO
+import asyncio
 import base64
 from fastapi import HTTPException
 from app.models.ai_config import ImageConfig, ImageProvider
 from app.core.config import settings
+from app.services.image_cache import image_cache
+from app.utils.media_storage import media_url, store_stream
+from app.services.image_executor import async_image_optimizer
 import os
 
+REMOTE_IMAGE_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/avif": "avif"
+}
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
 class ImageService:
     def __init__(self, config: ImageConfig):
         self.config = config
@@ -37,9 +50,34 @@ class ImageService:
     async def generate_image(
         self,
         prompt: str,
-        size: str = "1024x1024"
+        size: str = "1024x1024",
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """Generate image using configured provider"""
+        """Generate image using configured provider, reusing cached images"""
+        use_cache = use_cache and settings.IMAGE_CACHE_ENABLED
+
+        if use_cache:
+            cached = await image_cache.lookup(prompt, size)
+            if cached:
+                return cached
+
+        result = await self._generate(prompt, size)
+
+        # Provider URLs expire; serve our own copy instead
+        if result and not result.get('storage_path'):
+            result = await self._persist_remote_image(result)
+
+        if use_cache and result:
+            await image_cache.store(prompt, size, result)
+
+        return result
+
+    async def _generate(
+        self,
+        prompt: str,
+        size: str
+    ) -> Dict[str, Any]:
+        """Dispatch generation to the configured provider"""
         try:
             if self.config.provider == ImageProvider.DALLE:
                 return await self._generate_dalle(prompt, size)
@@ -107,14 +145,15 @@ class ImageService:
         result = response.json()
         image_data = result["artifacts"][0]
         
-        # Save the image and get its URL
-        image_url = await self._save_image(
+        # Save the image and get its storage path
+        storage_path = await self._save_image(
             base64.b64decode(image_data["base64"]),
             "stable_diffusion"
         )
 
         return {
-            "url": image_url,
+            "url": media_url(storage_path),
+            "storage_path": storage_path,
             "metadata": {
                 "model": self.config.model_name,
                 "provider": "stable_diffusion",
@@ -184,12 +223,52 @@ class ImageService:
             }
         }
 
+    async def _persist_remote_image(
+        self,
+        result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Download a provider-hosted image into local media storage"""
+        source_url = result['url']
+        try:
+            async with httpx.AsyncClient(
+                timeout=settings.IMAGE_DOWNLOAD_TIMEOUT,
+                follow_redirects=True
+            ) as client:
+                async with client.stream("GET", source_url) as response:
+                    response.raise_for_status()
+
+                    content_type = response.headers.get("content-type", "").split(";")[0]
+                    extension = REMOTE_IMAGE_EXTENSIONS.get(content_type)
+                    if not extension:
+                        raise ValueError(f"Unsupported image content type: {content_type}")
+
+                    storage_path = await store_stream(
+                        response.aiter_bytes(settings.IMAGE_DOWNLOAD_CHUNK_SIZE),
+                        extension,
+                        "images/originals",
+                        max_bytes=settings.IMAGE_DOWNLOAD_MAX_BYTES
+                    )
+
+        except Exception as e:
+            # Keep the provider URL rather than failing the whole generation
+            result['metadata']['persist_error'] = str(e)
+            return result
+
+        return {
+            "url": media_url(storage_path),
+            "storage_path": storage_path,
+            "metadata": {
+                **result['metadata'],
+                "source_url": source_url
+            }
+        }
+
     async def _save_image(
         self,
         image_data: bytes,
         provider: str
     ) -> str:
-        """Save image to storage and return URL"""
+        """Save image to storage and return its path relative to MEDIA_ROOT"""
         # Create directory if it doesn't exist
         save_dir = os.path.join(settings.MEDIA_ROOT, "images", provider)
         os.makedirs(save_dir, exist_ok=True)
@@ -198,12 +277,11 @@ class ImageService:
         filename = f"{provider}_{os.urandom(8).hex()}.png"
         filepath = os.path.join(save_dir, filename)
 
-        # Save image
-        image = Image.open(BytesIO(image_data))
-        image.save(filepath, "PNG")
+        # Re-encode off the event loop, then write in a thread
+        png_data = await async_image_optimizer.convert_format(image_data, "PNG")
+        await asyncio.to_thread(_write_file, filepath, png_data)
 
-        # Return URL
-        return f"{settings.MEDIA_URL}/images/{provider}/{filename}"
+        return f"images/{provider}/{filename}"
 
     async def __aenter__(self):
         return self
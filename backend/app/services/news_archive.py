@@ -0,0 +1,80 @@
+# app/services/news_archive.py
+
+from datetime import datetime, date
+from typing import Any, Dict, List, Tuple
+import json
+import logging
+import zlib
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.news import NewsArticleArchive
+from app.models.prompt import Prompt
+
+logger = logging.getLogger(__name__)
+
+# Row columns restored as datetimes when an archived article is read
+DATETIME_COLUMNS = ("published_date", "created_at", "updated_at")
+
+def month_start(value: date) -> date:
+    """First day of the month of a date."""
+    return date(value.year, value.month, 1)
+
+def add_months(value: date, months: int) -> date:
+    """First day of the month ``months`` away from the month of a date."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def archive_cutoff(today: date = None) -> date:
+    """Months starting before this date are moved to the archive tier."""
+    return add_months(month_start(today or datetime.utcnow().date()), -settings.ARTICLE_ARCHIVE_AFTER_MONTHS)
+
+def encode_article(row: Dict[str, Any]) -> bytes:
+    """Compress a news_articles row for the archive table."""
+    return zlib.compress(
+        json.dumps(row, default=str, separators=(",", ":")).encode(),
+        settings.ARTICLE_ARCHIVE_COMPRESSION_LEVEL
+    )
+
+def decode_article(payload: bytes) -> Dict[str, Any]:
+    """Restore an archived news_articles row."""
+    row = json.loads(zlib.decompress(payload))
+    for column in DATETIME_COLUMNS:
+        if row.get(column):
+            row[column] = datetime.fromisoformat(row[column])
+    return row
+
+class NewsArchive:
+    """Read access to articles moved out of the partitioned news_articles table."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def covers(self, start_date: datetime) -> bool:
+        """Whether a range starting at this time may reach archived months."""
+        return bool(settings.ARTICLE_ARCHIVE_AFTER_MONTHS) and start_date.date() < archive_cutoff()
+
+    async def get_articles(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        visibility
+    ) -> List[Tuple[Dict[str, Any], Prompt]]:
+        """Archived articles in a half-open date range with their prompts."""
+        result = await self.db.execute(
+            select(NewsArticleArchive, Prompt)
+            .join(Prompt, NewsArticleArchive.prompt_id == Prompt.id)
+            .where(
+                and_(
+                    NewsArticleArchive.published_date >= start_date,
+                    NewsArticleArchive.published_date < end_date,
+                    visibility
+                )
+            )
+        )
+        return [
+            (decode_article(archived.payload), prompt)
+            for archived, prompt in result.all()
+        ]
\ No newline at end of file
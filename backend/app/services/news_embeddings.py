@@ -0,0 +1,541 @@
+# app/services/news_embeddings.py
+
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import zlib
+
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.news import NewsArticle
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; rebuilds may then drop rows appended meanwhile
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+    a about after also an and are as at be been but by can could for from had has have he
+    her his if in into is it its more new not of on or our over said she so than that the
+    their them there they this to up was we were what when which who will with would you
+""".split())
+
+# Relative weight of each article field, in line with the search vector
+FIELD_WEIGHTS = (("title", 3.0), ("summary", 2.0), ("content", 1.0))
+
+def article_text(article: Any, field: str) -> str:
+    value = article.get(field) if isinstance(article, dict) else getattr(article, field, None)
+    text = value or ""
+    return text[:settings.EMBEDDING_MAX_CHARS] if field == "content" else text
+
+def normalize_rows(matrix: "np.ndarray") -> "np.ndarray":
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+class HashingEmbedder:
+    """TF-IDF over hashed words and word bigrams; needs no model files.
+
+    Terms are hashed into ``dim`` signed buckets, so the vocabulary is
+    open-ended and every process computes the same vectors. IDF weights per
+    bucket are fitted on the corpus when the index is rebuilt.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.name = f"hashing-tfidf-{dim}"
+
+    @staticmethod
+    def terms(text: str) -> List[str]:
+        words = [word for word in TOKEN_PATTERN.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _vector(self, article: Any) -> "np.ndarray":
+        counts: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for term in self.terms(article_text(article, field)):
+                counts[term] += weight
+
+        buckets, values = [], []
+        for term, count in counts.items():
+            digest = zlib.crc32(term.encode())
+            buckets.append(digest % self.dim)
+            values.append((1.0 if digest & 0x80000000 else -1.0) * (1.0 + math.log(count)))
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        np.add.at(vector, buckets, values)
+        return vector
+
+    def raw(self, articles: Sequence[Any]) -> "np.ndarray":
+        """Sublinear term frequencies, before IDF weighting and normalization."""
+        if not articles:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self._vector(article) for article in articles])
+
+    @staticmethod
+    def fit_idf(raw: "np.ndarray") -> "np.ndarray":
+        document_frequency = np.count_nonzero(raw, axis=0)
+        return (np.log((1 + len(raw)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+class SentenceEmbedder:
+    """A local sentence-transformers model, run on the CPU."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-{model_name}-{self.dim}"
+
+    def raw(self, articles: Sequence[Any]) -> "np.ndarray":
+        texts = [
+            f"{article_text(article, 'title')}. "
+            f"{article_text(article, 'summary') or article_text(article, 'content')}"
+            for article in articles
+        ]
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self.model.encode(texts, convert_to_numpy=True).astype(np.float32)
+
+    @staticmethod
+    def fit_idf(raw: "np.ndarray") -> None:
+        return None
+
+def get_embedder():
+    """The configured embedder, falling back to hashed TF-IDF."""
+    if settings.EMBEDDING_MODEL:
+        try:
+            return SentenceEmbedder(settings.EMBEDDING_MODEL)
+        except ImportError:
+            logger.warning("EMBEDDING_MODEL is set but sentence-transformers is not installed; using hashed TF-IDF")
+    return HashingEmbedder(settings.EMBEDDING_DIM)
+
+class RelatedIndex:
+    """Article embeddings in an on-disk matrix, searched by cosine similarity.
+
+    Rows are fixed-size records (article id and float16 vector) appended to
+    one file per index generation. Processes that add articles and processes
+    that serve lookups share it without coordination: readers load rows past
+    the ones they already hold before every lookup. A rebuild refits the IDF
+    weights on the whole corpus, writes a new generation and switches
+    meta.json over to it, which also drops deleted and archived articles.
+    Appends and the switch take a file lock, so rows appended to the old
+    generation during a rebuild are carried over.
+
+    Reading files and re-sorting the LSH tables run in threads; lookups
+    meanwhile are served from the rows and tables already loaded.
+
+    Small indexes are scanned in full; larger ones go through random
+    hyperplane LSH tables (sorted bucket codes; the neighbouring buckets are
+    probed too when a lookup's own buckets are sparse) and only the
+    candidates are scored.
+    """
+
+    # Rows added since the LSH tables were sorted; those are always scored
+    REINDEX_AFTER = 1024
+
+    def __init__(
+        self,
+        path: str = settings.EMBEDDING_INDEX_PATH,
+        lsh_tables: int = settings.EMBEDDING_LSH_TABLES,
+        lsh_bits: int = settings.EMBEDDING_LSH_BITS,
+        exact_max_rows: int = settings.EMBEDDING_EXACT_MAX_ROWS
+    ):
+        self.path = path
+        self.lsh_tables = lsh_tables
+        self.lsh_bits = lsh_bits
+        self.exact_max_rows = exact_max_rows
+        self._embedder = None
+        self._meta: Optional[Dict[str, Any]] = None
+        self._meta_mtime: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._sync_lock = asyncio.Lock()
+        self._reindexing: Optional[asyncio.Task] = None
+        self._reset(None)
+
+    @property
+    def enabled(self) -> bool:
+        return np is not None
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _record_dtype(self, dim: int) -> "np.dtype":
+        return np.dtype([("id", "u1", (16,)), ("vector", "<f2", (dim,))])
+
+    def _reset(self, meta: Optional[Dict[str, Any]]) -> None:
+        self._meta = meta
+        dim = meta["dim"] if meta else 0
+        self.dim = dim
+        self.idf = None
+        self.ids: List[bytes] = []
+        self.row_of: Dict[bytes, int] = {}
+        self.matrix = np.zeros((0, dim), dtype=np.float32) if np is not None else None
+        self.live = np.zeros(0, dtype=bool) if np is not None else None
+        self.count = 0
+        self.loaded_rows = 0
+        self.planes = None
+        self.sorted_codes: List["np.ndarray"] = []
+        self.sorted_rows: List["np.ndarray"] = []
+        self.indexed_rows = 0
+
+        if meta is None:
+            return
+        idf_path = self._file(f"idf-{meta['generation']}.npy")
+        if os.path.exists(idf_path):
+            self.idf = np.load(idf_path)
+        # Fixed seed, so every process hashes into the same buckets
+        rng = np.random.default_rng(dim)
+        self.planes = rng.standard_normal((self.lsh_tables, self.lsh_bits, dim)).astype(np.float32)
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file("meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, meta: Dict[str, Any]) -> None:
+        tmp_path = self._file("meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._file("meta.json"))
+
+    @contextmanager
+    def _file_lock(self):
+        """Held by every process while appending rows or switching generations."""
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._file("index.lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    async def _sync(self) -> None:
+        """Pick up a new generation or rows appended by other processes."""
+        async with self._sync_lock:
+            try:
+                mtime = os.stat(self._file("meta.json")).st_mtime
+            except FileNotFoundError:
+                if self._meta is not None:
+                    self._reset(None)
+                return
+            if mtime != self._meta_mtime:
+                self._meta_mtime = mtime
+                meta = self._read_meta()
+                if meta is None or self._meta is None or meta["generation"] != self._meta["generation"]:
+                    self._reset(meta)
+            if self._meta is None:
+                return
+
+            dtype = self._record_dtype(self.dim)
+            vectors_path = self._file(f"vectors-{self._meta['generation']}.bin")
+            try:
+                rows = os.stat(vectors_path).st_size // dtype.itemsize
+            except FileNotFoundError:
+                return
+            if rows > self.loaded_rows:
+                # A record still being written is left for the next sync
+                try:
+                    records = await asyncio.to_thread(
+                        np.fromfile, vectors_path, dtype=dtype,
+                        count=rows - self.loaded_rows, offset=self.loaded_rows * dtype.itemsize
+                    )
+                except FileNotFoundError:
+                    # Replaced by a rebuild; its meta.json is picked up next time
+                    return
+                self.loaded_rows = rows
+                self._append(
+                    [record.tobytes() for record in records["id"]],
+                    records["vector"].astype(np.float32)
+                )
+
+    def _append(self, ids: List[bytes], vectors: "np.ndarray") -> None:
+        needed = self.count + len(ids)
+        if needed > len(self.matrix):
+            capacity = max(needed, 2 * len(self.matrix), 1024)
+            matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+            matrix[:self.count] = self.matrix[:self.count]
+            live = np.zeros(capacity, dtype=bool)
+            live[:self.count] = self.live[:self.count]
+            self.matrix, self.live = matrix, live
+
+        self.matrix[self.count:needed] = vectors
+        for offset, article_id in enumerate(ids):
+            row = self.count + offset
+            previous = self.row_of.get(article_id)
+            if previous is not None:
+                # Re-embedded article, the latest row wins
+                self.live[previous] = False
+            self.row_of[article_id] = row
+            self.ids.append(article_id)
+            self.live[row] = True
+        self.count = needed
+
+        if self._needs_reindex() and (self._reindexing is None or self._reindexing.done()):
+            self._reindexing = asyncio.create_task(self._reindex())
+
+    def _codes(self, vectors: "np.ndarray") -> "np.ndarray":
+        """LSH bucket code of each vector in each table, shape (tables, rows)."""
+        bits = np.einsum("tbd,nd->tnb", self.planes, vectors) > 0
+        return bits.astype(np.int64) @ (1 << np.arange(self.lsh_bits, dtype=np.int64))
+
+    def _needs_reindex(self) -> bool:
+        return self.count > self.exact_max_rows and self.count - self.indexed_rows > self.REINDEX_AFTER
+
+    def _sort_codes(self, vectors: "np.ndarray") -> Tuple[List["np.ndarray"], List["np.ndarray"]]:
+        codes = self._codes(vectors)
+        sorted_rows = [np.argsort(table, kind="stable") for table in codes]
+        return sorted_rows, [table[order] for table, order in zip(codes, sorted_rows)]
+
+    async def _reindex(self) -> None:
+        """Re-sort the LSH tables in a thread and swap them in when done."""
+        while self._needs_reindex():
+            meta, count = self._meta, self.count
+            try:
+                tables = await asyncio.to_thread(self._sort_codes, self.matrix[:count])
+            except Exception as e:
+                logger.error(f"Re-sorting the related index failed: {str(e)}")
+                return
+            # A new generation loaded meanwhile gets tables of its own
+            if self._meta is meta:
+                self.sorted_rows, self.sorted_codes = tables
+                self.indexed_rows = count
+
+    def _lookup(self, codes: "np.ndarray", flips: "np.ndarray") -> List["np.ndarray"]:
+        found = []
+        for table, code in enumerate(codes):
+            probes = code ^ flips
+            starts = np.searchsorted(self.sorted_codes[table], probes, side="left")
+            ends = np.searchsorted(self.sorted_codes[table], probes, side="right")
+            found.extend(self.sorted_rows[table][start:end] for start, end in zip(starts, ends) if end > start)
+        return found
+
+    def _candidates(self, vector: "np.ndarray", limit: int) -> "np.ndarray":
+        codes = self._codes(vector[None, :])[:, 0]
+        found = [np.arange(self.indexed_rows, self.count)]
+        found.extend(self._lookup(codes, np.zeros(1, dtype=np.int64)))
+        candidates = np.unique(np.concatenate(found))
+        if len(candidates) <= limit:
+            # Sparse neighbourhood: also probe the buckets one bit away
+            found.extend(self._lookup(codes, 1 << np.arange(self.lsh_bits, dtype=np.int64)))
+            candidates = np.unique(np.concatenate(found))
+        return candidates
+
+    def _search(self, vector: "np.ndarray", limit: int, exclude: Optional[bytes]) -> List[Tuple[UUID, float]]:
+        if self.count == 0:
+            return []
+        if self.count <= self.exact_max_rows or not self.sorted_codes:
+            # Score the matrix in place; gathering rows would copy it
+            rows = np.arange(self.count)
+            scores = self.matrix[:self.count] @ vector
+            scores[~self.live[:self.count]] = -np.inf
+        else:
+            rows = self._candidates(vector, limit)
+            rows = rows[self.live[rows]]
+            scores = self.matrix[rows] @ vector
+        if exclude in self.row_of:
+            scores[rows == self.row_of[exclude]] = -np.inf
+
+        if len(rows) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+        return [(UUID(bytes=self.ids[rows[i]]), float(scores[i])) for i in top if scores[i] > 0]
+
+    def embed(self, articles: Sequence[Any]) -> "np.ndarray":
+        """Unit vectors of articles under the index's current IDF weights."""
+        raw = self.embedder.raw(articles)
+        if self.idf is not None and len(self.idf) == raw.shape[1]:
+            raw = raw * self.idf
+        return normalize_rows(raw)
+
+    def _compatible(self) -> bool:
+        if self._meta is None:
+            return False
+        if self._meta["embedder"] != self.embedder.name:
+            logger.warning(
+                f"Related index was built with {self._meta['embedder']}, "
+                f"not {self.embedder.name}; rebuild it"
+            )
+            return False
+        return True
+
+    async def related(self, article: Any, limit: int = 10) -> List[Tuple[UUID, float]]:
+        """Ids and cosine similarities of the articles closest to ``article``.
+
+        Indexed articles are looked up by their stored vector; others (e.g.
+        created by a process whose append isn't visible yet) are embedded
+        on the fly.
+        """
+        if not self.enabled:
+            return []
+        # While another lookup is syncing, use the rows already loaded
+        if not self._sync_lock.locked():
+            await self._sync()
+        if self._meta is None:
+            return []
+
+        key = article.id.bytes
+        row = self.row_of.get(key)
+        if row is not None and self.live[row]:
+            vector = self.matrix[row]
+        elif self._compatible():
+            vector = (await asyncio.to_thread(self.embed, [article]))[0]
+        else:
+            return []
+        return self._search(vector, limit, exclude=key)
+
+    async def add(self, articles: Sequence[Any]) -> int:
+        """Embed new or changed articles and append them to the index."""
+        if not self.enabled or not articles:
+            return 0
+        async with self._lock:
+            await self._sync()
+            if self._meta is None:
+                os.makedirs(self.path, exist_ok=True)
+                self._write_meta({
+                    "generation": 0,
+                    "embedder": self.embedder.name,
+                    "dim": self.embedder.dim,
+                    "built_at": None
+                })
+                await self._sync()
+            if not self._compatible():
+                return 0
+
+            vectors = await asyncio.to_thread(self.embed, articles)
+            records = np.zeros(len(articles), dtype=self._record_dtype(self.dim))
+            records["id"] = [np.frombuffer(article.id.bytes, dtype=np.uint8) for article in articles]
+            records["vector"] = vectors
+            written = await asyncio.to_thread(self._write_records, records.tobytes(), self._meta)
+            await self._sync()
+            return len(articles) if written else 0
+
+    def _write_records(self, data: bytes, meta: Dict[str, Any]) -> bool:
+        """Append records to the current generation if it still holds vectors like them."""
+        with self._file_lock():
+            # A rebuild may have switched generations since the records were embedded
+            current = self._read_meta()
+            if current is None or (current["embedder"], current["dim"]) != (meta["embedder"], meta["dim"]):
+                logger.warning("Related index changed embedders while adding articles; dropped them")
+                return False
+            # One write per batch; O_APPEND keeps concurrent writers' records whole
+            with open(self._file(f"vectors-{current['generation']}.bin"), "ab") as f:
+                f.write(data)
+            return True
+
+    def _switch(self, previous: Optional[Dict[str, Any]], previous_rows: int, meta: Dict[str, Any]) -> None:
+        """Carry over rows other processes appended to the previous generation, then switch to ``meta``.
+
+        Under the file lock no row can land in the previous generation
+        between the copy and the switch.
+        """
+        dtype = self._record_dtype(meta["dim"])
+        with self._file_lock():
+            if previous and previous["embedder"] == meta["embedder"]:
+                old_path = self._file(f"vectors-{previous['generation']}.bin")
+                if os.path.exists(old_path):
+                    with open(old_path, "rb") as f:
+                        f.seek(previous_rows * dtype.itemsize)
+                        tail = f.read()
+                    tail = tail[:len(tail) // dtype.itemsize * dtype.itemsize]
+                    if tail:
+                        with open(self._file(f"vectors-{meta['generation']}.bin"), "ab") as f:
+                            f.write(tail)
+            self._write_meta(meta)
+
+        if previous:
+            for name in (f"vectors-{previous['generation']}.bin", f"idf-{previous['generation']}.npy"):
+                if os.path.exists(self._file(name)):
+                    os.remove(self._file(name))
+
+    async def _corpus(self, db: AsyncSession, batch_size: int):
+        """Batches of hot articles' text, oldest first."""
+        columns = (NewsArticle.id, NewsArticle.published_date, NewsArticle.title, NewsArticle.summary, NewsArticle.content)
+        last = None
+        while True:
+            query = select(*columns).order_by(NewsArticle.published_date, NewsArticle.id).limit(batch_size)
+            if last is not None:
+                query = query.where(or_(
+                    NewsArticle.published_date > last.published_date,
+                    and_(NewsArticle.published_date == last.published_date, NewsArticle.id > last.id)
+                ))
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return
+            yield [row._asdict() for row in rows]
+            last = rows[-1]
+
+    async def rebuild(self, db: AsyncSession, batch_size: int = settings.EMBEDDING_REBUILD_BATCH_SIZE) -> Dict[str, Any]:
+        """Re-embed every hot article into a new generation and switch to it."""
+        if not self.enabled:
+            return {"skipped": "numpy is not installed"}
+        async with self._lock:
+            await self._sync()
+            previous = self._meta
+            previous_rows = self.loaded_rows
+            generation = (previous["generation"] + 1) if previous else 1
+            embedder = self.embedder
+
+            ids: List[bytes] = []
+            batches = []
+            async for batch in self._corpus(db, batch_size):
+                ids.extend(row["id"].bytes for row in batch)
+                batches.append(await asyncio.to_thread(embedder.raw, batch))
+            raw = np.vstack(batches) if batches else np.zeros((0, embedder.dim), dtype=np.float32)
+            idf = embedder.fit_idf(raw)
+            vectors = normalize_rows(raw * idf if idf is not None else raw)
+
+            dtype = self._record_dtype(embedder.dim)
+            records = np.zeros(len(ids), dtype=dtype)
+            if ids:
+                records["id"] = np.frombuffer(b"".join(ids), dtype=np.uint8).reshape(-1, 16)
+                records["vector"] = vectors
+
+            os.makedirs(self.path, exist_ok=True)
+            vectors_path = self._file(f"vectors-{generation}.bin")
+            await asyncio.to_thread(records.tofile, vectors_path)
+            if idf is not None:
+                np.save(self._file(f"idf-{generation}.npy"), idf)
+
+            await asyncio.to_thread(self._switch, previous, previous_rows, {
+                "generation": generation,
+                "embedder": embedder.name,
+                "dim": embedder.dim,
+                "built_at": datetime.utcnow().isoformat()
+            })
+            await self._sync()
+
+        logger.info(f"Rebuilt related index generation {generation} with {len(ids)} articles")
+        return {"generation": generation, "articles": len(ids), "embedder": embedder.name}
+
+related_index = RelatedIndex()
\ No newline at end of file
@@ -0,0 +1,99 @@
+# app/services/news_queries.py
+
+from datetime import date
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, and_
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import Select
+
+from app.models.news import NewsArticle
+from app.models.prompt import Prompt, PromptType
+from app.core.serialization import ARTICLE_FIELDS
+from app.utils.dates import day_range
+
+# Always loaded: identity, keyset cursor and grouping
+KEY_FIELDS = ("id", "prompt_id", "published_date")
+# What card views render; `fields=card`
+CARD_FIELDS = KEY_FIELDS + ("slug", "title", "summary", "image_url", "image_variants")
+
+def visible_to(user_id: Optional[UUID]):
+    """Prompt visibility: public and internal prompts plus the user's own private ones.
+
+    Anonymous readers (no user) only see public prompts.
+    """
+    if user_id is None:
+        return Prompt.type == PromptType.PUBLIC
+    return (
+        (Prompt.type == PromptType.PUBLIC) |
+        (Prompt.type == PromptType.INTERNAL) |
+        ((Prompt.type == PromptType.PRIVATE) & (Prompt.user_id == user_id))
+    )
+
+def public_news_query(date_filter: Optional[date] = None) -> Select:
+    """Newest-first public articles, optionally limited to one day."""
+    query = (
+        select(NewsArticle)
+        .join(Prompt)
+        .where(Prompt.type == PromptType.PUBLIC)
+        .order_by(NewsArticle.published_date.desc())
+    )
+
+    if date_filter:
+        start, end = day_range(date_filter)
+        query = query.where(
+            and_(
+                NewsArticle.published_date >= start,
+                NewsArticle.published_date < end
+            )
+        )
+
+    return query
+
+def news_for_day_query(day: date, user_id: Optional[UUID] = None) -> Select:
+    """Articles of one day visible to a user (public only without one)."""
+    start, end = day_range(day)
+    return (
+        select(NewsArticle)
+        .join(Prompt)
+        .where(
+            and_(
+                NewsArticle.published_date >= start,
+                NewsArticle.published_date < end,
+                visible_to(user_id)
+            )
+        )
+    )
+
+def user_news_query(user_id: UUID) -> Select:
+    """Newest-first articles of the prompts a user owns."""
+    return (
+        select(NewsArticle, Prompt)
+        .join(Prompt, NewsArticle.prompt_id == Prompt.id)
+        .where(Prompt.user_id == user_id)
+        .order_by(NewsArticle.published_date.desc())
+    )
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Article fields named by a ``fields=`` parameter; None selects full rows.
+
+    ``card`` stands for the card-view fields. Raises ValueError on unknown names.
+    """
+    if not fields:
+        return None
+    if fields == "card":
+        return CARD_FIELDS
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in ARTICLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown article fields: {', '.join(unknown)}")
+    return KEY_FIELDS + tuple(name for name in requested if name not in KEY_FIELDS)
+
+def project(query: Select, fields: Tuple[str, ...], with_prompt: bool = False) -> Select:
+    """Load only the given article columns (and prompt type and name when selected)."""
+    options = [load_only(*[getattr(NewsArticle, name) for name in fields])]
+    if with_prompt:
+        options.append(load_only(Prompt.type, Prompt.name))
+    return query.options(*options)
\ No newline at end of file
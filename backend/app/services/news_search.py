@@ -0,0 +1,108 @@
+# app/services/news_search.py
+
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import logging
+
+from sqlalchemy import select, func, literal_column, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.serialization import article_data
+from app.models.news import NewsArticle, SEARCH_CONFIG
+from app.models.prompt import Prompt, PromptType
+from app.schemas.news import NewsFilter
+from app.services.news_queries import visible_to, CARD_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# ts_headline options for result excerpts
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+class NewsSearch:
+    """Ranked full-text search over news_articles.search_vector.
+
+    Matching, ranking and filtering run in one indexed query (GIN on the
+    generated tsvector). Headlines, which re-parse the article text, are
+    only computed for the rows of the requested page. Archived months are
+    not searched.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _conditions(tsquery, filters: NewsFilter, user_id: Optional[UUID]) -> List:
+        conditions = [
+            NewsArticle.search_vector.op("@@")(tsquery),
+            visible_to(user_id)
+        ]
+        if filters.date_from:
+            conditions.append(NewsArticle.published_date >= filters.date_from)
+        if filters.date_to:
+            conditions.append(NewsArticle.published_date < filters.date_to)
+        if filters.prompt_types:
+            conditions.append(Prompt.type.in_([PromptType(t) for t in filters.prompt_types]))
+        if filters.prompt_ids:
+            conditions.append(NewsArticle.prompt_id.in_(filters.prompt_ids))
+        return conditions
+
+    async def search(
+        self,
+        filters: NewsFilter,
+        user_id: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """One page of matches as card dicts with rank and headline, and whether more exist."""
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        tsquery = func.websearch_to_tsquery(config, filters.search_term)
+        rank = func.ts_rank_cd(NewsArticle.search_vector, tsquery, 32).label("rank")
+
+        # Rank and page on the index first, with only the key columns
+        matches = (
+            select(NewsArticle.id, NewsArticle.published_date, rank)
+            .join(Prompt)
+            .where(and_(*self._conditions(tsquery, filters, user_id)))
+            .order_by(rank.desc(), NewsArticle.published_date.desc(), NewsArticle.id)
+            .offset(skip)
+            .limit(limit + 1)
+            .subquery()
+        )
+
+        headline = func.ts_headline(
+            config,
+            func.coalesce(NewsArticle.summary, "") + " " + NewsArticle.content,
+            tsquery,
+            HEADLINE_OPTIONS
+        ).label("headline")
+        result = await self.db.execute(
+            select(
+                *[getattr(NewsArticle, name) for name in CARD_FIELDS],
+                Prompt.type,
+                Prompt.name,
+                matches.c.rank,
+                headline
+            )
+            .join(Prompt, NewsArticle.prompt_id == Prompt.id)
+            .join(
+                matches,
+                and_(
+                    NewsArticle.id == matches.c.id,
+                    NewsArticle.published_date == matches.c.published_date
+                )
+            )
+            .order_by(matches.c.rank.desc(), NewsArticle.published_date.desc(), NewsArticle.id)
+        )
+
+        rows = result.all()
+        hits = []
+        for row in rows[:limit]:
+            hit = article_data(dict(zip(CARD_FIELDS, row)), fields=CARD_FIELDS)
+            hit.update(
+                prompt_type=row.type,
+                prompt_name=row.name,
+                rank=float(row.rank),
+                headline=row.headline
+            )
+            hits.append(hit)
+        return hits, len(rows) > limit
\ No newline at end of file
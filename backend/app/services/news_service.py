@@ -1,16 +1,19 @@
 # app/services/news_service.py
 
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import logging
 
+from app.core.cache import response_cache
+from app.core.serialization import article_data
 from app.models.news import NewsArticle
 from app.models.prompt import Prompt, PromptType
 from app.schemas.news import NewsArticleCreate
 from app.utils.slug import generate_news_slug
+from app.services.news_queries import news_for_day_query
 from app.api.v1.endpoints.websocket import broadcast_new_article
 
 logger = logging.getLogger(__name__)
@@ -27,9 +30,12 @@ class NewsService:
             await self.db.commit()
             await self.db.refresh(news)
             
+            if news.prompt.type == PromptType.PUBLIC:
+                await response_cache.invalidate()
+            
             # Broadcast new article via WebSocket
             await broadcast_new_article(
-                article=news,
+                article=article_data(news, news.prompt),
                 prompt_type=news.prompt.type,
                 user_id=news.prompt.user_id if news.prompt.type == PromptType.PRIVATE else None
             )
@@ -47,22 +53,7 @@ class NewsService:
         user_id: Optional[UUID] = None
     ) -> List[NewsArticle]:
         """Get news articles for a specific date."""
-        query = (
-            select(NewsArticle)
-            .join(Prompt)
-            .where(NewsArticle.published_date.cast(date) == date)
-        )
-        
-        if user_id:
-            query = query.where(
-                (Prompt.type == PromptType.PUBLIC) |
-                (Prompt.type == PromptType.INTERNAL) |
-                ((Prompt.type == PromptType.PRIVATE) & (Prompt.user_id == user_id))
-            )
-        else:
-            query = query.where(Prompt.type == PromptType.PUBLIC)
-        
-        news = await self.db.scalars(query)
+        news = await self.db.scalars(news_for_day_query(date, user_id))
         return news.all()
 
     async def get_news_for_processing(self, hours_back: int = 24) -> List[NewsArticle]:
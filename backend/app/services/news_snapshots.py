@@ -0,0 +1,266 @@
+# app/services/news_snapshots.py
+
+from datetime import datetime, date, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import gzip
+import json
+import logging
+
+from sqlalchemy import select, delete, and_, or_, cast, union, Date
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.serialization import dumps, article_data
+from app.models.news import NewsArticle, NewsArticleArchive, NewsSnapshot
+from app.models.prompt import Prompt, PromptType
+from app.services.news_archive import NewsArchive, DATETIME_COLUMNS
+from app.utils.dates import day_range
+
+logger = logging.getLogger(__name__)
+
+# Prompt types shared by every reader of a day, and so worth materializing
+SNAPSHOT_TYPES = (PromptType.PUBLIC, PromptType.INTERNAL)
+
+def article_items(articles: List[Tuple[Dict[str, Any], Prompt]]) -> List[Dict[str, Any]]:
+    """NewsArticleResponse dicts for (article row, prompt) pairs, newest first."""
+    items = [article_data(data, prompt) for data, prompt in articles]
+    items.sort(key=lambda item: item["published_date"], reverse=True)
+    return items
+
+def load_items(payload: bytes) -> List[Dict[str, Any]]:
+    """Items of a snapshot payload with their datetimes restored."""
+    items = json.loads(gzip.decompress(payload))
+    for item in items:
+        for column in DATETIME_COLUMNS:
+            if item.get(column):
+                item[column] = datetime.fromisoformat(item[column])
+    return items
+
+def project_items(items: bytes, fields: Tuple[str, ...]) -> bytes:
+    """Keep only the given article fields (and the prompt's) in a JSON item list."""
+    keep = set(fields) | {"prompt_type", "prompt_name"}
+    return dumps([
+        {key: value for key, value in item.items() if key in keep}
+        for item in json.loads(items)
+    ])
+
+def render_news_day(
+    day: date,
+    snapshots: Dict[PromptType, NewsSnapshot],
+    private_news: List[Dict[str, Any]],
+    fields: Optional[Tuple[str, ...]] = None
+) -> bytes:
+    """NewsDateResponse JSON, splicing the stored snapshot lists in unparsed.
+
+    With ``fields`` the lists are cut down to those article fields; the
+    private items are expected to be projected already.
+    """
+    lists = {
+        prompt_type: gzip.decompress(snapshots[prompt_type].payload)
+        for prompt_type in SNAPSHOT_TYPES
+    }
+    if fields:
+        lists = {prompt_type: project_items(items, fields) for prompt_type, items in lists.items()}
+    updated_at = max(
+        [snapshot.updated_at for snapshot in snapshots.values() if snapshot.updated_at]
+        + [item["updated_at"] for item in private_news if item.get("updated_at")]
+        + [datetime.combine(day, time.min)]
+    )
+    total = sum(snapshot.article_count for snapshot in snapshots.values()) + len(private_news)
+
+    return b"".join([
+        b'{"date":', json.dumps(datetime.combine(day, time.min).isoformat()).encode(),
+        b',"public_news":', lists[PromptType.PUBLIC],
+        b',"internal_news":', lists[PromptType.INTERNAL],
+        b',"private_news":', dumps(private_news),
+        b',"total_count":', str(total).encode(),
+        b',"updated_at":', json.dumps(updated_at.isoformat()).encode(),
+        b'}'
+    ])
+
+class NewsSnapshots:
+    """Materialized per-day public and internal article lists.
+
+    A day's snapshot is built in full once it has closed and is then served
+    without touching news_articles. Today's snapshot is kept current
+    incrementally: only articles updated after its watermark are read and
+    merged in. Snapshots are written through the caller's session; callers
+    commit.
+
+    ``updated_at`` is stamped when a row is flushed, not when it commits, so
+    merges re-read ``NEWS_SNAPSHOT_MERGE_OVERLAP`` seconds before the
+    watermark to pick up rows committed late; anything later still is picked
+    up by the full rebuild once the day closes.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def is_closed(day: date) -> bool:
+        return day < datetime.utcnow().date()
+
+    async def load(self, day: date) -> Dict[PromptType, NewsSnapshot]:
+        result = await self.db.scalars(
+            select(NewsSnapshot).where(NewsSnapshot.snapshot_date == day)
+        )
+        return {snapshot.prompt_type: snapshot for snapshot in result.all()}
+
+    async def _articles(
+        self,
+        day: date,
+        prompt_type: PromptType,
+        updated_after: Optional[datetime] = None
+    ) -> List[Tuple[Dict[str, Any], Prompt]]:
+        """Articles of one prompt type published on a day."""
+        start, end = day_range(day)
+        conditions = [
+            NewsArticle.published_date >= start,
+            NewsArticle.published_date < end,
+            Prompt.type == prompt_type
+        ]
+        if updated_after:
+            conditions.append(NewsArticle.updated_at > updated_after)
+
+        result = await self.db.execute(
+            select(NewsArticle, Prompt).join(Prompt).where(and_(*conditions))
+        )
+        articles = [(article_data(article), prompt) for article, prompt in result.all()]
+
+        # Archived months can't change, so only full builds read them
+        archive = NewsArchive(self.db)
+        if updated_after is None and archive.covers(start):
+            hot_ids = {data['id'] for data, _ in articles}
+            articles.extend(
+                (data, prompt)
+                for data, prompt in await archive.get_articles(start, end, Prompt.type == prompt_type)
+                if UUID(str(data['id'])) not in hot_ids
+            )
+        return articles
+
+    async def _save(
+        self,
+        day: date,
+        prompt_type: PromptType,
+        items: List[Dict[str, Any]],
+        is_final: bool
+    ) -> NewsSnapshot:
+        values = {
+            "payload": gzip.compress(
+                dumps(items),
+                compresslevel=settings.NEWS_SNAPSHOT_COMPRESSION_LEVEL
+            ),
+            "article_count": len(items),
+            "prompt_ids": sorted({UUID(str(item["prompt_id"])) for item in items}, key=str),
+            "source_updated_at": max((item["updated_at"] for item in items if item.get("updated_at")), default=None),
+            "is_final": is_final,
+            "updated_at": datetime.utcnow()
+        }
+        # Concurrent builders of the same day converge on one row
+        await self.db.execute(
+            insert(NewsSnapshot)
+            .values(snapshot_date=day, prompt_type=prompt_type, **values)
+            .on_conflict_do_update(
+                index_elements=["snapshot_date", "prompt_type"],
+                set_=values
+            )
+        )
+        return await self.db.scalar(
+            select(NewsSnapshot)
+            .where(and_(NewsSnapshot.snapshot_date == day, NewsSnapshot.prompt_type == prompt_type))
+            .execution_options(populate_existing=True)
+        )
+
+    async def build(self, day: date, prompt_type: PromptType) -> NewsSnapshot:
+        """Materialize one day and prompt type from scratch."""
+        is_final = self.is_closed(day)
+        items = article_items(await self._articles(day, prompt_type))
+        return await self._save(day, prompt_type, items, is_final)
+
+    async def _merge(self, snapshot: NewsSnapshot) -> NewsSnapshot:
+        """Fold articles updated since the snapshot's watermark into it."""
+        watermark = snapshot.source_updated_at
+        if watermark:
+            watermark -= timedelta(seconds=settings.NEWS_SNAPSHOT_MERGE_OVERLAP)
+        stored = {str(item["id"]): item for item in load_items(snapshot.payload)}
+        # The overlap re-reads rows already merged; only newer versions count
+        changed = [
+            item for item in article_items(await self._articles(
+                snapshot.snapshot_date, snapshot.prompt_type, watermark
+            ))
+            if stored.get(str(item["id"]), {}).get("updated_at") != item["updated_at"]
+        ]
+        if not changed:
+            return snapshot
+
+        changed_ids = {str(item["id"]) for item in changed}
+        items = changed + [
+            item for item_id, item in stored.items()
+            if item_id not in changed_ids
+        ]
+        items.sort(key=lambda item: item["published_date"], reverse=True)
+        return await self._save(snapshot.snapshot_date, snapshot.prompt_type, items, False)
+
+    async def current(self, day: date) -> Dict[PromptType, NewsSnapshot]:
+        """Up-to-date snapshots of a day, building or merging as needed."""
+        snapshots = await self.load(day)
+        for prompt_type in SNAPSHOT_TYPES:
+            snapshot = snapshots.get(prompt_type)
+            if snapshot is None or (not snapshot.is_final and self.is_closed(day)):
+                snapshots[prompt_type] = await self.build(day, prompt_type)
+            elif not snapshot.is_final:
+                snapshots[prompt_type] = await self._merge(snapshot)
+        return snapshots
+
+    async def finalize_closed_days(self, days: int = settings.NEWS_SNAPSHOT_BACKFILL_DAYS) -> List[str]:
+        """Rebuild recently closed days in full so they can be served as-is."""
+        today = datetime.utcnow().date()
+        finalized = []
+        for offset in range(1, days + 1):
+            day = today - timedelta(days=offset)
+            snapshots = await self.load(day)
+            for prompt_type in SNAPSHOT_TYPES:
+                snapshot = snapshots.get(prompt_type)
+                if snapshot is None or not snapshot.is_final:
+                    # A full rebuild also drops articles deleted since the merge
+                    await self.build(day, prompt_type)
+                    finalized.append(f"{day}:{prompt_type.value}")
+            await self.db.commit()
+        return finalized
+
+    async def drop_final(self, day: date, prompt_type: PromptType) -> int:
+        """Drop a day's final snapshot after one of its articles changed.
+
+        Final snapshots are served as-is, so the next read rebuilds it; open
+        ones pick the change up by merging on ``updated_at``.
+        """
+        result = await self.db.execute(
+            delete(NewsSnapshot).where(and_(
+                NewsSnapshot.snapshot_date == day,
+                NewsSnapshot.prompt_type == prompt_type,
+                NewsSnapshot.is_final == True
+            ))
+        )
+        return result.rowcount
+
+    async def invalidate_prompt(self, prompt_id: UUID, prompt_type: Optional[PromptType] = None) -> int:
+        """Drop snapshots holding a prompt's articles; rebuilt on next read.
+
+        With ``prompt_type``, the prompt's current type, snapshots of that type
+        are dropped for every day the prompt has articles too, so articles of
+        a prompt that just became public or internal show up.
+        """
+        condition = NewsSnapshot.prompt_ids.any(prompt_id)
+        if prompt_type in SNAPSHOT_TYPES:
+            days = union(
+                select(cast(NewsArticle.published_date, Date)).where(NewsArticle.prompt_id == prompt_id),
+                select(cast(NewsArticleArchive.published_date, Date)).where(NewsArticleArchive.prompt_id == prompt_id)
+            )
+            condition = or_(
+                condition,
+                and_(NewsSnapshot.prompt_type == prompt_type, NewsSnapshot.snapshot_date.in_(days))
+            )
+        result = await self.db.execute(delete(NewsSnapshot).where(condition))
+        return result.rowcount
\ No newline at end of file
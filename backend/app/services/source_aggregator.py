@@ -56,6 +56,21 @@ class SourceAggregator:
             logger.error(f"Error aggregating sources: {str(e)}")
             raise
 
+    @staticmethod
+    def source_reference(article: Dict[str, Any]) -> Dict[str, Any]:
+        """A source article without its content, enough to load it again."""
+        return {key: value for key, value in article.items() if key != 'content'}
+
+    async def load_sources(self, references: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fetch the content of previously aggregated source articles again."""
+        return [
+            {
+                **reference,
+                'content': await self.rss_processor._get_article_content(reference['link'], '')
+            }
+            for reference in references
+        ]
+
     async def __aenter__(self):
         return self
 
@@ -1,10 +1,11 @@
 # app/tasks/news_generator.py
 
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Callable, List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, func
 from sqlalchemy import text
+from sqlalchemy.orm.attributes import flag_modified
 import logging
 import asyncio
 from app.models.ai_config import LLMConfig, ImageConfig
@@ -12,6 +13,8 @@ from app.models.prompt import Prompt
 from app.models.task import Task, TaskStatus, TaskType
 from app.models.news import NewsArticle
 from app.services.content_processor import ContentProcessor
+from app.services.source_aggregator import SourceAggregator
+from app.tasks.retention import RetentionManager
 from app.services.llm_service import LLMService
 from app.services.image_service import ImageService
 from app.core.config import settings
@@ -67,124 +70,218 @@ class NewsGenerator:
     async def generate_news_for_prompt(
         self,
         prompt: Prompt,
-        task: Optional[Task] = None
+        task: Optional[Task] = None,
+        articles: Optional[List[Dict]] = None,
+        on_article: Optional[Callable[[NewsArticle], None]] = None
     ) -> NewsArticle:
         """Generate news for a single prompt."""
         try:
             if not self.content_processor:
                 await self.initialize_services()
 
-            # Create a local task variable if it doesn't exist
-            current_task = task
-            
             article = await self.content_processor.process_prompt(
                 prompt=prompt,
-                task_id=current_task.id if current_task else None
+                task_id=task.id if task else None,
+                articles=articles,
+                on_article=on_article
             )
             return article
 
         except Exception as e:
             error_msg = f"Error processing prompt {prompt.id}: {str(e)}"
             logger.error(error_msg)
-            if current_task:  # Use the local variable here
-                current_task.error_message = error_msg
-                await self.db.commit()
             raise ValueError(error_msg)
 
+    async def _save_checkpoint(self, task: Task, checkpoint: Dict[str, Any]) -> None:
+        """Persist run progress so a retried task resumes where it stopped."""
+        task.checkpoint = checkpoint
+        flag_modified(task, "checkpoint")
+        await self.db.commit()
+
+    async def _settle(self, task: Task, new_status: TaskStatus, **values) -> None:
+        """Record the run's outcome unless the task was cancelled meanwhile.
+
+        The row stays locked from re-reading its status to the write, so a
+        concurrent cancel is either seen here or finds the task finished.
+        """
+        await self.db.refresh(task, with_for_update=True)
+        if task.status == TaskStatus.CANCELLED:
+            logger.info(f"Task {task.id} was cancelled before it finished")
+        else:
+            if new_status == TaskStatus.COMPLETED:
+                task.checkpoint = None
+            task.update_status(new_status, **values)
+        await self.db.commit()
+
     async def run_generation_task(self, task: Task) -> None:
-        """Execute the news generation task."""
+        """Execute the news generation task, resuming from its checkpoint."""
         try:
             # Initialize services first
             if not self.content_processor:
                 await self.initialize_services()
 
-            # Update task status
+            # Update task status, unless it was cancelled since it was claimed
+            await self.db.refresh(task, with_for_update=True)
+            if task.status == TaskStatus.CANCELLED:
+                await self.db.commit()
+                return
             task.update_status(TaskStatus.IN_PROGRESS)
             task.started_at = datetime.utcnow()
             await self.db.commit()
 
-            # Get active prompts
-            query = select(Prompt).where(
-                and_(
-                    Prompt.is_active == True,
-                    or_(
-                        Prompt.last_run_at.is_(None),
-                        Prompt.last_run_at <= func.now() - text("interval '1 hour'")
+            checkpoint = dict(task.checkpoint or {})
+            if checkpoint.get("prompt_ids"):
+                # Resume: only prompts that have not produced an article yet
+                pending_ids = [
+                    prompt_id for prompt_id in checkpoint["prompt_ids"]
+                    if prompt_id not in checkpoint["done"]
+                ]
+                logger.info(
+                    f"Resuming task {task.id}: {len(checkpoint['done'])} prompts done, "
+                    f"{len(pending_ids)} pending"
+                )
+                query = select(Prompt).where(
+                    and_(
+                        Prompt.id.in_(pending_ids),
+                        Prompt.is_active == True
+                    )
+                )
+            elif (task.parameters or {}).get("prompt_id"):
+                # Scheduled run of a single prompt
+                query = select(Prompt).where(
+                    and_(
+                        Prompt.id == task.parameters["prompt_id"],
+                        Prompt.is_active == True
+                    )
+                )
+            else:
+                # Get active prompts
+                query = select(Prompt).where(
+                    and_(
+                        Prompt.is_active == True,
+                        or_(
+                            Prompt.last_run_at.is_(None),
+                            Prompt.last_run_at <= func.now() - text("interval '1 hour'")
+                        )
                     )
                 )
-            )
             result = await self.db.execute(query)
             prompts = result.scalars().all()
 
-            if not prompts:
+            if not prompts and not checkpoint.get("done"):
                 logger.info("No prompts to process")
-                task.update_status(
+                await self._settle(
+                    task,
                     TaskStatus.COMPLETED,
                     result={"message": "No prompts to process"}
                 )
-                await self.db.commit()
                 return
 
-            # Process prompts
-            results = {
-                "successful": [],
-                "failed": [],
-                "total_prompts": len(prompts)
-            }
+            if not checkpoint.get("prompt_ids"):
+                checkpoint = {
+                    "prompt_ids": [str(prompt.id) for prompt in prompts],
+                    "done": {},      # prompt id -> article id
+                    "failed": {},    # prompt id -> last error
+                    "sources": {}    # prompt id -> references to its fetched sources
+                }
+                await self._save_checkpoint(task, checkpoint)
+
+            # Failed prompts roll back and expire the loaded prompts, so go by id
+            for prompt_id in [prompt.id for prompt in prompts]:
+                prompt = await self.db.get(Prompt, prompt_id)
+                # Stop between prompts once the task has been cancelled
+                await self.db.refresh(task, ['status'])
+                if task.status == TaskStatus.CANCELLED:
+                    logger.info(f"Task {task.id} cancelled after {len(checkpoint['done'])} prompts")
+                    await self._save_checkpoint(task, checkpoint)
+                    return
+
+                prompt_key = str(prompt.id)
+
+                def mark_done(article: NewsArticle, prompt_key: str = prompt_key) -> None:
+                    # Commits with the article, so a resumed run never writes it twice
+                    task.checkpoint = {
+                        "prompt_ids": checkpoint["prompt_ids"],
+                        "done": {**checkpoint["done"], prompt_key: str(article.id)},
+                        "failed": {k: v for k, v in checkpoint["failed"].items() if k != prompt_key},
+                        "sources": {k: v for k, v in checkpoint["sources"].items() if k != prompt_key}
+                    }
 
-            for prompt in prompts:
                 try:
-                    article = await self.generate_news_for_prompt(prompt, task)
-                    if article:
-                        results["successful"].append(str(article.id))
-                        prompt.last_run_at = func.now()
-                        await self.db.commit()
+                    # Sources picked by an earlier attempt are reused; only
+                    # references are checkpointed and their content is loaded again
+                    references = checkpoint["sources"].get(prompt_key)
+                    if references:
+                        articles = await self.content_processor.load_sources(references)
+                    else:
+                        articles = await self.content_processor.fetch_sources(prompt)
+                        if articles:
+                            checkpoint["sources"][prompt_key] = [
+                                SourceAggregator.source_reference(article) for article in articles
+                            ]
+                            await self._save_checkpoint(task, checkpoint)
+
+                    await self.generate_news_for_prompt(prompt, task, articles, on_article=mark_done)
+                    checkpoint = dict(task.checkpoint)
                 except Exception as e:
-                    error_msg = f"Error generating news for prompt {prompt.id}: {str(e)}"
+                    # The article may have committed before a later step failed
+                    await self.db.rollback()
+                    await self.db.refresh(task)
+                    if prompt_key in task.checkpoint["done"]:
+                        logger.warning(f"Prompt {prompt_id} produced its article but then failed: {str(e)}")
+                        checkpoint = dict(task.checkpoint)
+                        continue
+
+                    error_msg = f"Error generating news for prompt {prompt_id}: {str(e)}"
                     logger.error(error_msg)
-                    results["failed"].append({
-                        "prompt_id": str(prompt.id),
-                        "error": error_msg
-                    })
+                    checkpoint["failed"][prompt_key] = error_msg
+                    await self._save_checkpoint(task, checkpoint)
                     continue  # Continue with next prompt even if one fails
 
             # Update task completion
             completion_time = datetime.utcnow()
-            task.update_status(
-                TaskStatus.COMPLETED,
-                result={
-                    "successful_count": len(results["successful"]),
-                    "failed_count": len(results["failed"]),
-                    "total_prompts": len(prompts),
-                    "completion_time": completion_time.isoformat(),
-                    "details": results
+            task_result = {
+                "successful_count": len(checkpoint["done"]),
+                "failed_count": len(checkpoint["failed"]),
+                "total_prompts": len(checkpoint["prompt_ids"]),
+                "completion_time": completion_time.isoformat(),
+                "details": {
+                    "successful": list(checkpoint["done"].values()),
+                    "failed": [
+                        {"prompt_id": prompt_id, "error": error}
+                        for prompt_id, error in checkpoint["failed"].items()
+                    ],
+                    "total_prompts": len(checkpoint["prompt_ids"])
                 }
-            )
-            await self.db.commit()
+            }
+
+            if checkpoint["failed"]:
+                # Keep the checkpoint so a retry only redoes the failed prompts
+                await self._settle(
+                    task,
+                    TaskStatus.FAILED,
+                    error=f"{len(checkpoint['failed'])} of {len(checkpoint['prompt_ids'])} prompts failed",
+                    result=task_result
+                )
+            else:
+                await self._settle(task, TaskStatus.COMPLETED, result=task_result)
 
         except Exception as e:
             error_msg = f"News generation task failed: {str(e)}"
             logger.error(error_msg)
-            task.update_status(TaskStatus.FAILED, error=error_msg)
-            await self.db.commit()
+            await self.db.rollback()
+            await self._settle(task, TaskStatus.FAILED, error=error_msg)
             
             raise
 
-    async def cleanup_old_articles(self, days: int = 30) -> None:
-        """Clean up old articles to prevent database bloat."""
+    async def cleanup_old_articles(self, days: int = 30) -> int:
+        """Clean up old articles in set-based batches to prevent database bloat."""
         try:
-            # Use PostgreSQL's interval for date comparison
-            old_articles = await self.db.scalars(
-                select(NewsArticle)
-                .where(NewsArticle.created_at <= func.now() - func.interval(f'{days} days'))
-            )
-            
-            for article in old_articles:
-                await self.db.delete(article)
-            
-            await self.db.commit()
-            logger.info(f"Cleaned up articles older than {days} days")
+            removed = await RetentionManager(self.db).purge_articles(days)
+            logger.info(f"Cleaned up {removed} articles older than {days} days")
+            return removed
             
         except Exception as e:
             logger.error(f"Error cleaning up old articles: {str(e)}")
-            await self.db.rollback()
\ No newline at end of file
+            await self.db.rollback()
+            return 0
\ No newline at end of file
@@ -0,0 +1,224 @@
+# app/tasks/partitions.py
+
+from datetime import datetime, date
+from typing import Any, Dict, List
+import logging
+import re
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.news import NewsArticle, NewsArticleArchive
+from app.services.news_archive import month_start, add_months, archive_cutoff, encode_article
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PATTERN = re.compile(r"^news_articles_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "news_articles_default"
+
+# Columns kept in the archive; the search vector is derived and not archived
+ARCHIVED_COLUMNS = [column for column in NewsArticle.__table__.c if column.name != "search_vector"]
+
+def partition_name(month: date) -> str:
+    """Name of the news_articles partition holding a month."""
+    return f"news_articles_p{month:%Y_%m}"
+
+class NewsPartitionManager:
+    """Creates upcoming monthly news_articles partitions and archives old ones.
+
+    Archiving detaches a month in a short transaction of its own, then moves
+    its rows zlib-compressed into news_articles_archive batch by batch (each
+    batch deleted from the detached table as it commits) and finally drops
+    it. A failure leaves a detached table that the next run picks up again.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = settings.RETENTION_BATCH_SIZE
+    ):
+        self.db = db
+        self.batch_size = batch_size
+
+    async def list_partitions(self) -> List[date]:
+        """Months that currently have an attached partition."""
+        result = await self.db.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = 'news_articles'
+        """))
+
+        months = []
+        for (name,) in result.all():
+            match = PARTITION_PATTERN.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    async def list_detached(self) -> List[date]:
+        """Months whose partition is detached but not yet archived."""
+        result = await self.db.execute(text("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND NOT relispartition AND relname LIKE 'news_articles_p%'
+        """))
+        months = []
+        for (name,) in result.all():
+            match = PARTITION_PATTERN.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    async def _set_lock_timeout(self) -> None:
+        # DDL on news_articles queues every later query behind it while it
+        # waits for its lock; give up instead and retry on the next run
+        await self.db.execute(text(f"SET LOCAL lock_timeout = '{settings.NEWS_PARTITION_LOCK_TIMEOUT}s'"))
+
+    async def ensure_partitions(self, months_ahead: int = settings.NEWS_PARTITION_MONTHS_AHEAD) -> List[str]:
+        """Create partitions for the current month and the next ones."""
+        existing = set(await self.list_partitions())
+        this_month = month_start(datetime.utcnow().date())
+
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(this_month, offset)
+            if month in existing:
+                continue
+            await self._create_partition(month)
+            created.append(partition_name(month))
+
+        return created
+
+    async def _create_partition(self, month: date) -> None:
+        """Create a month's partition, moving its rows out of the DEFAULT partition.
+
+        Postgres refuses to create a partition while the default partition
+        holds rows of its range, so those rows are lifted into a temporary
+        table and re-inserted once the partition exists, in one transaction.
+        """
+        name = partition_name(month)
+        bounds = f"published_date >= '{month}' AND published_date < '{add_months(month, 1)}'"
+        columns = ", ".join(column.name for column in ARCHIVED_COLUMNS)
+        try:
+            await self._set_lock_timeout()
+            stray = await self.db.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {bounds})"))
+            if stray:
+                await self.db.execute(text(
+                    f"CREATE TEMP TABLE news_articles_moving ON COMMIT DROP AS "
+                    f"SELECT {columns} FROM {DEFAULT_PARTITION} WHERE {bounds}"
+                ))
+                await self.db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {bounds}"))
+
+            await self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF news_articles "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            ))
+
+            if stray:
+                moved = await self.db.execute(text(
+                    f"INSERT INTO news_articles ({columns}) SELECT {columns} FROM news_articles_moving"
+                ))
+                logger.info(f"Moved {moved.rowcount} articles from {DEFAULT_PARTITION} to {name}")
+            await self.db.commit()
+
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def _detach(self, name: str) -> None:
+        """Detach a partition in a transaction of its own, under the lock timeout.
+
+        DETACH takes an ACCESS EXCLUSIVE lock on news_articles, but only for
+        the catalog change, so readers wait at most the lock timeout plus a
+        moment. DETACH ... CONCURRENTLY would avoid the lock, but Postgres
+        refuses it while the table has a DEFAULT partition, which it always
+        has here.
+        """
+        try:
+            await self._set_lock_timeout()
+            await self.db.execute(text(f"ALTER TABLE news_articles DETACH PARTITION {name}"))
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def archive_month(self, month: date) -> int:
+        """Move one month of articles into the archive table; return rows moved.
+
+        Resumes a month left detached by an interrupted run.
+        """
+        name = partition_name(month)
+        if month in await self.list_partitions():
+            await self._detach(name)
+
+        columns = ", ".join(column.name for column in ARCHIVED_COLUMNS)
+        archived = 0
+        try:
+            while True:
+                # Typed columns, so JSON and array values come back decoded
+                rows = (await self.db.execute(
+                    text(f"SELECT {columns} FROM {name} ORDER BY id LIMIT :limit").columns(*ARCHIVED_COLUMNS),
+                    {"limit": self.batch_size}
+                )).mappings().all()
+                if not rows:
+                    break
+
+                await self.db.execute(
+                    NewsArticleArchive.__table__.insert(),
+                    [
+                        {
+                            "id": row["id"],
+                            "slug": row["slug"],
+                            "prompt_id": row["prompt_id"],
+                            "published_date": row["published_date"],
+                            "payload": encode_article(dict(row)),
+                            "archived_at": datetime.utcnow()
+                        }
+                        for row in rows
+                    ]
+                )
+                await self.db.execute(
+                    text(f"DELETE FROM {name} WHERE id = ANY(:ids)"),
+                    {"ids": [row["id"] for row in rows]}
+                )
+                await self.db.commit()
+                archived += len(rows)
+
+            await self.db.execute(text(f"DROP TABLE {name}"))
+            await self.db.commit()
+            return archived
+
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def archive_old_partitions(self) -> Dict[str, Any]:
+        """Archive every attached month older than ARTICLE_ARCHIVE_AFTER_MONTHS."""
+        if not settings.ARTICLE_ARCHIVE_AFTER_MONTHS:
+            return {}
+
+        cutoff = archive_cutoff()
+        report: Dict[str, Any] = {}
+        months = set(await self.list_partitions()) | set(await self.list_detached())
+        for month in sorted(months):
+            if month >= cutoff:
+                continue
+            started = time.perf_counter()
+            rows = await self.archive_month(month)
+            report[partition_name(month)] = {
+                "rows_archived": rows,
+                "duration": round(time.perf_counter() - started, 3)
+            }
+            logger.info(f"Archived {rows} articles from {partition_name(month)}")
+
+        return report
+
+    async def run(self) -> Dict[str, Any]:
+        """Create upcoming partitions and archive old ones."""
+        return {
+            "partitions_created": await self.ensure_partitions(),
+            "archived": await self.archive_old_partitions()
+        }
\ No newline at end of file
@@ -0,0 +1,181 @@
+# app/tasks/prompt_scheduler.py
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import heapq
+import logging
+import random
+
+from sqlalchemy import select, update, and_
+from croniter import croniter
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.prompt import Prompt
+from app.models.task import Task, TaskStatus, TaskType
+
+logger = logging.getLogger(__name__)
+
+def prompt_interval(prompt: Prompt) -> float:
+    """Seconds between runs of an interval-scheduled prompt."""
+    if prompt.schedule_interval:
+        return prompt.schedule_interval
+
+    # Priority n runs a default-scheduled prompt n + 1 times as often
+    interval = settings.NEWS_GENERATION_INTERVAL / (1 + max(prompt.priority or 0, 0))
+    return max(interval, settings.PROMPT_MIN_INTERVAL)
+
+def next_run_time(prompt: Prompt, after: datetime) -> datetime:
+    """Jittered time of the next run of a prompt after the given time."""
+    jitter = settings.PROMPT_SCHEDULE_JITTER
+
+    if prompt.schedule_cron:
+        schedule = croniter(prompt.schedule_cron, after)
+        next_run = schedule.get_next(datetime)
+        period = (schedule.get_next(datetime) - next_run).total_seconds()
+        # Cron times are lower bounds, so only ever delay them
+        return next_run + timedelta(seconds=random.uniform(0, jitter * period))
+
+    interval = prompt_interval(prompt)
+    return after + timedelta(seconds=interval * (1 + random.uniform(-jitter, jitter)))
+
+def first_run_time(prompt: Prompt, now: datetime) -> datetime:
+    """Initial run time, spread over one period so new schedules don't align."""
+    if prompt.schedule_cron:
+        return next_run_time(prompt, now)
+    return now + timedelta(seconds=random.uniform(0, prompt_interval(prompt)))
+
+class PromptScheduler:
+    """Queues a news generation task for each prompt when it is due.
+
+    Due times are kept in a min-heap of ``(next_run_at, -priority, prompt_id)``
+    that is rebuilt from the prompts table every ``PROMPT_SCHEDULE_REFRESH``
+    seconds, so new prompts and schedule edits are picked up. Several nodes
+    may run a scheduler; a run is queued only by the node whose
+    compare-and-set on ``next_run_at`` succeeds.
+    """
+
+    def __init__(self, refresh_interval: int = settings.PROMPT_SCHEDULE_REFRESH):
+        self.refresh_interval = refresh_interval
+        self.heap: List[Tuple[datetime, int, UUID]] = []
+        self.is_running = False
+        self._wake = asyncio.Event()
+
+    async def run(self) -> None:
+        """Dispatch due prompts until stopped."""
+        self.is_running = True
+        loop = asyncio.get_running_loop()
+        refreshed_at = None
+
+        while self.is_running:
+            try:
+                if refreshed_at is None or loop.time() - refreshed_at >= self.refresh_interval:
+                    await self.refresh()
+                    refreshed_at = loop.time()
+                await self.dispatch_due()
+            except Exception as e:
+                logger.error(f"Prompt scheduler iteration failed: {str(e)}")
+
+            delay = self.refresh_interval - (loop.time() - refreshed_at) if refreshed_at else 5
+            if self.heap:
+                delay = min(delay, (self.heap[0][0] - datetime.utcnow()).total_seconds())
+            await self._sleep(max(delay, 0.0))
+
+        logger.info("Prompt scheduler stopped")
+
+    def stop(self) -> None:
+        """Stop the scheduler."""
+        self.is_running = False
+        self._wake.set()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def refresh(self) -> None:
+        """Rebuild the heap from active prompts, scheduling unscheduled ones."""
+        now = datetime.utcnow()
+        async with async_session() as db:
+            result = await db.execute(select(Prompt).where(Prompt.is_active == True))
+            prompts = result.scalars().all()
+
+            heap = []
+            for prompt in prompts:
+                next_at = prompt.next_run_at
+                if next_at is None:
+                    next_at = first_run_time(prompt, now)
+                    claimed = await db.execute(
+                        update(Prompt)
+                        .where(and_(Prompt.id == prompt.id, Prompt.next_run_at.is_(None)))
+                        .values(next_run_at=next_at)
+                        .execution_options(synchronize_session=False)
+                    )
+                    if not claimed.rowcount:
+                        # Another node scheduled it; picked up next refresh
+                        continue
+                heap.append((next_at, -(prompt.priority or 0), prompt.id))
+            await db.commit()
+
+        heapq.heapify(heap)
+        self.heap = heap
+
+    async def dispatch_due(self) -> None:
+        """Queue a run for every prompt whose time has come."""
+        now = datetime.utcnow()
+        while self.heap and self.heap[0][0] <= now:
+            due_at, neg_priority, prompt_id = heapq.heappop(self.heap)
+            next_at = await self._queue_run(prompt_id, due_at, now)
+            if next_at:
+                heapq.heappush(self.heap, (next_at, neg_priority, prompt_id))
+
+    async def _queue_run(
+        self,
+        prompt_id: UUID,
+        due_at: datetime,
+        now: datetime
+    ) -> Optional[datetime]:
+        """Queue a task for a due prompt and return its next due time."""
+        async with async_session() as db:
+            prompt = await db.get(Prompt, prompt_id)
+            if not prompt or not prompt.is_active:
+                return None
+
+            next_at = next_run_time(prompt, now)
+            advanced = await db.execute(
+                update(Prompt)
+                .where(and_(Prompt.id == prompt_id, Prompt.next_run_at == due_at))
+                .values(next_run_at=next_at)
+                .execution_options(synchronize_session=False)
+            )
+            if not advanced.rowcount:
+                # Another node dispatched it, or its schedule was edited;
+                # the next refresh reloads its current due time
+                return None
+
+            # A slow prompt must not pile up runs behind itself
+            already_queued = await db.scalar(
+                select(Task.id)
+                .where(and_(
+                    Task.parameters['prompt_id'].as_string() == str(prompt_id),
+                    Task.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS])
+                ))
+                .limit(1)
+            )
+            if already_queued:
+                logger.warning(f"Skipping run of prompt {prompt_id}, previous run still queued")
+            else:
+                db.add(Task(
+                    name=f"News Generation: {prompt.name}",
+                    type=TaskType.NEWS_GENERATION,
+                    status=TaskStatus.PENDING,
+                    parameters={"prompt_id": str(prompt_id)},
+                    scheduled_at=due_at
+                ))
+
+            await db.commit()
+            return next_at
\ No newline at end of file
@@ -0,0 +1,111 @@
+# app/tasks/retention.py
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import logging
+import time
+
+from sqlalchemy import select, delete, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.news import NewsArticle, NewsImage, NewsSnapshot
+from app.models.stats import SystemStats
+from app.models.task import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+class RetentionManager:
+    """Deletes expired rows with chunked, set-based DELETE statements.
+
+    Each batch is ``DELETE ... WHERE id IN (SELECT id ... LIMIT n)`` in its own
+    short transaction, so no rows are loaded into the session and locks are
+    never held for the whole purge.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        batch_size: int = settings.RETENTION_BATCH_SIZE
+    ):
+        self.db = db
+        self.batch_size = batch_size
+
+    async def _delete_batches(self, model, condition, children: Optional[List] = None) -> int:
+        """Delete matching rows of a model batch by batch; return rows removed."""
+        removed = 0
+        while True:
+            ids = (await self.db.scalars(
+                select(model.id).where(condition).limit(self.batch_size)
+            )).all()
+            if not ids:
+                break
+
+            # Dependent rows first, in the same transaction as their parents
+            for child_model, foreign_key in children or []:
+                await self.db.execute(delete(child_model).where(foreign_key.in_(ids)))
+            result = await self.db.execute(delete(model).where(model.id.in_(ids)))
+            await self.db.commit()
+
+            removed += result.rowcount
+            if len(ids) < self.batch_size:
+                break
+
+        return removed
+
+    async def purge_articles(self, days: int) -> int:
+        """Delete articles, and their image records, older than the given days."""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return await self._delete_batches(
+            NewsArticle,
+            NewsArticle.created_at <= cutoff,
+            children=[(NewsImage, NewsImage.news_article_id)]
+        )
+
+    async def purge_snapshots(self, days: int) -> int:
+        """Delete daily news snapshots older than the given days."""
+        cutoff = datetime.utcnow().date() - timedelta(days=days)
+        return await self._delete_batches(NewsSnapshot, NewsSnapshot.snapshot_date < cutoff)
+
+    async def purge_tasks(self, days: int) -> int:
+        """Delete finished tasks completed more than the given days ago."""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return await self._delete_batches(
+            Task,
+            and_(
+                Task.status.in_([TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]),
+                Task.completed_at < cutoff
+            )
+        )
+
+    async def purge_system_stats(self, days: int) -> int:
+        """Delete system stats snapshots older than the given days."""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return await self._delete_batches(SystemStats, SystemStats.timestamp < cutoff)
+
+    async def run(self) -> Dict[str, Any]:
+        """Apply all configured retention policies and report what was removed."""
+        policies = [
+            ("tasks", self.purge_tasks, settings.TASK_RETENTION_DAYS),
+            ("system_stats", self.purge_system_stats, settings.MONITORING_RETENTION_DAYS),
+            ("news_articles", self.purge_articles, settings.ARTICLE_RETENTION_DAYS),
+            ("news_snapshots", self.purge_snapshots, settings.ARTICLE_RETENTION_DAYS),
+        ]
+
+        report: Dict[str, Any] = {}
+        started = time.perf_counter()
+        for name, purge, days in policies:
+            # A retention of 0 days keeps rows forever
+            if not days:
+                continue
+            policy_started = time.perf_counter()
+            rows = await purge(days)
+            report[name] = {
+                "rows_removed": rows,
+                "retention_days": days,
+                "duration": round(time.perf_counter() - policy_started, 3)
+            }
+            logger.info(f"Retention removed {rows} {name} rows older than {days} days")
+
+        report["duration"] = round(time.perf_counter() - started, 3)
+        return report
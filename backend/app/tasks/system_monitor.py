@@ -3,15 +3,22 @@
 import psutil
 import platform
 from datetime import datetime, timedelta
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text
+import asyncio
 import logging
 
+from app.core.config import settings
 from app.models.stats import SystemStats, DailyStats
 from app.models.task import Task, TaskStatus
 from app.models.user import User
 from app.models.news import NewsArticle
 from app.models.prompt import Prompt
+from app.tasks.retention import RetentionManager
+from app.tasks.partitions import NewsPartitionManager
+from app.services.news_snapshots import NewsSnapshots
+from app.services.news_embeddings import related_index
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +29,7 @@ class SystemMonitor:
     async def collect_system_metrics(self) -> dict:
         """Collect current system metrics."""
         return {
-            "cpu_usage": psutil.cpu_percent(interval=1),
+            "cpu_usage": await asyncio.to_thread(psutil.cpu_percent, 1),  # samples for a second
             "memory_usage": psutil.virtual_memory().percent,
             "disk_usage": psutil.disk_usage('/').percent,
             "system_load": psutil.getloadavg()[0],  # 1 minute load average
@@ -53,12 +60,11 @@ class SystemMonitor:
         total_news_query = select(func.count(NewsArticle.id))
         recent_news_query = select(func.count(NewsArticle.id)).where(NewsArticle.created_at >= day_ago)
         
-        stats = await asyncio.gather(
-            self.db.scalar(total_prompts_query),
-            self.db.scalar(active_prompts_query),
-            self.db.scalar(total_news_query),
-            self.db.scalar(recent_news_query)
-        )
+        # One AsyncSession can't run statements concurrently
+        stats = [
+            await self.db.scalar(query)
+            for query in (total_prompts_query, active_prompts_query, total_news_query, recent_news_query)
+        ]
         
         return {
             "total_prompts": stats[0],
@@ -96,7 +102,7 @@ class SystemMonitor:
             
             stats = SystemStats(
                 timestamp=datetime.utcnow(),
-                system_metrics=metrics,
+                detailed_metrics=metrics,
                 total_users=user_stats["total_users"],
                 active_users=user_stats["active_users"],
                 total_prompts=content_stats["total_prompts"],
@@ -120,6 +126,19 @@ class SystemMonitor:
             logger.error(f"Failed to store system stats: {str(e)}")
             raise
 
+    async def collect_metrics(self, interval: int = settings.SYSTEM_METRICS_INTERVAL) -> Optional[SystemStats]:
+        """Store a statistics snapshot unless one was stored within the interval.
+
+        Every task worker calls this periodically; the advisory lock and the
+        age check keep it to one snapshot per interval across workers.
+        """
+        await self.db.execute(text("SELECT pg_advisory_xact_lock(hashtext('system_stats'))"))
+        latest = await self.db.scalar(select(func.max(SystemStats.timestamp)))
+        if latest and datetime.utcnow() - latest < timedelta(seconds=interval * 0.9):
+            await self.db.rollback()
+            return None
+        return await self.store_system_stats()
+
     async def update_daily_stats(self) -> DailyStats:
         """Update daily statistics."""
         today = datetime.utcnow().date()
@@ -143,4 +162,28 @@ class SystemMonitor:
 
         except Exception as e:
             logger.error(f"Failed to update daily stats: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    async def run_maintenance_task(self, task: Task) -> None:
+        """Maintain news partitions, apply retention, rebuild the related index and snapshot system statistics."""
+        task.update_status(TaskStatus.IN_PROGRESS)
+        await self.db.commit()
+
+        partitions = await NewsPartitionManager(self.db).run()
+        retention = await RetentionManager(self.db).run()
+        snapshots = await NewsSnapshots(self.db).finalize_closed_days()
+        related = await related_index.rebuild(self.db)
+        stats = await self.store_system_stats()
+
+        task.update_status(
+            TaskStatus.COMPLETED,
+            result={
+                "partitions": partitions,
+                "retention": retention,
+                "snapshots_finalized": snapshots,
+                "related_index": related,
+                "system_stats_id": str(stats.id),
+                "completion_time": datetime.utcnow().isoformat()
+            }
+        )
+        await self.db.commit()
\ No newline at end of file
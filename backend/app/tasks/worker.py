@@ -0,0 +1,386 @@
+# app/tasks/worker.py
+
+from datetime import datetime, timedelta
+from typing import Optional, Set
+from uuid import UUID
+import asyncio
+import logging
+import os
+import random
+import socket
+
+import asyncpg
+from sqlalchemy import select, update, and_, or_, func, text
+from croniter import croniter
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.task import Task, TaskStatus, TaskType
+from app.tasks.prompt_scheduler import PromptScheduler
+from app.tasks.scheduler import TaskScheduler
+from app.tasks.system_monitor import SystemMonitor
+
+logger = logging.getLogger(__name__)
+
+# Channel notified by the tasks_queued_notify trigger
+TASK_NOTIFY_CHANNEL = "tasks_queued"
+
+class TaskWorker:
+    """Claims due tasks from Postgres and runs them under a lease.
+
+    Tasks are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number
+    of workers on any number of nodes can share the ``tasks`` table without
+    running a task twice. A claimed task stays invisible to other workers while
+    its lease is renewed by heartbeats; once a worker dies the lease expires and
+    the task becomes claimable again.
+
+    When idle, the worker sleeps until the earliest scheduled task or lease
+    expiry, and is woken early by a Postgres NOTIFY whenever a task is queued.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        concurrency: int = settings.TASK_WORKER_CONCURRENCY,
+        lease_seconds: int = settings.TASK_LEASE_SECONDS,
+        heartbeat_interval: int = settings.TASK_HEARTBEAT_INTERVAL,
+        poll_interval: int = settings.TASK_CHECK_INTERVAL,
+        listen: bool = settings.TASK_LISTEN_NOTIFY
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency
+        self.lease = timedelta(seconds=lease_seconds)
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.listen = listen
+        self.is_running = False
+        self._wake = asyncio.Event()
+        self._active: Set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        """Claim and execute tasks until stopped."""
+        self.is_running = True
+        slots = asyncio.Semaphore(self.concurrency)
+        listener = asyncio.create_task(self._listen()) if self.listen else None
+        logger.info(f"Task worker {self.worker_id} started with {self.concurrency} slots")
+
+        while self.is_running:
+            await slots.acquire()
+            try:
+                task_id = await self.claim()
+            except Exception as e:
+                slots.release()
+                logger.error(f"Task worker {self.worker_id} failed to claim a task: {str(e)}")
+                await self._sleep(5)  # Brief pause before retry
+                continue
+
+            if task_id is None:
+                slots.release()
+                await self._sleep(await self._idle_timeout())
+                continue
+
+            running = asyncio.create_task(self.execute(task_id))
+            self._active.add(running)
+            running.add_done_callback(self._active.discard)
+            running.add_done_callback(lambda _: slots.release())
+
+        if listener:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        # Let in-flight tasks finish; their leases keep them ours until then
+        if self._active:
+            await asyncio.gather(*self._active, return_exceptions=True)
+        logger.info(f"Task worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        """Stop claiming new tasks."""
+        self.is_running = False
+        self._wake.set()
+
+    def wake(self) -> None:
+        """Check for due tasks now instead of at the next poll."""
+        self._wake.set()
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _idle_timeout(self) -> float:
+        """Seconds until the next task can become due, capped at the poll interval."""
+        if not self.listen:
+            return self.poll_interval
+
+        try:
+            async with async_session() as db:
+                now = datetime.utcnow()
+                next_scheduled = await db.scalar(
+                    select(func.min(Task.scheduled_at)).where(and_(
+                        Task.status == TaskStatus.PENDING,
+                        Task.scheduled_at > now
+                    ))
+                )
+                next_expiry = await db.scalar(
+                    select(func.min(Task.locked_until)).where(
+                        Task.status == TaskStatus.IN_PROGRESS
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Task worker {self.worker_id} failed to find the next due task: {str(e)}")
+            return self.poll_interval
+
+        due_times = [t for t in (next_scheduled, next_expiry) if t]
+        if not due_times:
+            return self.poll_interval
+        delay = (min(due_times) - now).total_seconds()
+        return min(max(delay, 0.0), self.poll_interval)
+
+    async def _listen(self) -> None:
+        """Hold a LISTEN connection that wakes the worker on queued tasks."""
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+                try:
+                    await conn.add_listener(TASK_NOTIFY_CHANNEL, lambda *_: self.wake())
+                    # Catch up on anything queued while we were not listening
+                    self.wake()
+                    while True:
+                        await asyncio.sleep(self.heartbeat_interval)
+                        await conn.execute("SELECT 1")  # detect dropped connections
+                finally:
+                    await conn.close()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task worker {self.worker_id} lost its LISTEN connection: {str(e)}")
+                await asyncio.sleep(5)  # Brief pause before reconnecting
+
+    def _claimable(self, now: datetime):
+        """Due pending tasks, plus in-progress tasks whose owner has gone away."""
+        return or_(
+            and_(
+                Task.status == TaskStatus.PENDING,
+                or_(
+                    Task.scheduled_at <= now,
+                    Task.scheduled_at.is_(None)
+                )
+            ),
+            and_(
+                Task.status == TaskStatus.IN_PROGRESS,
+                Task.locked_until < now
+            ),
+            # Orphans left by runs that never held a lease
+            and_(
+                Task.status == TaskStatus.IN_PROGRESS,
+                Task.locked_until.is_(None),
+                Task.updated_at < now - self.lease - timedelta(seconds=settings.TASK_TIMEOUT)
+            )
+        )
+
+    async def claim(self) -> Optional[UUID]:
+        """Lease the next due task to this worker and return its id."""
+        async with async_session() as db:
+            while True:
+                now = datetime.utcnow()
+                task = await db.scalar(
+                    select(Task)
+                    .where(self._claimable(now))
+                    .order_by(Task.scheduled_at.asc().nulls_first(), Task.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                if not task:
+                    return None
+
+                if task.status == TaskStatus.IN_PROGRESS:
+                    logger.warning(
+                        f"Reclaiming task {task.id} from {task.locked_by}, lease expired at {task.locked_until}"
+                    )
+                    if (task.attempts or 0) > settings.MAX_TASK_RETRIES:
+                        # Keeps killing its workers; don't hand it to another one
+                        task.locked_by = None
+                        task.locked_until = None
+                        task.update_status(
+                            TaskStatus.FAILED,
+                            error=f"Abandoned after {task.attempts} attempts without finishing"
+                        )
+                        await db.commit()
+                        continue
+
+                elif not task.attempts and task.is_recurring and task.cron_expression:
+                    # Queue the next occurrence in the claiming transaction, so it
+                    # is created exactly once however many workers are polling
+                    db.add(task.next_occurrence(now))
+
+                task.attempts = (task.attempts or 0) + 1
+                task.locked_by = self.worker_id
+                task.locked_until = now + self.lease
+                task.heartbeat_at = now
+                task.update_status(TaskStatus.IN_PROGRESS)
+                await db.commit()
+
+                return task.id
+
+    async def execute(self, task_id: UUID) -> None:
+        """Run a claimed task under its deadline while heartbeating its lease."""
+        error = None
+        try:
+            async with async_session() as db:
+                task = await db.get(Task, task_id)
+                if not task:
+                    return
+                timeout = (task.parameters or {}).get("timeout") or settings.TASK_TIMEOUT
+
+                running = asyncio.create_task(TaskScheduler(db).run_task(task))
+                heartbeat = asyncio.create_task(self._heartbeat(task_id, running))
+                try:
+                    done, _ = await asyncio.wait({running}, timeout=timeout)
+                finally:
+                    heartbeat.cancel()
+                    await asyncio.gather(heartbeat, return_exceptions=True)
+
+                if not done:
+                    running.cancel()
+                    await asyncio.gather(running, return_exceptions=True)
+                    error = f"Task exceeded its {timeout}s deadline"
+                elif running.cancelled():
+                    # Stopped by the heartbeat; the task row already says why
+                    pass
+                elif running.exception():
+                    error = str(running.exception())
+
+        except Exception as e:
+            error = str(e)
+
+        # The run's session may be mid-transaction, so settle in a fresh one
+        try:
+            await self._finish(task_id, error)
+        except Exception as e:
+            logger.error(f"Task worker {self.worker_id} failed to finish task {task_id}: {str(e)}")
+
+    async def _finish(self, task_id: UUID, error: Optional[str]) -> None:
+        """Release the lease, retrying failed runs with exponential backoff."""
+        async with async_session() as db:
+            task = await db.get(Task, task_id, with_for_update=True)
+            if not task or task.locked_by != self.worker_id:
+                return
+
+            # A run failing on its way out of a cancellation stays cancelled
+            if error and task.status not in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+                task.update_status(TaskStatus.FAILED, error=error)
+
+            if task.status == TaskStatus.FAILED and task.attempts <= settings.MAX_TASK_RETRIES:
+                delay = min(
+                    settings.TASK_RETRY_BACKOFF * 2 ** (task.attempts - 1),
+                    settings.TASK_RETRY_BACKOFF_MAX
+                ) * random.uniform(1.0, 1.25)
+                task.update_status(
+                    TaskStatus.PENDING,
+                    error=f"Attempt {task.attempts} failed: {task.error_message}"
+                )
+                task.scheduled_at = datetime.utcnow() + timedelta(seconds=delay)
+                task.completed_at = None
+                logger.warning(f"Retrying task {task_id} in {delay:.0f}s: {task.error_message}")
+
+            task.locked_by = None
+            task.locked_until = None
+            await db.commit()
+
+    async def _heartbeat(self, task_id: UUID, running: asyncio.Task) -> None:
+        """Extend the lease of a running task; stop the run if it was cancelled or lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with async_session() as db:
+                    row = (await db.execute(
+                        select(Task.status, Task.locked_by).where(Task.id == task_id)
+                    )).first()
+
+                    if row is None or row.status == TaskStatus.CANCELLED:
+                        logger.info(f"Task {task_id} was cancelled, stopping its run")
+                        running.cancel()
+                        return
+                    if row.locked_by != self.worker_id:
+                        logger.warning(f"Task worker {self.worker_id} lost the lease on task {task_id}")
+                        running.cancel()
+                        return
+
+                    now = datetime.utcnow()
+                    await db.execute(
+                        update(Task)
+                        .where(and_(Task.id == task_id, Task.locked_by == self.worker_id))
+                        .values(locked_until=now + self.lease, heartbeat_at=now)
+                    )
+                    await db.commit()
+
+            except Exception as e:
+                logger.error(f"Heartbeat for task {task_id} failed: {str(e)}")
+
+async def ensure_recurring_task(
+    task_type: TaskType,
+    name: str,
+    cron_expression: str,
+    parameters: Optional[dict] = None
+) -> None:
+    """Create a recurring task unless an occurrence is already queued or running."""
+    async with async_session() as db:
+        # Serialize concurrent starts of several workers on the task name
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:name))"),
+            {"name": name}
+        )
+        existing = await db.scalar(
+            select(Task.id)
+            .where(and_(
+                Task.name == name,
+                Task.is_recurring == True,
+                Task.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS])
+            ))
+            .limit(1)
+        )
+        if existing:
+            return
+
+        db.add(Task(
+            name=name,
+            type=task_type,
+            status=TaskStatus.PENDING,
+            parameters=parameters or {},
+            scheduled_at=croniter(cron_expression, datetime.utcnow()).get_next(datetime),
+            is_recurring=True,
+            cron_expression=cron_expression
+        ))
+        await db.commit()
+
+async def collect_metrics() -> None:
+    """Snapshot system statistics every SYSTEM_METRICS_INTERVAL until cancelled."""
+    while True:
+        try:
+            async with async_session() as db:
+                await SystemMonitor(db).collect_metrics()
+        except Exception as e:
+            logger.error(f"Failed to collect system metrics: {str(e)}")
+        await asyncio.sleep(settings.SYSTEM_METRICS_INTERVAL)
+
+async def run_worker(worker: TaskWorker) -> None:
+    """Run a worker together with the prompt scheduler and metrics collection until stopped."""
+    await ensure_recurring_task(
+        task_type=TaskType.SYSTEM_MAINTENANCE,
+        name="System Maintenance",
+        cron_expression=settings.MAINTENANCE_CRON
+    )
+    prompt_scheduler = PromptScheduler()
+    scheduling = asyncio.create_task(prompt_scheduler.run())
+    metrics = asyncio.create_task(collect_metrics())
+    try:
+        await worker.run()
+    finally:
+        prompt_scheduler.stop()
+        metrics.cancel()
+        await asyncio.gather(metrics, return_exceptions=True)
+        await scheduling
\ No newline at end of file
@@ -0,0 +1,11 @@
+from datetime import date, datetime, time, timedelta
+from typing import Tuple
+
+def day_range(day: date) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) datetime range covering a calendar day
+
+    Filtering a timestamp column with ``>= start AND < end`` can use an index
+    and partition pruning, unlike casting the column to a date.
+    """
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
\ No newline at end of file
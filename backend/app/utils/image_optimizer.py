@@ -1,11 +1,37 @@
 import io
 from PIL import Image, ImageOps
-from typing import Tuple, Optional
+from typing import Tuple, Optional, List, Dict
 import numpy as np
 
+try:
+    # Registers the AVIF codec on Pillow releases without native support
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# Per-format size of an encode's headers and tables, see _encode_overhead
+_ENCODE_OVERHEAD: Dict[str, int] = {}
+
 class ImageOptimizer:
     """Utility class for image optimization"""
 
+    # Extra Pillow save() arguments for size-targeted encodes
+    ENCODE_OPTIONS = {
+        'JPEG': {},
+        'WEBP': {'method': 4},
+    }
+
+    # Resizes first shrink by an integer factor with a cheap box reduce while
+    # the source is more than this many times the target (Image.resize)
+    REDUCING_GAP = 3.0
+
+    # Pillow save() arguments per derivative output format
+    DERIVATIVE_SAVE_OPTIONS = {
+        'jpeg': {'format': 'JPEG', 'optimize': True, 'progressive': True},
+        'webp': {'format': 'WEBP', 'method': 6},
+        'avif': {'format': 'AVIF', 'speed': 6},
+    }
+
     @staticmethod
     def optimize_for_web(
         image_data: bytes,
@@ -16,13 +42,17 @@ class ImageOptimizer:
         """Optimize image for web delivery"""
         img = Image.open(io.BytesIO(image_data))
         
+        # Let JPEG decode at reduced scale before anything forces a full decode
+        if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
+            img.draft('RGB', ImageOptimizer._contain_size(img.size, max_size))
+        
         # Convert to RGB if needed
         if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
             img = img.convert('RGB')
         
         # Resize if larger than max_size
         if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-            img.thumbnail(max_size, Image.LANCZOS)
+            img.thumbnail(max_size, Image.LANCZOS, reducing_gap=ImageOptimizer.REDUCING_GAP)
         
         # Apply automatic contrast optimization
         img = ImageOps.autocontrast(img, cutoff=0.5)
@@ -46,20 +76,70 @@ class ImageOptimizer:
         crop: bool = True
     ) -> bytes:
         """Create thumbnail from image"""
+        return ImageOptimizer.create_thumbnails(image_data, [size], crop)[size]
+
+    @staticmethod
+    def create_thumbnails(
+        image_data: bytes,
+        sizes: List[Tuple[int, int]],
+        crop: bool = True,
+        quality: int = 85
+    ) -> Dict[Tuple[int, int], bytes]:
+        """Create several thumbnails from a single, reduced decode"""
         img = Image.open(io.BytesIO(image_data))
         
-        if crop:
-            # Calculate dimensions to maintain aspect ratio
-            thumb = ImageOps.fit(img, size, Image.LANCZOS)
+        # JPEG decodes straight to the smallest 1/2, 1/4 or 1/8 scale that
+        # still covers the largest thumbnail
+        largest = (max(w for w, _ in sizes), max(h for _, h in sizes))
+        img.draft('RGB', largest)
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        
+        thumbnails = {}
+        for size in sizes:
+            if crop:
+                thumb = ImageOptimizer._fit(img, size)
+            else:
+                # Resize maintaining aspect ratio
+                thumb = img.resize(
+                    ImageOptimizer._contain_size(img.size, size),
+                    Image.LANCZOS,
+                    reducing_gap=ImageOptimizer.REDUCING_GAP
+                )
+            
+            # Save thumbnail
+            output = io.BytesIO()
+            thumb.save(output, 'JPEG', quality=quality, optimize=True)
+            thumbnails[size] = output.getvalue()
+        
+        return thumbnails
+
+    @staticmethod
+    def _contain_size(
+        source: Tuple[int, int],
+        bounds: Tuple[int, int]
+    ) -> Tuple[int, int]:
+        """Largest size with the source aspect ratio that fits within bounds"""
+        scale = min(bounds[0] / source[0], bounds[1] / source[1], 1.0)
+        return (max(1, round(source[0] * scale)), max(1, round(source[1] * scale)))
+
+    @staticmethod
+    def _fit(img: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """Center-crop to the target aspect ratio and resize, like ImageOps.fit"""
+        target_ratio = size[0] / size[1]
+        if img.width / img.height > target_ratio:
+            crop_width, crop_height = img.height * target_ratio, img.height
         else:
-            # Resize maintaining aspect ratio
-            img.thumbnail(size, Image.LANCZOS)
-            thumb = img
+            crop_width, crop_height = img.width, img.width / target_ratio
+        left = (img.width - crop_width) / 2
+        top = (img.height - crop_height) / 2
         
-        # Save thumbnail
-        output = io.BytesIO()
-        thumb.save(output, 'JPEG', quality=85, optimize=True)
-        return output.getvalue()
+        return img.resize(
+            size,
+            Image.LANCZOS,
+            box=(left, top, left + crop_width, top + crop_height),
+            reducing_gap=ImageOptimizer.REDUCING_GAP
+        )
 
     @staticmethod
     def add_watermark(
@@ -127,36 +207,189 @@ class ImageOptimizer:
     def compress_image(
         image_data: bytes,
         max_size_kb: int = 500,
-        min_quality: int = 60
+        min_quality: int = 60,
+        format: str = "JPEG"
     ) -> bytes:
         """Compress image to target file size"""
+        data, _ = ImageOptimizer.encode_to_size(
+            image_data,
+            max_size_kb=max_size_kb,
+            min_quality=min_quality,
+            format=format
+        )
+        return data
+
+    @staticmethod
+    def encode_to_size(
+        image_data: bytes,
+        max_size_kb: int = 500,
+        min_quality: int = 60,
+        max_quality: int = 95,
+        format: str = "JPEG",
+        tolerance: int = 2,
+        max_encodes: int = 6
+    ) -> Tuple[bytes, dict]:
+        """Encode at the highest quality that fits the target size.
+
+        The log of the encoded size is close to linear in the log of the
+        quantizer scale a quality maps to, so a line through two encodes of a
+        small probe predicts the quality to try first, and each full-size
+        encode refits the line. Returns the encoded bytes and encoder
+        statistics (full encodes, probe encodes, chosen quality).
+        """
+        format = format.upper()
         img = Image.open(io.BytesIO(image_data))
-        
-        # Initial quality
-        quality = 95
-        output = io.BytesIO()
-        
-        while quality >= min_quality:
-            output.seek(0)
-            output.truncate()
-            img.save(output, 'JPEG', quality=quality)
-            
-            # Check size
-            if len(output.getvalue()) <= max_size_kb * 1024:
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+
+        target = max_size_kb * 1024
+        stats = {'encodes': 0, 'probe_encodes': 0, 'quality': None, 'resized': False}
+
+        def encode(image: Image.Image, quality: int, probe: bool = False) -> bytes:
+            stats['probe_encodes' if probe else 'encodes'] += 1
+            output = io.BytesIO()
+            image.save(output, format, quality=quality, **ImageOptimizer.ENCODE_OPTIONS.get(format, {}))
+            return output.getvalue()
+
+        # The image data scales with pixel count, so probe sizes less the
+        # fixed container overhead and divided by the area ratio stand in for
+        # full-size ones
+        overhead = ImageOptimizer._encode_overhead(format)
+
+        def payload(size: int) -> float:
+            return np.log(max(size - overhead, 1))
+
+        probe, area_ratio = ImageOptimizer._make_probe(img)
+        probe_line: List[Tuple[int, float]] = []
+        if probe is not None:
+            probe_line = [
+                (quality, payload(len(encode(probe, quality, probe=True))) - np.log(area_ratio))
+                for quality in (min_quality, max_quality)
+            ]
+        measured: Dict[int, float] = {}  # quality -> log payload of the full-size encode
+
+        def scale_log(quality: int) -> float:
+            return -np.log(ImageOptimizer._quantizer_scale(quality))
+
+        def predict_quality(hi: int) -> Optional[int]:
+            """Highest quality up to hi the size line expects to fit, None without a line"""
+            if len(measured) >= 2:
+                # Secant through the bracket ends, else the two latest encodes
+                if fit_quality is not None and fail_quality in measured:
+                    points = [(q, measured[q]) for q in (fit_quality, fail_quality)]
+                else:
+                    points = list(measured.items())[-2:]
+            elif probe_line:
+                points = probe_line
+            else:
+                return None
+            (x0, s0), (x1, s1) = sorted((scale_log(q), size) for q, size in points)
+            if x0 == x1 or s1 <= s0:
+                return None
+            slope = (s1 - s0) / (x1 - x0)
+            if len(measured) == 1:
+                # Keep the probe's slope, moved through the full-size encode
+                [(quality, size)] = measured.items()
+                x0, s0 = scale_log(quality), size
+            x = x0 + (payload(target) - s0) / slope
+            return int(min(np.floor(ImageOptimizer._scale_quality(np.exp(-x))), hi))
+
+        # Bracket: fit_quality is known to fit, fail_quality known not to
+        fit_quality, fit_data = None, None
+        fail_quality = max_quality + 1
+        quality = predict_quality(max_quality)
+        if quality is None:
+            quality = (min_quality + max_quality + 1) // 2
+        quality = max(quality, min_quality)
+
+        for _ in range(max_encodes):
+            data = encode(img, quality)
+            measured[quality] = payload(len(data))
+            if len(data) <= target:
+                fit_quality, fit_data = quality, data
+            else:
+                fail_quality = quality
+
+            floor = fit_quality if fit_quality is not None else min_quality - 1
+            if fail_quality - floor <= 1:
                 break
-                
-            quality -= 5
-        
-        if quality < min_quality:
-            # If size is still too large, resize the image
-            scale_factor = np.sqrt(max_size_kb * 1024 / len(output.getvalue()))
-            new_size = tuple(int(dim * scale_factor) for dim in img.size)
+            if fit_quality is not None and fail_quality - fit_quality <= tolerance:
+                break
+
+            candidate = predict_quality(fail_quality - 1)
+            if candidate is None:
+                candidate = (floor + fail_quality + 1) // 2
+            elif candidate <= floor and fit_quality is not None:
+                # Nothing above the current fit is predicted to fit
+                break
+            quality = min(max(candidate, floor + 1), fail_quality - 1)
+
+        if fit_data is not None:
+            stats['quality'] = fit_quality
+            return fit_data, stats
+
+        # Even the minimum quality is too large: shrink and retry
+        if fail_quality != min_quality:
+            data = encode(img, min_quality)
+            if len(data) <= target:
+                stats['quality'] = min_quality
+                return data, stats
+
+        for _ in range(3):
+            scale_factor = np.sqrt(target / len(data)) * 0.95
+            new_size = tuple(max(1, int(dim * scale_factor)) for dim in img.size)
             img = img.resize(new_size, Image.LANCZOS)
-            
+            data = encode(img, min_quality)
+            if len(data) <= target:
+                break
+
+        stats['quality'] = min_quality
+        stats['resized'] = True
+        return data, stats
+
+    @staticmethod
+    def _encode_overhead(format: str) -> int:
+        """Bytes of headers and tables in every encode, from a blank 8x8 image"""
+        if format not in _ENCODE_OVERHEAD:
             output = io.BytesIO()
-            img.save(output, 'JPEG', quality=min_quality)
-        
-        return output.getvalue()
+            Image.new('RGB', (8, 8)).save(output, format, **ImageOptimizer.ENCODE_OPTIONS.get(format, {}))
+            _ENCODE_OVERHEAD[format] = len(output.getvalue())
+        return _ENCODE_OVERHEAD[format]
+
+    @staticmethod
+    def _quantizer_scale(quality: float) -> float:
+        """Percentage libjpeg scales its quantization tables by at a quality"""
+        return max(5000 / quality if quality < 50 else 200 - 2 * quality, 1)
+
+    @staticmethod
+    def _scale_quality(scale: float) -> float:
+        """Inverse of _quantizer_scale"""
+        return 5000 / scale if scale > 100 else (200 - scale) / 2
+
+    @staticmethod
+    def _make_probe(
+        img: Image.Image,
+        tile: int = 64,
+        grid: int = 4
+    ) -> Tuple[Optional[Image.Image], float]:
+        """Mosaic of full-resolution tiles spread over the image, and its area ratio.
+
+        Unlike a downscaled copy, the tiles keep the image's noise and texture
+        scale, which is what the encoded size per pixel depends on. Tile
+        corners sit on the 16px JPEG macroblock grid.
+        """
+        side = tile * grid
+        if side * side * 2 > img.size[0] * img.size[1] or min(img.size) < side:
+            # Too small for a probe to be meaningfully cheaper
+            return None, 1.0
+
+        probe = Image.new(img.mode, (side, side))
+        for i in range(grid):
+            for j in range(grid):
+                x = (img.size[0] - tile) * i // (grid - 1) // 16 * 16
+                y = (img.size[1] - tile) * j // (grid - 1) // 16 * 16
+                probe.paste(img.crop((x, y, x + tile, y + tile)), (i * tile, j * tile))
+        return probe, (side * side) / (img.size[0] * img.size[1])
 
     @staticmethod
     def convert_format(
@@ -208,6 +441,124 @@ class ImageOptimizer:
             'dpi': img.info.get('dpi', (72, 72))
         }
 
+    @staticmethod
+    def analyze_image_vectorized(
+        image_data: bytes,
+        max_side: int = 256,
+        dominant_colors: int = 5
+    ) -> dict:
+        """Analyze image statistics on a downsampled view.
+
+        Computes brightness, contrast, per-channel stats, dominant colors and a
+        64-bit perceptual hash in one pass, returning compact NumPy arrays.
+        """
+        img = Image.open(io.BytesIO(image_data))
+        width, height, format = img.width, img.height, img.format
+        pixels = ImageOptimizer._analysis_pixels(img, max_side)
+
+        return {
+            'format': format,
+            'width': width,
+            'height': height,
+            'file_size': len(image_data),
+            **ImageOptimizer._pixel_stats(pixels, dominant_colors)
+        }
+
+    @staticmethod
+    def batch_analyze_images(
+        images: List[bytes],
+        max_side: int = 256,
+        dominant_colors: int = 5
+    ) -> Dict[str, np.ndarray]:
+        """Analyze many images, stacking each statistic into one array.
+
+        Row ``i`` of every array belongs to ``images[i]``, e.g. ``phash`` has
+        shape ``(N,)`` and ``dominant_colors`` ``(N, k, 3)``.
+        """
+        results = [
+            ImageOptimizer.analyze_image_vectorized(data, max_side, dominant_colors)
+            for data in images
+        ]
+        if not results:
+            return {}
+
+        batch = {
+            'size': np.array([(r['width'], r['height']) for r in results], dtype=np.int32),
+            'file_size': np.array([r['file_size'] for r in results], dtype=np.int64)
+        }
+        for key in ('brightness', 'contrast', 'channel_mean', 'channel_std',
+                    'channel_min', 'channel_max', 'dominant_colors',
+                    'dominant_weights', 'phash'):
+            batch[key] = np.stack([r[key] for r in results])
+        return batch
+
+    @staticmethod
+    def phash_distance(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Hamming distance between perceptual hashes (broadcasts over arrays)"""
+        xor = np.bitwise_xor(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+        bits = np.unpackbits(xor[..., None].view(np.uint8), axis=-1)
+        return bits.sum(axis=-1)
+
+    @staticmethod
+    def _analysis_pixels(img: Image.Image, max_side: int) -> np.ndarray:
+        """Decode a reduced RGB view of the image as a uint8 array"""
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale directly
+        img.draft('RGB', (max_side, max_side))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        if max(img.size) > max_side:
+            img.thumbnail((max_side, max_side), Image.BILINEAR)
+        return np.asarray(img, dtype=np.uint8)
+
+    @staticmethod
+    def _pixel_stats(pixels: np.ndarray, dominant_colors: int) -> dict:
+        flat = pixels.reshape(-1, 3)
+        values = flat.astype(np.float32)
+
+        channel_mean = values.mean(axis=0)
+        channel_std = values.std(axis=0)
+        luma = values @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+        # Dominant colors from a 4-bit-per-channel histogram
+        quantized = flat >> 4
+        bins = (quantized[:, 0].astype(np.int32) << 8) | (quantized[:, 1].astype(np.int32) << 4) | quantized[:, 2]
+        counts = np.bincount(bins, minlength=4096)
+        top = np.argsort(counts)[::-1][:dominant_colors]
+        colors = np.stack([(top >> 8) & 0xF, (top >> 4) & 0xF, top & 0xF], axis=1) * 16 + 8
+
+        return {
+            'brightness': np.float32(luma.mean()),
+            'contrast': np.float32(luma.std()),
+            'channel_mean': channel_mean,
+            'channel_std': channel_std,
+            'channel_min': flat.min(axis=0),
+            'channel_max': flat.max(axis=0),
+            'dominant_colors': colors.astype(np.uint8),
+            'dominant_weights': (counts[top] / len(flat)).astype(np.float32),
+            'phash': ImageOptimizer._phash(luma.reshape(pixels.shape[:2]))
+        }
+
+    @staticmethod
+    def _phash(luma: np.ndarray) -> np.uint64:
+        """64-bit DCT perceptual hash of a luma plane"""
+        small = np.asarray(
+            Image.fromarray(luma.astype(np.uint8), 'L').resize((32, 32), Image.BILINEAR),
+            dtype=np.float32
+        )
+        dct = ImageOptimizer._dct_matrix(32)
+        low = (dct @ small @ dct.T)[:8, :8].flatten()
+        # Exclude the DC term from the median so overall brightness doesn't dominate
+        bits = low > np.median(low[1:])
+        return np.packbits(bits).view('>u8')[0].astype(np.uint64)
+
+    @staticmethod
+    def _dct_matrix(n: int) -> np.ndarray:
+        k = np.arange(n)[:, None]
+        i = np.arange(n)[None, :]
+        matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+        matrix[0] /= np.sqrt(2)
+        return matrix.astype(np.float32)
+
     @staticmethod
     def auto_enhance(image_data: bytes) -> bytes:
         """Automatically enhance image quality"""
@@ -234,4 +585,52 @@ class ImageOptimizer:
         
         output = io.BytesIO()
         img.save(output, 'JPEG', quality=95)
-        return output.getvalue()
\ No newline at end of file
+        return output.getvalue()
+
+    @staticmethod
+    def supports_format(format: str) -> bool:
+        """Check whether Pillow can encode the given derivative format"""
+        # Make sure every available codec plugin is registered
+        Image.init()
+        return format.upper() in Image.SAVE
+
+    @staticmethod
+    def create_derivatives(
+        image_data: bytes,
+        widths: List[int],
+        formats: List[str],
+        quality: int = 80
+    ) -> Dict[str, Dict[int, bytes]]:
+        """Render every width/format combination of an image from one decode"""
+        img = Image.open(io.BytesIO(image_data))
+        source_width, source_height = img.size
+
+        # Never upscale; the source width stands in for larger targets
+        target_widths = sorted({min(width, source_width) for width in widths})
+        formats = [f.lower() for f in formats if ImageOptimizer.supports_format(f)]
+
+        # Reduced JPEG decode that still covers the widest derivative
+        widest = target_widths[-1]
+        img.draft('RGB', (widest, max(1, round(source_height * widest / source_width))))
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        derivatives: Dict[str, Dict[int, bytes]] = {f: {} for f in formats}
+        for width in target_widths:
+            height = max(1, round(source_height * width / source_width))
+            resized = img if (width, height) == img.size else img.resize(
+                (width, height),
+                Image.LANCZOS,
+                reducing_gap=ImageOptimizer.REDUCING_GAP
+            )
+
+            for format in formats:
+                output = io.BytesIO()
+                resized.save(
+                    output,
+                    quality=quality,
+                    **ImageOptimizer.DERIVATIVE_SAVE_OPTIONS[format]
+                )
+                derivatives[format][width] = output.getvalue()
+
+        return derivatives
\ No newline at end of file
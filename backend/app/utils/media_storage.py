@@ -0,0 +1,74 @@
+import os
+import asyncio
+import hashlib
+from typing import AsyncIterator
+from app.core.config import settings
+
+def media_path(relative_path: str) -> str:
+    """Absolute filesystem path for a path relative to MEDIA_ROOT"""
+    return os.path.join(settings.MEDIA_ROOT, relative_path)
+
+def media_url(relative_path: str) -> str:
+    """Public URL for a path relative to MEDIA_ROOT"""
+    return f"{settings.MEDIA_URL}/{relative_path}"
+
+def content_address(digest: str, extension: str, prefix: str) -> str:
+    """Relative path for content-addressed storage, fanned out by digest prefix"""
+    return f"{prefix}/{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+def store_bytes(data: bytes, extension: str, prefix: str) -> str:
+    """Store bytes under their SHA-256 address and return the relative path"""
+    relative_path = content_address(
+        hashlib.sha256(data).hexdigest(),
+        extension,
+        prefix
+    )
+    path = media_path(relative_path)
+
+    # Identical content already stored
+    if os.path.exists(path):
+        return relative_path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+    return relative_path
+
+async def store_stream(
+    chunks: AsyncIterator[bytes],
+    extension: str,
+    prefix: str,
+    max_bytes: int = None
+) -> str:
+    """Stream chunks to content-addressed storage and return the relative path
+
+    Data is hashed and written chunk by chunk, so the payload is never held
+    in memory as a whole.
+    """
+    tmp_dir = media_path(f"{prefix}/tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{os.getpid()}_{os.urandom(8).hex()}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ValueError(f"Download exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+
+        relative_path = content_address(digest.hexdigest(), extension, prefix)
+        path = media_path(relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return relative_path
+
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
\ No newline at end of file
@@ -0,0 +1,135 @@
+# app/utils/pagination.py
+
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+import base64
+import enum
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.utils.query_plans import explain
+
+class CountMode(str, enum.Enum):
+    """How list endpoints compute ``total``."""
+    EXACT = "exact"              # COUNT(*) over the filtered query
+    APPROXIMATE = "approximate"  # planner row estimate, no scan
+    NONE = "none"                # skip counting
+
+class Keyset:
+    """Cursor pagination over a unique, ordered column tuple such as (published_date, id).
+
+    A page is fetched with ``WHERE (cols) < (cursor values)`` (``>`` when
+    ascending) instead of OFFSET, so every page costs the same index range
+    scan however deep the reader scrolls. Cursors are opaque url-safe tokens
+    holding the key of the last row of the previous page.
+    """
+
+    def __init__(self, *columns, descending: bool = True):
+        self.columns = columns
+        self.descending = descending
+
+    def encode(self, item: Any) -> str:
+        """Cursor pointing just past an item."""
+        values = [getattr(item, column.key) for column in self.columns]
+        raw = json.dumps([
+            value.isoformat() if isinstance(value, datetime) else str(value) if isinstance(value, UUID) else value
+            for value in values
+        ], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> List[Any]:
+        """Key values of a cursor; a malformed cursor is a 400."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if len(values) != len(self.columns):
+                raise ValueError("cursor does not match this listing")
+            return [
+                self._parse(column, value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+
+    @staticmethod
+    def _parse(column, value: Any) -> Any:
+        python_type = column.type.python_type
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is UUID:
+            return UUID(value)
+        return python_type(value)
+
+    def apply(
+        self,
+        query: Select,
+        cursor: Optional[str],
+        limit: int,
+        skip: int = 0
+    ) -> Select:
+        """Order and limit a query for one page; fetches one extra row to detect more.
+
+        ``skip`` keeps OFFSET paging working for clients that don't send a
+        cursor; it is ignored once a cursor is given.
+        """
+        query = query.order_by(*[
+            column.desc() if self.descending else column.asc()
+            for column in self.columns
+        ])
+
+        if cursor:
+            values = self.decode(cursor)
+            key = tuple_(*self.columns)
+            bound = tuple_(*values)
+            lead = self.columns[0]
+            # The redundant single-column bound lets the planner use plain
+            # indexes on the lead column and prune partitions
+            query = query.where(
+                key < bound if self.descending else key > bound,
+                lead <= values[0] if self.descending else lead >= values[0]
+            )
+        elif skip:
+            query = query.offset(skip)
+
+        return query.limit(limit + 1)
+
+    def page(
+        self,
+        rows: Sequence[Any],
+        limit: int,
+        item: Callable[[Any], Any] = lambda row: row
+    ) -> Tuple[List[Any], Optional[str]]:
+        """Split off the look-ahead row; return the page and the next cursor."""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, self.encode(item(rows[-1]))
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    mode: CountMode = CountMode.EXACT
+) -> Optional[int]:
+    """Total rows of an unpaginated query, exact, estimated or not at all.
+
+    The approximate count is the planner's row estimate from EXPLAIN, which
+    comes from table statistics (reltuples) and never touches the rows.
+    """
+    if mode == CountMode.NONE:
+        return None
+    if mode == CountMode.APPROXIMATE:
+        plan = await explain(db, query)
+        return int(plan["Plan"]["Plan Rows"])
+    total = await db.scalar(
+        query.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    )
+    return total or 0
\ No newline at end of file
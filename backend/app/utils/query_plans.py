@@ -0,0 +1,33 @@
+# app/utils/query_plans.py
+
+from typing import Any, Dict, Iterator, List
+import json
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+# Tables the news read paths must reach through an index
+INDEXED_TABLES = ("news_articles", "prompts")
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Relations on news read paths that a plan scans sequentially."""
+    return [
+        node["Relation Name"]
+        for node in _plan_nodes(plan["Plan"])
+        if node["Node Type"] == "Seq Scan"
+        and node.get("Relation Name", "").startswith(INDEXED_TABLES)
+    ]
+
+async def explain(db: AsyncSession, query: Select) -> Dict[str, Any]:
+    """EXPLAIN a query and return its JSON plan."""
+    sql = str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
\ No newline at end of file
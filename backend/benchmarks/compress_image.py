@@ -0,0 +1,128 @@
+# benchmarks/compress_image.py
+#
+# Compares ImageOptimizer.compress_image against the previous fixed-step
+# quality loop on a corpus of generated images.
+#
+#   python -m benchmarks.compress_image [--count 24] [--max-size-kb 150]
+
+import argparse
+import io
+import time
+from typing import Callable, List, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from app.utils.image_optimizer import ImageOptimizer
+
+def generate_corpus(count: int, seed: int = 0) -> List[bytes]:
+    """PNG images mixing gradients, shapes and noise, similar to generated art"""
+    rng = np.random.default_rng(seed)
+    sizes = [(1024, 1024), (1792, 1024), (1024, 1792), (768, 768)]
+    corpus = []
+
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        x = np.linspace(0, 1, width)[None, :, None]
+        y = np.linspace(0, 1, height)[:, None, None]
+        colors = rng.uniform(0, 255, size=(2, 3))
+        gradient = colors[0] * (1 - x) * (1 - y) + colors[1] * x * y
+        noise = rng.normal(0, rng.uniform(2, 30), size=(height, width, 3))
+        pixels = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+
+        img = Image.fromarray(pixels, 'RGB')
+        draw = ImageDraw.Draw(img)
+        for _ in range(rng.integers(5, 40)):
+            x0, y0 = rng.integers(0, width), rng.integers(0, height)
+            x1, y1 = x0 + rng.integers(20, 400), y0 + rng.integers(20, 400)
+            fill = tuple(int(c) for c in rng.integers(0, 255, size=3))
+            draw.ellipse((x0, y0, x1, y1), fill=fill)
+        img = img.filter(ImageFilter.GaussianBlur(rng.uniform(0, 2)))
+
+        output = io.BytesIO()
+        img.save(output, 'PNG')
+        corpus.append(output.getvalue())
+
+    return corpus
+
+def legacy_compress_image(
+    image_data: bytes,
+    max_size_kb: int = 500,
+    min_quality: int = 60
+) -> Tuple[bytes, int, int]:
+    """The previous implementation, instrumented to count encodes"""
+    img = Image.open(io.BytesIO(image_data))
+    encodes = 0
+
+    quality = 95
+    output = io.BytesIO()
+
+    while quality >= min_quality:
+        output.seek(0)
+        output.truncate()
+        img.save(output, 'JPEG', quality=quality)
+        encodes += 1
+
+        if len(output.getvalue()) <= max_size_kb * 1024:
+            break
+
+        quality -= 5
+
+    if quality < min_quality:
+        scale_factor = np.sqrt(max_size_kb * 1024 / len(output.getvalue()))
+        new_size = tuple(int(dim * scale_factor) for dim in img.size)
+        img = img.resize(new_size, Image.LANCZOS)
+
+        output = io.BytesIO()
+        img.save(output, 'JPEG', quality=min_quality)
+        encodes += 1
+
+    return output.getvalue(), encodes, 0
+
+def fitted_compress_image(
+    image_data: bytes,
+    max_size_kb: int = 500,
+    min_quality: int = 60,
+    format: str = 'JPEG'
+) -> Tuple[bytes, int, int]:
+    data, stats = ImageOptimizer.encode_to_size(
+        image_data,
+        max_size_kb=max_size_kb,
+        min_quality=min_quality,
+        format=format
+    )
+    return data, stats['encodes'], stats['probe_encodes']
+
+def run(name: str, func: Callable, corpus: List[bytes], max_size_kb: int) -> None:
+    encodes, probe_encodes, sizes, over_target = [], [], [], 0
+    started = time.perf_counter()
+    for image_data in corpus:
+        data, full, probe = func(image_data, max_size_kb)
+        encodes.append(full)
+        probe_encodes.append(probe)
+        sizes.append(len(data))
+        over_target += len(data) > max_size_kb * 1024
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<16} encodes/img {np.mean(encodes):5.2f} "
+        f"(+{np.mean(probe_encodes):5.2f} probe)  "
+        f"wall {elapsed:7.2f}s ({elapsed / len(corpus) * 1000:6.1f} ms/img)  "
+        f"avg size {np.mean(sizes) / 1024:7.1f} KB  over target {over_target}"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=24)
+    parser.add_argument('--max-size-kb', type=int, default=150)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.count)
+    print(f"{len(corpus)} images, target {args.max_size_kb} KB")
+
+    run("legacy (JPEG)", lambda d, kb: legacy_compress_image(d, kb), corpus, args.max_size_kb)
+    run("fitted (JPEG)", lambda d, kb: fitted_compress_image(d, kb), corpus, args.max_size_kb)
+    run("fitted (WEBP)", lambda d, kb: fitted_compress_image(d, kb, format='WEBP'), corpus, args.max_size_kb)
+
+if __name__ == "__main__":
+    main()
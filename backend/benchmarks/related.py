@@ -0,0 +1,82 @@
+# benchmarks/related.py
+#
+# Builds a related-articles index over a synthetic corpus of topical articles
+# and measures /news/{id}/related lookup latency (index part only) and how
+# often the neighbours share the source article's topic.
+#
+#   python -m benchmarks.related [--articles 50000] [--lookups 2000]
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List
+from uuid import uuid4
+
+from app.services.news_embeddings import RelatedIndex
+
+TOPICS = [
+    "election vote parliament coalition minister campaign ballot senate",
+    "inflation rates central bank bond yields currency markets stocks",
+    "climate emissions heatwave wildfire drought glacier carbon solar",
+    "football league transfer striker championship coach goal season",
+    "vaccine hospital virus outbreak patients clinical trial health",
+    "startup funding chip semiconductor software cloud platform ai",
+    "earthquake flood storm evacuation rescue damage hurricane rainfall",
+    "court ruling judge appeal lawsuit verdict supreme prosecutor",
+]
+FILLER = "today report officials week people city country year group local plan".split()
+
+def generate_corpus(count: int, seed: int = 0) -> List[SimpleNamespace]:
+    rng = random.Random(seed)
+    articles = []
+    for _ in range(count):
+        topic = rng.randrange(len(TOPICS))
+        words = TOPICS[topic].split()
+        text = lambda n: " ".join(rng.choice(words) if rng.random() < 0.4 else rng.choice(FILLER) for _ in range(n))
+        articles.append(SimpleNamespace(
+            id=uuid4(), topic=topic,
+            title=text(8), summary=text(40), content=text(300)
+        ))
+    return articles
+
+async def run(articles: int, lookups: int, batch_size: int) -> None:
+    corpus = generate_corpus(articles)
+    topic_of = {article.id: article.topic for article in corpus}
+
+    with tempfile.TemporaryDirectory() as path:
+        index = RelatedIndex(path=path)
+        started = time.perf_counter()
+        for start in range(0, len(corpus), batch_size):
+            await index.add(corpus[start:start + batch_size])
+        print(f"indexed {articles} articles in {time.perf_counter() - started:.1f}s ({index.embedder.name})")
+
+        samples = random.Random(1).sample(corpus, min(lookups, len(corpus)))
+        timings, same_topic, returned = [], 0, 0
+        for article in samples:
+            started = time.perf_counter()
+            related = await index.related(article, 10)
+            timings.append((time.perf_counter() - started) * 1000)
+            returned += len(related)
+            same_topic += sum(topic_of[related_id] == article.topic for related_id, _ in related)
+
+        timings.sort()
+        percentile = lambda p: timings[min(len(timings) - 1, int(len(timings) * p))]
+        print(
+            f"{len(samples)} lookups  p50 {percentile(0.5):.2f} ms  "
+            f"p99 {percentile(0.99):.2f} ms  max {timings[-1]:.2f} ms"
+        )
+        print(f"same-topic neighbours {same_topic / max(returned, 1):.1%} of {returned}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=50000)
+    parser.add_argument('--lookups', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.articles, args.lookups, args.batch_size))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
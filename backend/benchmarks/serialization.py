@@ -0,0 +1,104 @@
+# benchmarks/serialization.py
+#
+# Compares the previous schema-based serialization of news pages with the
+# row-to-bytes path in app.core.serialization, on pages of synthetic articles.
+#
+#   python -m benchmarks.serialization [--pages 200] [--page-size 100]
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, List, Tuple
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import dumps, article_data, orjson
+from app.schemas.news import NewsArticleResponse
+
+WORDS = "market policy climate research launch energy report city data court vote team".split()
+
+def generate_page(page_size: int, seed: int = 0) -> List[Tuple[SimpleNamespace, SimpleNamespace]]:
+    """(article, prompt) pairs shaped like ORM rows, with realistic text sizes"""
+    rng = random.Random(seed)
+    prompts = [
+        SimpleNamespace(type="public", name=f"prompt-{i}")
+        for i in range(5)
+    ]
+    now = datetime.utcnow()
+    page = []
+    for i in range(page_size):
+        published = now - timedelta(minutes=i * 7)
+        article = SimpleNamespace(
+            id=uuid4(),
+            prompt_id=uuid4(),
+            published_date=published,
+            slug=f"prompt/{published:%Y-%m-%d}/article-{i}",
+            title=" ".join(rng.choices(WORDS, k=8)).title(),
+            summary=" ".join(rng.choices(WORDS, k=60)),
+            content=" ".join(rng.choices(WORDS, k=900)),
+            source_urls=[f"https://example.com/{rng.randrange(10**6)}" for _ in range(4)],
+            image_url=f"/media/images/{uuid4().hex}.webp",
+            image_variants={"webp": {f"{w}w": f"/media/images/{w}.webp" for w in (320, 640, 1280)}},
+            ai_metadata={"model": "gpt-4", "tokens": rng.randrange(500, 3000), "source_count": 4},
+            created_at=published,
+            updated_at=published
+        )
+        page.append((article, rng.choice(prompts)))
+    return page
+
+ARTICLE_LIST = TypeAdapter(List[NewsArticleResponse])
+
+def legacy_dict_json(page) -> bytes:
+    """Previous WebSocket path: schema per article, .dict(), json.dumps"""
+    return json.dumps([
+        NewsArticleResponse(**vars(article), prompt_type=prompt.type, prompt_name=prompt.name).dict()
+        for article, prompt in page
+    ]).encode()
+
+def legacy_response_model(page) -> bytes:
+    """Previous endpoint path: schema validation from rows, then dump_json"""
+    items = [
+        NewsArticleResponse(**vars(article), prompt_type=prompt.type, prompt_name=prompt.name)
+        for article, prompt in page
+    ]
+    return ARTICLE_LIST.dump_json(ARTICLE_LIST.validate_python(items))
+
+def row_bytes(page) -> bytes:
+    """New path: rows to plain dicts, encoded once"""
+    return dumps([article_data(article, prompt) for article, prompt in page])
+
+def run(name: str, func: Callable, pages: List, baseline: float = None) -> float:
+    started = time.perf_counter()
+    size = 0
+    for page in pages:
+        size += len(func(page))
+    elapsed = time.perf_counter() - started
+    per_second = len(pages) / elapsed
+    speedup = f"  x{per_second / baseline:5.2f}" if baseline else ""
+    print(
+        f"{name:<22} {per_second:8.1f} pages/s  "
+        f"{elapsed / len(pages) * 1000:7.2f} ms/page  "
+        f"avg {size / len(pages) / 1024:7.1f} KB{speedup}"
+    )
+    return per_second
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=100)
+    args = parser.parse_args()
+
+    pages = [generate_page(args.page_size, seed) for seed in range(10)]
+    pages = [pages[i % len(pages)] for i in range(args.pages)]
+    print(f"{args.pages} pages of {args.page_size} articles, encoder {'orjson' if orjson else 'json'}")
+
+    baseline = run("legacy .dict()+json", legacy_dict_json, pages)
+    run("legacy response_model", legacy_response_model, pages, baseline)
+    run("rows to bytes", row_bytes, pages, baseline)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,12 +1,17 @@
 # cli.py
 
 import asyncio
+import logging
+import signal
 import typer
 from sqlalchemy import select, text
 from app.core.config import settings
 from app.core.database import async_session
 from app.core.security import get_password_hash
 from app.models.base import User  # Import from base instead
+from app.tasks.worker import TaskWorker, run_worker
+from app.services.news_embeddings import related_index
+from app.services.image_pipeline import image_pipeline
 
 app = typer.Typer(help="News Summarizer CLI")
 
@@ -85,5 +90,51 @@ def dbcheck():
         typer.echo(f"Error checking database: {e}")
         raise typer.Exit(1)
 
+async def rebuild_related_index():
+    """Re-embed all hot articles into a fresh related-articles index."""
+    async with async_session() as db:
+        return await related_index.rebuild(db)
+
+@app.command()
+def relatedindex():
+    """Build the related-articles index from scratch (also run by daily maintenance)."""
+    try:
+        result = asyncio.run(rebuild_related_index())
+        typer.echo(f"Related index: {result}")
+    except Exception as e:
+        typer.echo(f"Error building related index: {e}")
+        raise typer.Exit(1)
+
+async def run_task_worker(concurrency: int, worker_id: str = None):
+    """Run a task worker until SIGINT/SIGTERM, then drain in-flight tasks."""
+    worker = TaskWorker(worker_id=worker_id, concurrency=concurrency)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    typer.echo(f"Task worker {worker.worker_id} running with {concurrency} slots")
+    try:
+        await run_worker(worker)
+    finally:
+        # Finish queued images; whatever is cut off is recovered from its task row
+        await image_pipeline.stop()
+
+@app.command()
+def worker(
+    concurrency: int = typer.Option(settings.TASK_WORKER_CONCURRENCY, help="Tasks run in parallel by this worker"),
+    worker_id: str = typer.Option(None, help="Lease owner name, defaults to host:pid")
+):
+    """Run a task worker; start one per node to scale task processing."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    if not asyncio.run(check_db_connection()):
+        typer.echo("Error: Could not connect to database")
+        raise typer.Exit(1)
+
+    asyncio.run(run_task_worker(concurrency, worker_id))
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
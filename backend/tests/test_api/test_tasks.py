@@ -0,0 +1,72 @@
+# tests/test_api/test_tasks.py
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.api.v1.endpoints.tasks import cancel_task
+from app.models.task import Task, TaskStatus, TaskType
+
+@pytest_asyncio.fixture
+async def recurring_task(db):
+    async def add(**values) -> Task:
+        task = Task(**{
+            "name": f"Recurring {datetime.utcnow().timestamp()}",
+            "type": TaskType.SYSTEM_MAINTENANCE,
+            "status": TaskStatus.PENDING,
+            "parameters": {},
+            "scheduled_at": datetime.utcnow() + timedelta(minutes=5),
+            "is_recurring": True,
+            "cron_expression": "0 * * * *",
+            **values
+        })
+        db.add(task)
+        await db.flush()
+        return task
+    return add
+
+async def occurrences(db, task: Task) -> list:
+    return (await db.scalars(
+        select(Task).where(Task.name == task.name, Task.id != task.id)
+    )).all()
+
+@pytest.mark.asyncio
+async def test_cancelling_a_queued_run_queues_the_next_one(db, recurring_task):
+    task = await recurring_task()
+
+    cancelled = await cancel_task(task.id, stop_recurring=False, db=db)
+    [following] = await occurrences(db, task)
+
+    assert cancelled.status == TaskStatus.CANCELLED
+    assert following.status == TaskStatus.PENDING
+    assert following.scheduled_at > task.scheduled_at
+    assert following.cron_expression == task.cron_expression
+
+@pytest.mark.asyncio
+async def test_stop_recurring_ends_the_task(db, recurring_task):
+    task = await recurring_task()
+
+    await cancel_task(task.id, stop_recurring=True, db=db)
+
+    assert await occurrences(db, task) == []
+
+@pytest.mark.asyncio
+async def test_cancelling_a_started_run_queues_nothing(db, recurring_task):
+    # Its claim already queued the next occurrence
+    task = await recurring_task(status=TaskStatus.IN_PROGRESS, attempts=1)
+
+    await cancel_task(task.id, stop_recurring=False, db=db)
+
+    assert await occurrences(db, task) == []
+
+@pytest.mark.asyncio
+async def test_finished_task_cannot_be_cancelled(db, recurring_task):
+    task = await recurring_task(status=TaskStatus.COMPLETED)
+
+    with pytest.raises(HTTPException) as error:
+        await cancel_task(task.id, stop_recurring=False, db=db)
+
+    assert error.value.status_code == 409
@@ -0,0 +1,129 @@
+# tests/test_services/test_cache.py
+
+import asyncio
+
+import pytest
+from fastapi import Request
+
+from app.core import cache as cache_module
+from app.core.cache import CachedResponse, ResponseCache
+
+def make_request(path: str = "/api/v1/public/news", query: str = "", headers: dict = None) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    })
+
+class Renderer:
+    """Render callback counting its calls; ``gate`` holds renders until set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self) -> CachedResponse:
+        self.calls += 1
+        body = f'{{"render": {self.calls}}}'.encode()
+        if self.gate is not None:
+            await self.gate.wait()
+        return CachedResponse(body=body)
+
+@pytest.fixture
+def response_cache(monkeypatch) -> ResponseCache:
+    async def publish(event_type, data=None):
+        pass
+    monkeypatch.setattr(cache_module.event_relay, "publish", publish)
+    return ResponseCache(redis_url="", settle_time=0)
+
+@pytest.mark.asyncio
+async def test_miss_renders_and_hit_reuses(response_cache):
+    render = Renderer()
+
+    first = await response_cache.respond(make_request(query="skip=0"), render)
+    second = await response_cache.respond(make_request(query="skip=0"), render)
+
+    assert render.calls == 1
+    assert first.status_code == second.status_code == 200
+    assert first.body == second.body == b'{"render": 1}'
+    assert first.headers["etag"] == second.headers["etag"]
+
+@pytest.mark.asyncio
+async def test_query_string_is_part_of_the_key(response_cache):
+    render = Renderer()
+
+    await response_cache.respond(make_request(query="a=1&b=2"), render)
+    await response_cache.respond(make_request(query="b=2&a=1"), render)
+    await response_cache.respond(make_request(query="a=2"), render)
+
+    assert render.calls == 2
+
+@pytest.mark.asyncio
+async def test_matching_etag_answers_not_modified(response_cache):
+    render = Renderer()
+    etag = (await response_cache.respond(make_request(), render)).headers["etag"]
+
+    response = await response_cache.respond(make_request(headers={"If-None-Match": etag}), render)
+    stale = await response_cache.respond(make_request(headers={"If-None-Match": '"other"'}), render)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+    assert stale.status_code == 200
+    assert render.calls == 1
+
+@pytest.mark.asyncio
+async def test_invalidate_renders_again(response_cache):
+    render = Renderer()
+    await response_cache.respond(make_request(), render)
+
+    await response_cache.invalidate()
+    response = await response_cache.respond(make_request(), render)
+
+    assert render.calls == 2
+    assert response.body == b'{"render": 2}'
+
+@pytest.mark.asyncio
+async def test_render_overtaken_by_invalidate_is_not_served(response_cache):
+    render = Renderer()
+    render.gate = asyncio.Event()
+    in_flight = asyncio.create_task(response_cache.respond(make_request(), render))
+    while render.calls == 0:
+        await asyncio.sleep(0)
+
+    await response_cache.invalidate()
+    render.gate.set()
+    assert (await in_flight).body == b'{"render": 1}'
+
+    response = await response_cache.respond(make_request(), render)
+
+    assert render.calls == 2
+    assert response.body == b'{"render": 2}'
+
+@pytest.mark.asyncio
+async def test_invalidate_is_relayed_to_other_processes(monkeypatch):
+    published = []
+
+    async def publish(event_type, data=None):
+        published.append(event_type)
+    monkeypatch.setattr(cache_module.event_relay, "publish", publish)
+
+    await ResponseCache(redis_url="", settle_time=0).invalidate()
+
+    assert published == ["cache_invalidated"]
+
+@pytest.mark.asyncio
+async def test_relayed_invalidation_clears_the_local_cache(monkeypatch):
+    response_cache = ResponseCache(redis_url="", settle_time=0)
+    monkeypatch.setattr(cache_module, "response_cache", response_cache)
+    render = Renderer()
+    await response_cache.respond(make_request(), render)
+    handlers = dict(cache_module.event_relay.handlers["cache_invalidated"])
+
+    await cache_module._invalidate_local({})
+    await response_cache.respond(make_request(), render)
+
+    assert handlers[cache_module._invalidate_local] is False
+    assert render.calls == 2
@@ -0,0 +1,135 @@
+# tests/test_services/test_db_metrics.py
+
+from uuid import uuid4
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core import database as database_module
+from app.core.database import RoutingSession, get_db, get_read_db, make_engine
+from app.core.db_metrics import DatabaseTimingMiddleware, pool_metrics
+from app.models.user import User
+
+@pytest_asyncio.fixture
+async def make_test_engine(database_url):
+    """Instrumented engines on the test database, under names of their own."""
+    engines = []
+
+    def make(**options):
+        name = f"test-{uuid4().hex[:8]}"
+        engine = make_engine(database_url, name=name, **options)
+        engines.append(engine)
+        return engine, name
+    yield make
+    for engine in engines:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_checkouts_are_timed_and_counted(make_test_engine):
+    engine, name = make_test_engine(pool_size=2)
+
+    for _ in range(3):
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT pg_sleep(0.01)"))
+
+    metrics = pool_metrics.metrics()["engines"][name]
+    assert metrics["checkouts"] == 3
+    assert metrics["connects"] == 1
+    assert metrics["avg_held"] >= 0.01
+    assert (metrics["pool_size"], metrics["checked_out"], metrics["idle"]) == (2, 0, 1)
+    assert sum(metrics["wait_histogram"].values()) == 3
+
+@pytest.mark.asyncio
+async def test_checkout_timeout_is_recorded(make_test_engine):
+    engine, name = make_test_engine(pool_size=1, max_overflow=0, pool_timeout=0.1)
+
+    async with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            async with engine.connect():
+                pass
+
+    metrics = pool_metrics.metrics()["engines"][name]
+    assert (metrics["checkouts"], metrics["timeouts"]) == (1, 1)
+    assert metrics["max_wait"] >= 0.1
+    assert metrics["wait_histogram"]["le_0.5"] == 1
+
+@pytest.mark.asyncio
+async def test_requests_report_their_connection_use(make_test_engine):
+    engine, name = make_test_engine()
+    path = f"/items-{uuid4().hex[:8]}"
+
+    async def item(request):
+        if request.path_params["item_id"] == "db":
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        return PlainTextResponse("ok")
+
+    app = DatabaseTimingMiddleware(Starlette(routes=[Route(path + "/{item_id}", item)]))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        with_db = await client.get(f"{path}/db")
+        without_db = await client.get(f"{path}/static")
+
+    assert with_db.headers["server-timing"].startswith("db-wait;dur=")
+    assert 'desc="1 checkouts"' in with_db.headers["server-timing"]
+    assert "server-timing" not in without_db.headers
+    route = pool_metrics.metrics()["routes"][f"GET {path}/{{item_id}}"]
+    assert (route["requests"], route["checkouts_per_request"]) == (1, 1.0)
+
+def test_only_plain_reads_go_to_the_replica(make_test_engine):
+    primary, _ = make_test_engine()
+    replica, _ = make_test_engine()
+    session = AsyncSession(primary, sync_session_class=RoutingSession)
+    route = session.sync_session.get_bind
+
+    session.info["replica"] = replica
+    assert route(clause=select(User)) is replica.sync_engine
+    assert route(clause=select(User).with_for_update()) is primary.sync_engine
+    assert route(clause=insert(User)) is primary.sync_engine
+    assert route(clause=text("SELECT 1")) is primary.sync_engine
+
+    session.info.pop("replica")
+    assert route(clause=select(User)) is primary.sync_engine
+
+@pytest.mark.asyncio
+async def test_writer_session_leaves_the_replica_and_commits(make_test_engine, monkeypatch):
+    primary, _ = make_test_engine()
+    replica, _ = make_test_engine()
+    session = AsyncSession(primary, sync_session_class=RoutingSession)
+    session.info["replica"] = replica
+    committed = []
+
+    async def commit():
+        committed.append(True)
+    monkeypatch.setattr(session, "commit", commit)
+
+    writer = get_db(session)
+    assert await writer.__anext__() is session
+    assert "replica" not in session.info and session.info["writer"]
+    with pytest.raises(StopAsyncIteration):
+        await writer.__anext__()
+    assert committed == [True]
+
+@pytest.mark.asyncio
+async def test_read_session_closes_without_a_commit(monkeypatch):
+    sessions = []
+
+    class Session(AsyncSession):
+        async def commit(self):
+            raise AssertionError("read sessions never commit")
+
+        async def close(self):
+            sessions.append(self)
+            await super().close()
+    monkeypatch.setattr(database_module, "async_session", lambda: Session())
+
+    reader = get_read_db()
+    session = await reader.__anext__()
+    await reader.aclose()
+
+    assert sessions == [session]
@@ -0,0 +1,132 @@
+# tests/test_services/test_events.py
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from uuid import uuid4
+import asyncio
+import json
+
+import pytest
+
+from app.api.v1.endpoints import websocket
+from app.core.events import EventRelay, MAX_PAYLOAD_BYTES
+from app.models.prompt import PromptType
+
+def collector():
+    received = []
+
+    async def handler(data):
+        received.append(data)
+    return received, handler
+
+def payload(relay: EventRelay, event_type: str, data: dict, origin: str = None) -> str:
+    return json.dumps({"type": event_type, "origin": origin or relay.origin, "data": data})
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_own_events_when_asked():
+    relay = EventRelay(channel="test")
+    everyone, to_everyone = collector()
+    others, to_others = collector()
+    relay.subscribe("ping", to_everyone)
+    relay.subscribe("ping", to_others, own_events=False)
+
+    await relay._dispatch(payload(relay, "ping", {"n": 1}))
+    await relay._dispatch(payload(relay, "ping", {"n": 2}, origin="elsewhere"))
+    await relay._dispatch(payload(relay, "pong", {"n": 3}, origin="elsewhere"))
+
+    assert everyone == [{"n": 1}, {"n": 2}]
+    assert others == [{"n": 2}]
+
+@pytest.mark.asyncio
+async def test_failing_handler_does_not_stop_the_others():
+    relay = EventRelay(channel="test")
+    received, handler = collector()
+
+    async def failing(data):
+        raise RuntimeError("boom")
+    relay.subscribe("ping", failing)
+    relay.subscribe("ping", handler)
+
+    await relay._dispatch("not json")
+    await relay._dispatch(payload(relay, "ping", {}))
+
+    assert received == [{}]
+
+@pytest.mark.asyncio
+async def test_oversized_event_is_rejected():
+    with pytest.raises(ValueError):
+        await EventRelay(channel="test").publish("ping", {"blob": "x" * MAX_PAYLOAD_BYTES})
+
+@pytest.mark.asyncio
+async def test_published_event_reaches_listeners(database_url):
+    relay = EventRelay(channel=f"test_{uuid4().hex}")
+    received, handler = collector()
+    relay.subscribe("ping", handler)
+    listener = asyncio.create_task(relay.listen())
+    try:
+        # The listener connects in the background; notifications before that are lost
+        for _ in range(50):
+            await relay.publish("ping", {"n": 1})
+            await asyncio.sleep(0.1)
+            if received:
+                break
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+
+    assert received[0] == {"n": 1}
+
+@pytest.mark.asyncio
+async def test_new_article_event_carries_only_its_key(monkeypatch):
+    published = []
+
+    async def publish(event_type, data=None):
+        published.append((event_type, data))
+    monkeypatch.setattr(websocket.event_relay, "publish", publish)
+    article = {"id": uuid4(), "published_date": datetime(2026, 3, 14, 9, 26), "content": "long"}
+
+    await websocket.broadcast_new_article(article, PromptType.PRIVATE, user_id=None)
+
+    assert published == [("news_update", {
+        "article_id": str(article["id"]),
+        "published_date": "2026-03-14T09:26:00",
+        "prompt_type": "private",
+        "user_id": None
+    })]
+
+@pytest.mark.asyncio
+async def test_news_update_is_loaded_and_broadcast(db, make_prompt, add_article, monkeypatch):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    article = await add_article(prompt, datetime.utcnow() - timedelta(hours=1))
+    broadcasts = []
+
+    @asynccontextmanager
+    async def session():
+        yield db
+
+    async def broadcast_news(news, prompt_type, user_id=None):
+        broadcasts.append((news, prompt_type, user_id))
+    monkeypatch.setattr(websocket, "async_session", session)
+    monkeypatch.setattr(websocket.manager, "broadcast_news", broadcast_news)
+    monkeypatch.setitem(websocket.manager.active_connections, "public", [object()])
+
+    await websocket._deliver_news_update({
+        "article_id": str(article.id),
+        "published_date": article.published_date.isoformat(),
+        "prompt_type": "public",
+        "user_id": None
+    })
+
+    [(news, prompt_type, user_id)] = broadcasts
+    assert news["id"] == article.id
+    assert news["prompt_name"] == prompt.name
+    assert prompt_type is PromptType.PUBLIC
+
+@pytest.mark.asyncio
+async def test_news_update_without_connections_skips_the_load(monkeypatch):
+    def session():
+        raise AssertionError("loaded an article nobody receives")
+    monkeypatch.setattr(websocket, "async_session", session)
+    monkeypatch.setitem(websocket.manager.active_connections, "public", [])
+
+    await websocket._deliver_news_update({"article_id": str(uuid4())})
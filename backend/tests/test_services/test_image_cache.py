@@ -0,0 +1,125 @@
+# tests/test_services/test_image_cache.py
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.models.news import NewsImage
+from app.services import image_cache as cache_module
+from app.services.image_cache import ImageCache
+from app.utils.media_storage import media_path, media_url
+
+PROMPT = "A lighthouse on a rocky coast at dusk, oil painting with warm light and gulls"
+SIZE = "1024x1024"
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_ROOT", str(tmp_path / "media"))
+    return tmp_path
+
+@pytest.fixture
+def make_cache(media_root):
+    def make(**values) -> ImageCache:
+        return ImageCache(**{"index_path": str(media_root / "cache_index.json"), **values})
+    return make
+
+def image_result(name: str) -> dict:
+    """A stored image, with its file on disk."""
+    storage_path = f"images/{name}.webp"
+    path = media_path(storage_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"image")
+    return {"url": media_url(storage_path), "storage_path": storage_path, "metadata": {"provider": "fake"}}
+
+@pytest.mark.asyncio
+async def test_exact_prompt_hits_regardless_of_case_and_punctuation(make_cache):
+    cache = make_cache()
+    await cache.store(PROMPT, SIZE, image_result("a"))
+
+    hit = await cache.lookup(PROMPT.upper().replace(",", " ;"), SIZE)
+
+    assert hit["storage_path"] == "images/a.webp"
+    assert hit["metadata"]["cache"]["similarity"] == 1.0
+    assert hit["metadata"]["provider"] == "fake"
+
+@pytest.mark.asyncio
+async def test_fuzzy_match_needs_the_similarity_threshold_and_the_same_size(make_cache):
+    cache = make_cache(similarity_threshold=0.8)
+    await cache.store(PROMPT, SIZE, image_result("a"))
+    # One extra word at the end keeps most shingles
+    close = PROMPT + " flying"
+    far = "A lighthouse on a rocky coast at noon, watercolor with cold light and boats"
+
+    hit = await cache.lookup(close, SIZE)
+
+    assert 0.8 <= hit["metadata"]["cache"]["similarity"] < 1.0
+    assert hit["metadata"]["cache"]["matched_prompt"] == PROMPT
+    assert await cache.lookup(far, SIZE) is None
+    assert await cache.lookup(close, "512x512") is None
+    assert await make_cache(fuzzy=False).lookup(close, SIZE) is None
+
+@pytest.mark.asyncio
+async def test_expired_remote_url_is_not_reused(make_cache):
+    cache = make_cache(remote_ttl=60)
+    remote = {"url": "https://provider.example.com/a.png", "metadata": {}}
+    await cache.store(PROMPT, SIZE, remote)
+    cache.entries[cache.prompt_key(PROMPT, SIZE)]["created_at"] = (
+        datetime.utcnow() - timedelta(seconds=61)
+    ).isoformat()
+
+    assert await cache.lookup(PROMPT, SIZE) is None
+    assert cache.entries == {}
+
+@pytest.mark.asyncio
+async def test_entry_whose_file_is_gone_is_dropped(make_cache):
+    cache = make_cache()
+    result = image_result("a")
+    await cache.store(PROMPT, SIZE, result)
+    os.remove(media_path(result["storage_path"]))
+
+    assert await cache.lookup(PROMPT, SIZE) is None
+    assert cache.entries == {}
+
+@pytest.mark.asyncio
+async def test_processes_merge_their_entries_into_the_shared_index(make_cache):
+    first, second = make_cache(), make_cache()
+    await first.store(PROMPT, SIZE, image_result("a"))
+    await second.store("A red bicycle leaning on a brick wall", SIZE, image_result("b"))
+
+    assert await second.lookup(PROMPT, SIZE) is not None
+    assert len(make_cache()._read_index()) == 2
+
+@pytest.mark.asyncio
+async def test_least_recently_used_image_is_evicted_with_its_unused_file(db, make_cache, use_test_session):
+    use_test_session(cache_module)
+    cache = make_cache(max_entries=2, save_interval=0)
+    prompts = ["A red bicycle leaning on a brick wall", "A blue kite over green hills", PROMPT]
+    results = [image_result(name) for name in ("a", "b", "c")]
+    for prompt, result in zip(prompts[:2], results[:2]):
+        await cache.store(prompt, SIZE, result)
+    # The first entry is used again, so the second one is evicted
+    assert await cache.lookup(prompts[0], SIZE)
+
+    await cache.store(prompts[2], SIZE, results[2])
+
+    assert await cache.lookup(prompts[1], SIZE) is None
+    assert {entry["prompt"] for entry in cache.entries.values()} == {prompts[0], prompts[2]}
+    assert not os.path.exists(media_path(results[1]["storage_path"]))
+
+@pytest.mark.asyncio
+async def test_evicted_image_used_by_an_article_keeps_its_file(db, make_cache, use_test_session):
+    use_test_session(cache_module)
+    cache = make_cache(max_entries=1)
+    kept = image_result("a")
+    db.add(NewsImage(news_article_id=uuid4(), image_prompt=PROMPT, provider="fake", storage_path=kept["storage_path"]))
+    await db.flush()
+    await cache.store(PROMPT, SIZE, kept)
+
+    await cache.store("A blue kite over green hills", SIZE, image_result("b"))
+
+    assert [entry["prompt"] for entry in cache.entries.values()] == ["A blue kite over green hills"]
+    assert os.path.exists(media_path(kept["storage_path"]))
@@ -0,0 +1,64 @@
+# tests/test_services/test_image_derivatives.py
+
+import io
+import shutil
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services import image_derivatives as derivatives_module
+from app.services.image_derivatives import DERIVATIVE_PREFIX, ImageDerivativeService, render_derivatives
+from app.services.image_executor import ImageExecutor
+from app.utils.image_optimizer import ImageOptimizer
+from app.utils.media_storage import media_path, store_bytes
+
+WIDTHS = [320, 640, 1024]
+FORMATS = ["avif", "webp", "jpeg"]
+
+@pytest.fixture
+def source_path(tmp_path, monkeypatch) -> str:
+    """An 800x600 JPEG stored under a temporary MEDIA_ROOT."""
+    monkeypatch.setattr(settings, "MEDIA_ROOT", str(tmp_path))
+    img = Image.linear_gradient('L').resize((800, 600)).convert('RGB')
+    output = io.BytesIO()
+    img.save(output, 'JPEG', quality=90)
+    return store_bytes(output.getvalue(), 'jpg', 'images')
+
+def test_every_format_is_stored_at_every_width_without_upscaling(source_path):
+    variants = render_derivatives(source_path, WIDTHS, FORMATS, 80)
+
+    assert set(variants) == set(FORMATS)
+    for format, by_width in variants.items():
+        assert set(by_width) == {"320w", "640w", "800w"}
+        for width, path in by_width.items():
+            assert path.startswith(f"{DERIVATIVE_PREFIX}/")
+            assert path.endswith(f".{derivatives_module.DERIVATIVE_EXTENSIONS[format]}")
+            with Image.open(media_path(path)) as img:
+                assert img.format == format.upper()
+                assert f"{img.size[0]}w" == width
+
+def test_identical_source_bytes_reuse_the_stored_derivatives(source_path, monkeypatch):
+    first = render_derivatives(source_path, WIDTHS, FORMATS, 80)
+    # The same image stored again under another name
+    copy_path = "images/copy.jpg"
+    shutil.copy(media_path(source_path), media_path(copy_path))
+
+    def create_derivatives(*args, **kwargs):
+        raise AssertionError("rendered again")
+    monkeypatch.setattr(ImageOptimizer, "create_derivatives", create_derivatives)
+
+    assert render_derivatives(copy_path, WIDTHS, FORMATS, 80) == first
+
+@pytest.mark.asyncio
+async def test_variants_are_rendered_on_the_executor_as_media_urls(source_path, monkeypatch):
+    executor = ImageExecutor(max_workers=1, max_queue=1)
+    monkeypatch.setattr(derivatives_module, "image_executor", executor)
+    try:
+        variants = await ImageDerivativeService(widths=[320], formats=["webp"]).create_variants(source_path)
+    finally:
+        executor.shutdown()
+
+    [url] = variants["webp"].values()
+    assert url.startswith(f"{settings.MEDIA_URL}/{DERIVATIVE_PREFIX}/")
+    assert executor.metrics()["operations"]["render_derivatives"]["count"] == 1
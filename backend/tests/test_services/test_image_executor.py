@@ -0,0 +1,86 @@
+# tests/test_services/test_image_executor.py
+
+import asyncio
+import io
+import os
+import time
+
+import pytest
+import pytest_asyncio
+from PIL import Image
+
+from app.services.image_executor import ImageExecutor, ImageExecutorBusy
+from app.services.image_processor import ImageProcessor
+
+# Module level, so the pool can pickle them by reference
+def worker_pid() -> int:
+    return os.getpid()
+
+def sleep_then_return(seconds: float, value):
+    time.sleep(seconds)
+    return value
+
+def fail(message: str):
+    raise ValueError(message)
+
+@pytest_asyncio.fixture
+async def executor():
+    executor = ImageExecutor(max_workers=1, max_queue=2)
+    yield executor
+    executor.shutdown()
+
+async def until(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_work_runs_in_another_process_and_is_timed(executor):
+    pid = await executor.run("pid", worker_pid)
+    value = await executor.run("sleep", sleep_then_return, 0.05, value="done")
+
+    operations = executor.metrics()["operations"]
+    assert pid != os.getpid()
+    assert value == "done"
+    assert operations["sleep"]["count"] == 1
+    assert operations["sleep"]["avg_time"] >= 0.05
+    assert operations["sleep"]["errors"] == 0
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_and_counted(executor):
+    with pytest.raises(ValueError, match="bad image"):
+        await executor.run("decode", fail, "bad image")
+
+    assert executor.metrics()["operations"]["decode"] == {
+        "count": 0, "errors": 1, "avg_time": None, "max_time": 0.0, "avg_wait": None
+    }
+
+@pytest.mark.asyncio
+async def test_full_queue_makes_callers_wait_or_rejects_them(executor):
+    running = [asyncio.create_task(executor.run("sleep", sleep_then_return, 0.3, n)) for n in range(2)]
+    await until(lambda: executor._slots.locked())
+
+    metrics = executor.metrics()
+    assert (metrics["running"], metrics["queue_depth"]) == (1, 1)
+    with pytest.raises(ImageExecutorBusy):
+        await executor.run("sleep", sleep_then_return, 0, "rejected", wait=False)
+
+    # A waiting caller gets the next free slot
+    assert await executor.run("sleep", sleep_then_return, 0, "waited") == "waited"
+    assert await asyncio.gather(*running) == [0, 1]
+    metrics = executor.metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["operations"]["sleep"]["count"] == 3
+    assert (metrics["running"], metrics["queue_depth"]) == (0, 0)
+
+@pytest.mark.asyncio
+async def test_processor_transform_is_picklable_work(executor):
+    source = io.BytesIO()
+    Image.new("RGB", (400, 200), "red").save(source, "JPEG")
+
+    processed = await executor.run("process_image", ImageProcessor.transform, source.getvalue(), (100, 50), True)
+
+    with Image.open(io.BytesIO(processed)) as img:
+        assert img.format == "PNG"
+        assert img.size[0] <= 100 and img.size[1] <= 50
@@ -0,0 +1,197 @@
+# tests/test_services/test_image_optimizer.py
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageOps
+
+from app.utils.image_optimizer import ImageOptimizer
+
+def make_image(size=(1024, 768), noise: float = 12, seed: int = 0) -> bytes:
+    """PNG of a gradient with shapes and noise, compressing like generated art"""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    x = np.linspace(0, 1, width)[None, :, None]
+    y = np.linspace(0, 1, height)[:, None, None]
+    gradient = np.array([200, 80, 40]) * (1 - x) * (1 - y) + np.array([30, 120, 220]) * x * y
+    pixels = np.clip(gradient + rng.normal(0, noise, size=(height, width, 3)), 0, 255).astype(np.uint8)
+    img = Image.fromarray(pixels, 'RGB')
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x0, y0 = int(rng.integers(0, width)), int(rng.integers(0, height))
+        draw.ellipse((x0, y0, x0 + 150, y0 + 100), fill=tuple(int(c) for c in rng.integers(0, 255, size=3)))
+    output = io.BytesIO()
+    img.save(output, 'PNG')
+    return output.getvalue()
+
+def encoded_size(image_data: bytes, quality: int, format: str = 'JPEG') -> int:
+    output = io.BytesIO()
+    Image.open(io.BytesIO(image_data)).convert('RGB').save(
+        output, format, quality=quality, **ImageOptimizer.ENCODE_OPTIONS[format]
+    )
+    return len(output.getvalue())
+
+def best_quality(image_data: bytes, max_size_kb: int, format: str = 'JPEG') -> int:
+    """Highest quality in [60, 95] within the target, by bisection"""
+    lo, hi = 60, 95
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if encoded_size(image_data, mid, format) <= max_size_kb * 1024:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+@pytest.mark.parametrize("format", ["JPEG", "WEBP"])
+@pytest.mark.parametrize("seed, target_quality", [(0, 90), (1, 80), (2, 68)])
+def test_encode_meets_the_target_near_the_best_quality(format, seed, target_quality):
+    image_data = make_image(noise=[4, 12, 25][seed], seed=seed)
+    max_size_kb = encoded_size(image_data, target_quality, format) // 1024 + 1
+    best = best_quality(image_data, max_size_kb, format)
+
+    data, stats = ImageOptimizer.encode_to_size(image_data, max_size_kb=max_size_kb, format=format)
+
+    assert len(data) <= max_size_kb * 1024
+    assert best - 2 <= stats['quality'] <= best
+    assert stats['probe_encodes'] == 2
+    assert stats['encodes'] <= 4
+    assert not stats['resized']
+
+def test_max_quality_within_the_target_takes_one_encode():
+    data, stats = ImageOptimizer.encode_to_size(make_image(noise=2), max_size_kb=2000)
+
+    assert stats['quality'] == 95
+    assert stats['encodes'] == 1
+    assert Image.open(io.BytesIO(data)).format == 'JPEG'
+
+def test_small_image_bisects_without_a_probe():
+    image_data = make_image(size=(300, 200))
+    max_size_kb = encoded_size(image_data, 80) // 1024 + 1
+
+    data, stats = ImageOptimizer.encode_to_size(image_data, max_size_kb=max_size_kb)
+
+    assert stats['probe_encodes'] == 0
+    assert len(data) <= max_size_kb * 1024
+    assert best_quality(image_data, max_size_kb) - 2 <= stats['quality']
+
+def test_target_below_the_minimum_quality_shrinks_the_image():
+    image_data = make_image(noise=25)
+
+    data, stats = ImageOptimizer.encode_to_size(image_data, max_size_kb=20)
+    img = Image.open(io.BytesIO(data))
+
+    assert stats['resized']
+    assert stats['quality'] == 60
+    assert len(data) <= 20 * 1024
+    assert img.size[0] < 1024
+
+def test_compress_image_returns_the_encoded_bytes():
+    data = ImageOptimizer.compress_image(make_image(), max_size_kb=80, format="webp")
+
+    assert len(data) <= 80 * 1024
+    assert Image.open(io.BytesIO(data)).format == 'WEBP'
+
+@pytest.mark.parametrize("quality", [10, 49, 50, 60, 95, 99])
+def test_quantizer_scale_round_trip(quality):
+    scale = ImageOptimizer._quantizer_scale(quality)
+
+    assert ImageOptimizer._scale_quality(scale) == pytest.approx(quality)
+
+def encode(img: Image.Image, format: str = 'PNG', **options) -> bytes:
+    output = io.BytesIO()
+    img.save(output, format, **options)
+    return output.getvalue()
+
+def test_analysis_of_a_two_colour_image():
+    pixels = np.zeros((100, 200, 3), dtype=np.uint8)
+    pixels[:, 100:] = (255, 0, 0)
+
+    stats = ImageOptimizer.analyze_image_vectorized(encode(Image.fromarray(pixels, 'RGB')))
+
+    red_luma = 0.299 * 255
+    assert (stats['format'], stats['width'], stats['height']) == ('PNG', 200, 100)
+    assert stats['brightness'] == pytest.approx(red_luma / 2, abs=0.01)
+    assert stats['contrast'] == pytest.approx(red_luma / 2, abs=0.01)
+    np.testing.assert_array_equal(stats['channel_min'], [0, 0, 0])
+    np.testing.assert_array_equal(stats['channel_max'], [255, 0, 0])
+    np.testing.assert_allclose(stats['channel_mean'], [127.5, 0, 0])
+    # Colours are reported at the centre of their histogram bin
+    assert {tuple(color) for color in stats['dominant_colors'][:2]} == {(8, 8, 8), (248, 8, 8)}
+    np.testing.assert_allclose(stats['dominant_weights'], [0.5, 0.5, 0, 0, 0])
+
+def test_downsampled_analysis_matches_the_full_image():
+    image_data = make_image(size=(1600, 1200))
+    full = np.asarray(Image.open(io.BytesIO(image_data)).convert('RGB'), dtype=np.float32)
+
+    stats = ImageOptimizer.analyze_image_vectorized(image_data, max_side=256)
+
+    assert (stats['width'], stats['height']) == (1600, 1200)
+    np.testing.assert_allclose(stats['channel_mean'], full.reshape(-1, 3).mean(axis=0), rtol=0.01)
+    assert stats['brightness'] == pytest.approx((full @ [0.299, 0.587, 0.114]).mean(), rel=0.01)
+
+def test_perceptual_hash_survives_resizing_and_recompression():
+    original = Image.open(io.BytesIO(make_image(seed=3)))
+    copy = encode(original.resize((512, 384)), 'JPEG', quality=70)
+    other = make_image(seed=4)
+
+    batch = ImageOptimizer.batch_analyze_images([encode(original), copy, other])
+    distances = ImageOptimizer.phash_distance(batch['phash'][0], batch['phash'])
+
+    assert distances[0] == 0
+    assert distances[1] <= 6
+    assert distances[2] >= 16
+
+def test_batch_rows_follow_the_input_order():
+    images = [make_image(size=(300, 200), seed=seed) for seed in range(3)]
+
+    batch = ImageOptimizer.batch_analyze_images(images, dominant_colors=4)
+
+    assert batch['size'].tolist() == [[300, 200]] * 3
+    assert batch['dominant_colors'].shape == (3, 4, 3)
+    assert batch['phash'].shape == (3,)
+    assert batch['brightness'][1] == ImageOptimizer.analyze_image_vectorized(images[1])['brightness']
+    assert ImageOptimizer.batch_analyze_images([]) == {}
+
+def mean_difference(a: Image.Image, b: Image.Image) -> float:
+    return float(np.abs(np.asarray(a, dtype=np.float32) - np.asarray(b, dtype=np.float32)).mean())
+
+@pytest.mark.parametrize("crop", [True, False])
+def test_thumbnails_of_every_size_come_from_one_call(crop):
+    sizes = [(320, 320), (160, 90), (2000, 2000)]
+
+    thumbnails = ImageOptimizer.create_thumbnails(make_image(size=(1600, 1200)), sizes, crop=crop)
+
+    assert list(thumbnails) == sizes
+    opened = {size: Image.open(io.BytesIO(data)) for size, data in thumbnails.items()}
+    assert all(img.format == 'JPEG' for img in opened.values())
+    if crop:
+        assert all(img.size == size for size, img in opened.items())
+    else:
+        # Aspect ratio kept, and never upscaled
+        assert [img.size for img in opened.values()] == [(320, 240), (120, 90), (1600, 1200)]
+
+def test_draft_decoded_thumbnail_matches_a_full_decode():
+    image_data = encode(Image.open(io.BytesIO(make_image(size=(2400, 1600), noise=4))), 'JPEG', quality=90)
+    full = ImageOps.fit(Image.open(io.BytesIO(image_data)).convert('RGB'), (200, 200), Image.LANCZOS)
+
+    thumb = Image.open(io.BytesIO(ImageOptimizer.create_thumbnail(image_data, (200, 200))))
+
+    assert thumb.size == (200, 200)
+    assert mean_difference(thumb, full) < 6
+
+def test_crop_keeps_the_centre_of_the_image():
+    pixels = np.zeros((100, 300, 3), dtype=np.uint8)
+    pixels[:, 100:200] = (255, 255, 255)
+
+    thumb = Image.open(io.BytesIO(ImageOptimizer.create_thumbnail(encode(Image.fromarray(pixels, 'RGB')), (50, 50))))
+
+    assert np.asarray(thumb.convert('L')).mean() > 250
+
+def test_web_image_fits_within_the_maximum_size():
+    image_data = encode(Image.open(io.BytesIO(make_image(size=(3000, 1500)))), 'JPEG', quality=90)
+
+    img = Image.open(io.BytesIO(ImageOptimizer.optimize_for_web(image_data, max_size=(1200, 1200))))
+
+    assert img.size == (1200, 600)
+    assert img.format == 'JPEG'
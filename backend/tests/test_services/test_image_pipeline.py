@@ -0,0 +1,186 @@
+# tests/test_services/test_image_pipeline.py
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from app.models.news import NewsImage, NewsSnapshot
+from app.models.prompt import PromptType
+from app.models.task import Task, TaskStatus
+from app.services import image_pipeline as pipeline_module
+from app.services.image_pipeline import ImageJob, ImagePipeline, image_task
+from app.services.news_snapshots import NewsSnapshots, load_items
+from app.tasks import worker as worker_module
+from app.tasks.worker import TaskWorker
+
+class FakeImageService:
+    """Image service answering with a remote URL, or failing when told to."""
+
+    def __init__(self, error: str = None):
+        self.error = error
+
+    async def generate_image(self, prompt: str) -> dict:
+        if self.error:
+            raise RuntimeError(self.error)
+        return {"url": "https://images.example.com/a.png", "metadata": {"provider": "fake"}}
+
+@pytest_asyncio.fixture
+async def pipeline(db, use_test_session, monkeypatch):
+    # Only this test's tasks are claimable by the task worker
+    await db.execute(delete(Task))
+    use_test_session(pipeline_module)
+    use_test_session(worker_module)
+    broadcasts = []
+
+    async def broadcast_image_ready(**values):
+        broadcasts.append(values)
+    monkeypatch.setattr(pipeline_module, "broadcast_image_ready", broadcast_image_ready)
+    pipeline = ImagePipeline(concurrency=1, lease_seconds=120)
+    pipeline.broadcasts = broadcasts
+    return pipeline
+
+@pytest_asyncio.fixture
+async def image_job(db, make_prompt, add_article):
+    """An article with its committed image task, and the job to fill it in."""
+    article = await add_article(await make_prompt(PromptType.PRIVATE), datetime.utcnow())
+    task = image_task(article, "a lighthouse", PromptType.PRIVATE, user_id=None)
+    db.add(task)
+    await db.flush()
+
+    def job(**values) -> ImageJob:
+        return ImageJob(**{
+            "task_id": task.id,
+            "article_id": article.id,
+            "image_prompt": "a lighthouse",
+            "prompt_type": PromptType.PRIVATE,
+            "user_id": None,
+            "image_service": FakeImageService(),
+            **values
+        })
+    return article, task, job
+
+@pytest.mark.asyncio
+async def test_claim_leases_the_task_once(db, pipeline, image_job):
+    _, task, _ = image_job
+
+    assert await pipeline._claim(task.id)
+    assert not await pipeline._claim(task.id)
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.IN_PROGRESS
+    assert task.locked_by == pipeline.owner
+    assert task.locked_until > datetime.utcnow() + timedelta(seconds=110)
+    assert task.attempts == 1
+
+@pytest.mark.asyncio
+async def test_completed_job_fills_the_article_and_releases_its_task(db, pipeline, image_job):
+    article, task, job = image_job
+    assert await pipeline._claim(task.id)
+
+    await pipeline._run_leased(job())
+    await db.refresh(task)
+    await db.refresh(article)
+
+    assert task.status == TaskStatus.COMPLETED
+    assert task.locked_by is None
+    assert task.result == {"image_status": "ready"}
+    assert article.image_url == "https://images.example.com/a.png"
+    assert article.ai_metadata["image_status"] == "ready"
+    assert await db.scalar(
+        select(NewsImage.id).where(NewsImage.news_article_id == article.id)
+    ) is not None
+    assert pipeline.broadcasts[0]["article_id"] == article.id
+
+@pytest.mark.asyncio
+async def test_failed_generation_is_recorded_on_the_article(db, pipeline, image_job):
+    article, task, job = image_job
+    assert await pipeline._claim(task.id)
+
+    await pipeline._run_leased(job(image_service=FakeImageService(error="quota")))
+    await db.refresh(task)
+    await db.refresh(article)
+
+    assert task.status == TaskStatus.COMPLETED
+    assert task.error_message == "quota"
+    assert article.image_url is None
+    assert article.ai_metadata == {"image_status": "failed", "image_error": "quota"}
+    assert pipeline.broadcasts == []
+
+@pytest.mark.asyncio
+async def test_image_of_a_closed_day_rebuilds_its_final_snapshot(db, pipeline, make_prompt, add_article, monkeypatch):
+    async def invalidate():
+        pass
+    monkeypatch.setattr(pipeline_module.response_cache, "invalidate", invalidate)
+    yesterday = datetime.utcnow().date() - timedelta(days=1)
+    article = await add_article(await make_prompt(PromptType.PUBLIC), datetime.combine(yesterday, datetime.min.time()))
+    task = image_task(article, "a lighthouse", PromptType.PUBLIC, user_id=None)
+    db.add(task)
+    await db.flush()
+    snapshots = NewsSnapshots(db)
+    assert (await snapshots.build(yesterday, PromptType.PUBLIC)).is_final
+    assert await pipeline._claim(task.id)
+
+    await pipeline._run_leased(ImageJob(
+        task_id=task.id, article_id=article.id, image_prompt="a lighthouse",
+        prompt_type=PromptType.PUBLIC, user_id=None, image_service=FakeImageService()
+    ))
+    dropped = await db.scalar(select(NewsSnapshot.id).where(NewsSnapshot.snapshot_date == yesterday))
+    rebuilt = (await snapshots.current(yesterday))[PromptType.PUBLIC]
+
+    assert dropped is None
+    assert rebuilt.is_final
+    [item] = [item for item in load_items(rebuilt.payload) if item["id"] == str(article.id)]
+    assert item["image_url"] == "https://images.example.com/a.png"
+
+@pytest.mark.asyncio
+async def test_heartbeat_renews_the_lease_until_the_task_settles(db, pipeline, image_job, monkeypatch):
+    _, task, _ = image_job
+    assert await pipeline._claim(task.id)
+    task.locked_until = datetime.utcnow() + timedelta(seconds=1)
+    await db.flush()
+    renewed = asyncio.Event()
+
+    @asynccontextmanager
+    async def session():
+        yield db
+        renewed.set()
+    monkeypatch.setattr(pipeline_module, "async_session", session)
+    pipeline.heartbeat_interval = 0.01
+
+    # Stop it while it sleeps, so it never shares the session with the test
+    heartbeat = asyncio.create_task(pipeline._heartbeat(task.id))
+    await renewed.wait()
+    heartbeat.cancel()
+    await asyncio.gather(heartbeat, return_exceptions=True)
+    await db.refresh(task)
+    assert task.locked_until > datetime.utcnow() + timedelta(seconds=110)
+
+    task.status = TaskStatus.COMPLETED
+    task.locked_by = None
+    await db.flush()
+    await asyncio.wait_for(pipeline._heartbeat(task.id), timeout=1)
+
+@pytest.mark.asyncio
+async def test_running_job_is_not_recovered_by_task_workers(pipeline, image_job):
+    _, task, _ = image_job
+    assert await pipeline._claim(task.id)
+
+    assert await TaskWorker(worker_id="test-worker", listen=False).claim() is None
+
+@pytest.mark.asyncio
+async def test_job_of_a_crashed_process_is_recovered_once_its_lease_expires(db, pipeline, image_job):
+    _, task, _ = image_job
+    assert await pipeline._claim(task.id)
+    # No heartbeats anymore: the process went away mid-job
+    task.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    await db.flush()
+
+    assert await TaskWorker(worker_id="test-worker", listen=False).claim() == task.id
+    await db.refresh(task)
+
+    assert task.locked_by == "test-worker"
+    assert task.attempts == 2
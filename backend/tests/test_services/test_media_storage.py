@@ -0,0 +1,108 @@
+# tests/test_services/test_media_storage.py
+
+import hashlib
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.core.config import settings
+from app.core.static import MediaFiles
+from app.models.ai_config import ImageConfig, ImageProvider
+from app.services import image_service as image_service_module
+from app.services.image_service import ImageService
+from app.utils.media_storage import media_path, store_stream
+
+IMAGE = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 64
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_ROOT", str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def media_client(media_root):
+    (media_root / "images").mkdir()
+    (media_root / "images" / "a.png").write_bytes(IMAGE)
+    app = Starlette(routes=[Mount("/media", MediaFiles(directory=str(media_root)))])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Route the downloads of persisted images to a fake provider."""
+    responses = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, content_type, body = responses[str(request.url)]
+        return httpx.Response(status, headers={"content-type": content_type}, content=body)
+
+    client = httpx.AsyncClient
+    monkeypatch.setattr(
+        image_service_module.httpx, "AsyncClient",
+        lambda **kwargs: client(transport=httpx.MockTransport(handler), **kwargs)
+    )
+    return responses
+
+def remote_result(url: str) -> dict:
+    return {"url": url, "metadata": {"provider": "fake"}}
+
+async def chunks(data: bytes, size: int = 1000):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+@pytest.mark.asyncio
+async def test_stored_media_is_cached_as_immutable(media_client):
+    async with media_client as client:
+        response = await client.get("/media/images/a.png")
+        revalidated = await client.get("/media/images/a.png", headers={"if-none-match": response.headers["etag"]})
+        missing = await client.get("/media/images/missing.png")
+
+    expected = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable"
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == expected
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == expected
+    assert missing.status_code == 404
+    assert "immutable" not in missing.headers.get("cache-control", "")
+
+@pytest.mark.asyncio
+async def test_stream_is_stored_under_its_content_address(media_root):
+    path = await store_stream(chunks(IMAGE), "png", "images/originals")
+
+    digest = hashlib.sha256(IMAGE).hexdigest()
+    assert path == f"images/originals/{digest[:2]}/{digest[2:4]}/{digest}.png"
+    with open(media_path(path), "rb") as f:
+        assert f.read() == IMAGE
+    assert list((media_root / "images" / "originals" / "tmp").iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_oversized_stream_leaves_nothing_behind(media_root):
+    with pytest.raises(ValueError):
+        await store_stream(chunks(IMAGE), "png", "images/originals", max_bytes=len(IMAGE) - 1)
+
+    assert [path.name for path in (media_root / "images" / "originals").iterdir()] == ["tmp"]
+    assert list((media_root / "images" / "originals" / "tmp").iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_provider_image_is_served_from_our_storage(media_root, provider):
+    provider["https://provider.example.com/a"] = (200, "image/png; charset=binary", IMAGE)
+    service = ImageService(ImageConfig(provider=ImageProvider.CUSTOM, api_key="key", endpoint_url="https://provider.example.com"))
+
+    result = await service._persist_remote_image(remote_result("https://provider.example.com/a"))
+
+    assert result["url"] == f"{settings.MEDIA_URL}/{result['storage_path']}"
+    assert result["storage_path"].endswith(".png")
+    assert result["metadata"] == {"provider": "fake", "source_url": "https://provider.example.com/a"}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status, content_type", [(404, "image/png"), (200, "text/html")])
+async def test_failed_download_keeps_the_provider_url(media_root, provider, status, content_type):
+    provider["https://provider.example.com/a"] = (status, content_type, IMAGE)
+    service = ImageService(ImageConfig(provider=ImageProvider.CUSTOM, api_key="key", endpoint_url="https://provider.example.com"))
+
+    result = await service._persist_remote_image(remote_result("https://provider.example.com/a"))
+
+    assert result["url"] == "https://provider.example.com/a"
+    assert "storage_path" not in result
+    assert result["metadata"]["persist_error"]
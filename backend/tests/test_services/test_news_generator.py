@@ -0,0 +1,185 @@
+# tests/test_services/test_news_generator.py
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, update
+
+from app.models.news import NewsArticle
+from app.models.prompt import PromptType
+from app.models.task import Task, TaskStatus, TaskType
+from app.services.source_aggregator import SourceAggregator
+from app.tasks.news_generator import NewsGenerator
+
+class FakeProcessor:
+    """Content processor committing a stub article per prompt.
+
+    ``on_process`` runs before each article is written, and may raise to fail
+    that prompt; ``after_commit`` runs once the article has committed.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.fetched = []
+        self.loaded = []
+        self.processed = []
+        self.on_process = None
+        self.after_commit = None
+
+    async def fetch_sources(self, prompt) -> list:
+        self.fetched.append(prompt.id)
+        return [{"title": f"Source of {prompt.name}", "content": "Long source text", "link": f"https://example.com/{prompt.id}"}]
+
+    async def load_sources(self, references: list) -> list:
+        self.loaded.append(references)
+        return [{**reference, "content": "Loaded again"} for reference in references]
+
+    async def process_prompt(self, prompt, task_id=None, articles=None, on_article=None) -> NewsArticle:
+        self.processed.append((prompt.id, articles))
+        if self.on_process:
+            await self.on_process(prompt)
+        article = NewsArticle(
+            title="Title", content="Content", slug=f"article-{uuid4().hex}", source_urls=[],
+            prompt_id=prompt.id, published_date=datetime.utcnow()
+        )
+        self.db.add(article)
+        await self.db.flush()
+        if on_article:
+            on_article(article)
+        await self.db.commit()
+        if self.after_commit:
+            await self.after_commit(prompt)
+        return article
+
+@pytest.fixture
+def generator(db) -> NewsGenerator:
+    generator = NewsGenerator(db)
+    generator.content_processor = FakeProcessor(db)
+    return generator
+
+@pytest_asyncio.fixture
+async def generation_task(db, make_prompt):
+    """A claimed generation task over two prompts."""
+    prompts = [await make_prompt(PromptType.PUBLIC), await make_prompt(PromptType.PUBLIC)]
+    task = Task(
+        name="Generation", type=TaskType.NEWS_GENERATION, status=TaskStatus.IN_PROGRESS, attempts=1,
+        parameters={}, checkpoint={
+            "prompt_ids": [str(prompt.id) for prompt in prompts], "done": {}, "failed": {}, "sources": {}
+        }
+    )
+    db.add(task)
+    await db.flush()
+    return task, prompts
+
+async def cancel(db, task: Task) -> None:
+    # Committed, as a cancel from the API would be
+    await db.execute(update(Task).where(Task.id == task.id).values(status=TaskStatus.CANCELLED))
+    await db.commit()
+
+@pytest.mark.asyncio
+async def test_run_completes_and_drops_its_checkpoint(generator, generation_task):
+    task, prompts = generation_task
+
+    await generator.run_generation_task(task)
+
+    assert task.status == TaskStatus.COMPLETED
+    assert task.checkpoint is None
+    assert task.result["successful_count"] == 2
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fails", [False, True])
+async def test_cancel_during_the_last_prompt_is_kept(db, generator, generation_task, fails):
+    task, prompts = generation_task
+
+    async def on_process(prompt):
+        if prompt.id == prompts[-1].id:
+            await cancel(db, task)
+            if fails:
+                raise RuntimeError("provider down")
+    generator.content_processor.on_process = on_process
+
+    await generator.run_generation_task(task)
+
+    assert task.status == TaskStatus.CANCELLED
+    assert task.result is None
+
+@pytest.mark.asyncio
+async def test_cancel_before_the_run_starts_is_kept(db, generator, generation_task):
+    task, _ = generation_task
+    await cancel(db, task)
+
+    await generator.run_generation_task(task)
+
+    assert task.status == TaskStatus.CANCELLED
+    assert generator.content_processor.processed == []
+
+@pytest.mark.asyncio
+async def test_article_failing_after_its_commit_is_not_written_again(db, generator, generation_task):
+    task, prompts = generation_task
+
+    async def after_commit(prompt):
+        raise RuntimeError("broadcast failed")
+    generator.content_processor.after_commit = after_commit
+
+    await generator.run_generation_task(task)
+    written = await db.scalar(
+        select(func.count()).select_from(NewsArticle).where(NewsArticle.prompt_id.in_([p.id for p in prompts]))
+    )
+
+    assert task.status == TaskStatus.COMPLETED
+    assert task.result["successful_count"] == 2
+    assert written == 2
+
+@pytest.mark.asyncio
+async def test_checkpoint_keeps_source_references_of_unfinished_prompts(db, generator, generation_task):
+    task, prompts = generation_task
+
+    async def on_process(prompt):
+        if prompt.id == prompts[-1].id:
+            raise RuntimeError("provider down")
+    generator.content_processor.on_process = on_process
+
+    await generator.run_generation_task(task)
+
+    assert task.status == TaskStatus.FAILED
+    assert set(task.checkpoint["done"]) == {str(prompts[0].id)}
+    assert task.checkpoint["sources"] == {
+        str(prompts[-1].id): [{"title": f"Source of {prompts[-1].name}", "link": f"https://example.com/{prompts[-1].id}"}]
+    }
+
+@pytest.mark.asyncio
+async def test_resumed_run_loads_the_checkpointed_sources(db, generator, generation_task):
+    task, prompts = generation_task
+    reference = {"title": "Kept", "link": "https://example.com/kept"}
+    task.checkpoint = {
+        **task.checkpoint,
+        "done": {str(prompts[0].id): str(uuid4())},
+        "sources": {str(prompts[1].id): [reference]}
+    }
+    await db.flush()
+
+    await generator.run_generation_task(task)
+    processor = generator.content_processor
+
+    assert processor.fetched == []
+    assert processor.loaded == [[reference]]
+    assert processor.processed == [(prompts[1].id, [{**reference, "content": "Loaded again"}])]
+    assert task.status == TaskStatus.COMPLETED
+
+@pytest.mark.asyncio
+async def test_source_reference_drops_the_content_and_loads_it_again(monkeypatch):
+    aggregator = SourceAggregator()
+
+    async def get_article_content(url, fallback_content):
+        return f"Content of {url}"
+    monkeypatch.setattr(aggregator.rss_processor, "_get_article_content", get_article_content)
+    article = {"title": "T", "content": "Long", "link": "https://example.com/a", "published": "2026-01-01", "source": "feed"}
+
+    reference = SourceAggregator.source_reference(article)
+    [loaded] = await aggregator.load_sources([reference])
+    await aggregator.rss_processor.close()
+
+    assert "content" not in reference
+    assert loaded == {**article, "content": "Content of https://example.com/a"}
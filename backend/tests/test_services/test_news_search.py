@@ -0,0 +1,90 @@
+# tests/test_services/test_news_search.py
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from app.models.prompt import PromptType
+from app.models.user import User
+from app.schemas.news import NewsFilter
+from app.services.news_search import NewsSearch
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+@pytest.fixture
+def term() -> str:
+    """A word only this test's articles contain."""
+    return f"zephyr{uuid4().hex[:10]}"
+
+@pytest_asyncio.fixture
+async def prompts(db, make_prompt):
+    """A prompt of each type, plus another user's private one."""
+    other = User(email=f"{uuid4().hex}@example.com", password="x")
+    db.add(other)
+    await db.flush()
+    return {
+        **{prompt_type: await make_prompt(prompt_type) for prompt_type in PromptType},
+        "other": await make_prompt(PromptType.PRIVATE, user_id=other.id)
+    }
+
+async def search_ids(db, term: str, user_id=None, **filters) -> set:
+    hits, _ = await NewsSearch(db).search(NewsFilter(search_term=term, **filters), user_id=user_id)
+    return {hit["id"] for hit in hits}
+
+@pytest.mark.asyncio
+async def test_anonymous_readers_only_find_public_articles(db, add_article, prompts, term):
+    articles = {
+        key: await add_article(prompt, NOW, title=f"Report on {term}")
+        for key, prompt in prompts.items()
+    }
+    owner_id = prompts[PromptType.PRIVATE].user_id
+
+    anonymous = await search_ids(db, term)
+    owner = await search_ids(db, term, user_id=owner_id)
+
+    assert anonymous == {articles[PromptType.PUBLIC].id}
+    assert owner == {articles[key].id for key in (PromptType.PUBLIC, PromptType.INTERNAL, PromptType.PRIVATE)}
+
+@pytest.mark.asyncio
+async def test_date_to_excludes_its_own_instant(db, add_article, prompts, term):
+    before = await add_article(prompts[PromptType.PUBLIC], NOW - timedelta(seconds=1), title=term)
+    await add_article(prompts[PromptType.PUBLIC], NOW, title=term)
+
+    assert await search_ids(db, term, date_to=NOW) == {before.id}
+    assert len(await search_ids(db, term, date_from=NOW - timedelta(seconds=1))) == 2
+
+@pytest.mark.asyncio
+async def test_prompt_types_narrow_the_visible_articles(db, add_article, prompts, term):
+    owner_id = prompts[PromptType.PRIVATE].user_id
+    internal = await add_article(prompts[PromptType.INTERNAL], NOW, title=term)
+    await add_article(prompts[PromptType.PUBLIC], NOW, title=term)
+    await add_article(prompts["other"], NOW, title=term)
+
+    assert await search_ids(db, term, user_id=owner_id, prompt_types=["internal"]) == {internal.id}
+    # A filter can't widen what the reader may see
+    assert await search_ids(db, term, prompt_types=["internal", "private"]) == set()
+
+@pytest.mark.asyncio
+async def test_pages_follow_the_rank_and_report_more(db, add_article, prompts, term):
+    prompt = prompts[PromptType.PUBLIC]
+    # More mentions rank higher; equal ranks go newest first
+    articles = [
+        await add_article(prompt, NOW - timedelta(hours=hours), title=term, content=" ".join([term] * mentions))
+        for hours, mentions in ((0, 1), (1, 5), (2, 3), (3, 1))
+    ]
+    search = NewsSearch(db)
+    filters = NewsFilter(search_term=term)
+
+    first, first_more = await search.search(filters, skip=0, limit=2)
+    second, second_more = await search.search(filters, skip=2, limit=2)
+    exact, exact_more = await search.search(filters, skip=0, limit=4)
+
+    assert [hit["id"] for hit in first + second] == [articles[i].id for i in (1, 2, 0, 3)]
+    assert first_more
+    assert not second_more
+    assert not exact_more
+    assert first[0]["rank"] >= first[1]["rank"]
+    assert f"<mark>{term}</mark>" in first[0]["headline"]
+    assert first[0]["prompt_type"] == PromptType.PUBLIC
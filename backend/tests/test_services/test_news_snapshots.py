@@ -0,0 +1,157 @@
+# tests/test_services/test_news_snapshots.py
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+import gzip
+import json
+
+import pytest
+
+from app.core.serialization import dumps
+from app.models.news import NewsSnapshot
+from app.models.prompt import PromptType
+from app.schemas.news import NewsDateResponse
+from app.services.news_snapshots import NewsSnapshots, load_items, render_news_day
+
+TODAY = datetime.utcnow().date()
+YESTERDAY = TODAY - timedelta(days=1)
+
+def snapshot_ids(snapshot) -> set:
+    return {item["id"] for item in load_items(snapshot.payload)}
+
+def noon(day) -> datetime:
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=12)
+
+@pytest.mark.asyncio
+async def test_build_holds_only_its_prompt_type(db, make_prompt, add_article):
+    public = await add_article(await make_prompt(PromptType.PUBLIC), noon(YESTERDAY))
+    private = await add_article(await make_prompt(PromptType.PRIVATE), noon(YESTERDAY))
+
+    snapshot = await NewsSnapshots(db).build(YESTERDAY, PromptType.PUBLIC)
+
+    assert snapshot.is_final
+    assert str(public.id) in snapshot_ids(snapshot)
+    assert str(private.id) not in snapshot_ids(snapshot)
+    assert public.prompt_id in snapshot.prompt_ids
+
+@pytest.mark.asyncio
+async def test_merge_adds_new_and_late_committed_articles(db, make_prompt, add_article):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    watermark = datetime.utcnow() + timedelta(hours=1)
+    first = await add_article(prompt, noon(TODAY), updated_at=watermark)
+    snapshots = NewsSnapshots(db)
+    built = await snapshots.build(TODAY, PromptType.PUBLIC)
+    assert not built.is_final
+
+    # Stamped before the watermark but only visible now, as if committed late
+    late = await add_article(prompt, noon(TODAY), updated_at=watermark - timedelta(seconds=30))
+    merged = (await snapshots.current(TODAY))[PromptType.PUBLIC]
+
+    assert {str(first.id), str(late.id)} <= snapshot_ids(merged)
+    assert merged.source_updated_at == watermark
+
+@pytest.mark.asyncio
+async def test_merge_without_changes_keeps_the_snapshot(db, make_prompt, add_article):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    await add_article(prompt, noon(TODAY), updated_at=datetime.utcnow() + timedelta(hours=1))
+    snapshots = NewsSnapshots(db)
+    built = await snapshots.build(TODAY, PromptType.PUBLIC)
+    built_at = built.updated_at
+
+    merged = (await snapshots.current(TODAY))[PromptType.PUBLIC]
+
+    assert merged.updated_at == built_at
+
+@pytest.mark.asyncio
+async def test_finalize_rebuilds_open_snapshots_of_closed_days(db, make_prompt, add_article):
+    article = await add_article(await make_prompt(PromptType.INTERNAL), noon(YESTERDAY))
+    snapshots = NewsSnapshots(db)
+    await snapshots._save(YESTERDAY, PromptType.INTERNAL, [], False)
+
+    finalized = await snapshots.finalize_closed_days(days=1)
+    snapshot = (await snapshots.load(YESTERDAY))[PromptType.INTERNAL]
+
+    assert f"{YESTERDAY}:{PromptType.INTERNAL.value}" in finalized
+    assert snapshot.is_final
+    assert str(article.id) in snapshot_ids(snapshot)
+
+@pytest.mark.asyncio
+async def test_prompt_made_public_shows_up_in_snapshots(db, make_prompt, add_article):
+    prompt = await make_prompt(PromptType.PRIVATE)
+    article = await add_article(prompt, noon(YESTERDAY))
+    snapshots = NewsSnapshots(db)
+    before = await snapshots.current(YESTERDAY)
+    assert str(article.id) not in snapshot_ids(before[PromptType.PUBLIC])
+
+    prompt.type = PromptType.PUBLIC
+    await db.flush()
+    assert await snapshots.invalidate_prompt(prompt.id, prompt.type) >= 1
+    after = await snapshots.current(YESTERDAY)
+
+    assert str(article.id) in snapshot_ids(after[PromptType.PUBLIC])
+
+def article_item(prompt_type: PromptType, published_date: datetime, **values) -> dict:
+    item = {
+        "id": uuid4(), "prompt_id": uuid4(), "published_date": published_date,
+        "slug": f"article-{uuid4().hex}", "title": "Title", "summary": "Summary",
+        "content": "Content", "source_urls": [], "image_url": None, "image_variants": None,
+        "ai_metadata": None, "created_at": published_date, "updated_at": published_date,
+        "prompt_type": prompt_type, "prompt_name": "Prompt"
+    }
+    item.update(values)
+    return item
+
+def stored_snapshot(prompt_type: PromptType, items: list, updated_at: datetime) -> NewsSnapshot:
+    return NewsSnapshot(
+        snapshot_date=YESTERDAY, prompt_type=prompt_type, payload=gzip.compress(dumps(items)),
+        article_count=len(items), updated_at=updated_at
+    )
+
+@pytest.fixture
+def day_snapshots():
+    public = [article_item(PromptType.PUBLIC, noon(YESTERDAY)), article_item(PromptType.PUBLIC, noon(YESTERDAY))]
+    internal = [article_item(PromptType.INTERNAL, noon(YESTERDAY))]
+    return {
+        PromptType.PUBLIC: stored_snapshot(PromptType.PUBLIC, public, noon(TODAY)),
+        PromptType.INTERNAL: stored_snapshot(PromptType.INTERNAL, internal, noon(YESTERDAY))
+    }
+
+def test_render_news_day_splices_snapshots(day_snapshots):
+    private = [article_item(PromptType.PRIVATE, noon(YESTERDAY), updated_at=noon(TODAY) + timedelta(hours=1))]
+
+    body = render_news_day(YESTERDAY, day_snapshots, private)
+    response = NewsDateResponse.model_validate_json(body)
+    data = json.loads(body)
+
+    assert len(response.public_news) == 2
+    assert len(response.internal_news) == 1
+    assert response.private_news[0].id == private[0]["id"]
+    assert response.total_count == 4
+    assert response.date == datetime.combine(YESTERDAY, datetime.min.time())
+    assert data["updated_at"] == (noon(TODAY) + timedelta(hours=1)).isoformat()
+
+def test_render_news_day_projects_snapshot_fields(day_snapshots):
+    fields = ("id", "prompt_id", "published_date", "title")
+    private = [{"id": str(uuid4()), "title": "Private", "prompt_type": "private", "prompt_name": "Mine"}]
+
+    data = json.loads(render_news_day(YESTERDAY, day_snapshots, private, fields))
+
+    for item in data["public_news"] + data["internal_news"]:
+        assert set(item) == set(fields) | {"prompt_type", "prompt_name"}
+    assert data["private_news"] == private
+    assert data["total_count"] == 4
+    assert data["updated_at"] == noon(TODAY).isoformat()
+
+@pytest.mark.asyncio
+async def test_drop_final_keeps_open_snapshots(db, make_prompt, add_article):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    await add_article(prompt, noon(YESTERDAY))
+    await add_article(prompt, noon(TODAY))
+    snapshots = NewsSnapshots(db)
+    await snapshots.build(YESTERDAY, PromptType.PUBLIC)
+    await snapshots.build(TODAY, PromptType.PUBLIC)
+
+    assert await snapshots.drop_final(YESTERDAY, PromptType.PUBLIC) == 1
+    assert await snapshots.drop_final(TODAY, PromptType.PUBLIC) == 0
+    assert PromptType.PUBLIC not in await snapshots.load(YESTERDAY)
+    assert PromptType.PUBLIC in await snapshots.load(TODAY)
@@ -0,0 +1,83 @@
+# tests/test_services/test_pagination.py
+
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.news import NewsArticle
+from app.utils.pagination import Keyset
+
+def news_keyset() -> Keyset:
+    return Keyset(NewsArticle.published_date, NewsArticle.id)
+
+def compiled(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+def token(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+def test_cursor_round_trip():
+    keyset = news_keyset()
+    item = SimpleNamespace(published_date=datetime(2026, 3, 14, 15, 9, 26, 535), id=uuid4())
+
+    cursor = keyset.encode(item)
+
+    assert "=" not in cursor
+    assert keyset.decode(cursor) == [item.published_date, item.id]
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    token(["2026-03-14T15:09:26"]),                   # too few values
+    token(["2026-03-14T15:09:26", str(uuid4()), 1]),  # too many values
+    token(["yesterday", str(uuid4())]),               # not a timestamp
+    token(["2026-03-14T15:09:26", "not-a-uuid"]),
+    token({"published_date": "2026-03-14T15:09:26"}),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        news_keyset().decode(cursor)
+    assert error.value.status_code == 400
+
+def test_page_returns_cursor_only_when_more_rows():
+    keyset = news_keyset()
+    rows = [SimpleNamespace(published_date=datetime(2026, 3, day), id=uuid4()) for day in (5, 4, 3)]
+
+    page, cursor = keyset.page(rows, limit=2)
+    assert page == rows[:2]
+    assert keyset.decode(cursor) == [rows[1].published_date, rows[1].id]
+
+    assert keyset.page(rows[:2], limit=2) == (rows[:2], None)
+
+def test_skip_pages_with_offset_without_cursor():
+    sql = compiled(news_keyset().apply(select(NewsArticle.id), None, limit=10, skip=30))
+
+    assert "ORDER BY news_articles.published_date DESC, news_articles.id DESC" in sql
+    assert "LIMIT 11" in sql
+    assert "OFFSET 30" in sql
+
+def test_cursor_overrides_skip():
+    keyset = news_keyset()
+    cursor = keyset.encode(SimpleNamespace(published_date=datetime(2026, 3, 14), id=uuid4()))
+
+    sql = compiled(keyset.apply(select(NewsArticle.id), cursor, limit=10, skip=30))
+
+    assert "OFFSET" not in sql
+    assert "(news_articles.published_date, news_articles.id) < (" in sql
+    assert "news_articles.published_date <= '2026-03-14 00:00:00'" in sql
+
+def test_ascending_cursor_bounds_from_below():
+    keyset = Keyset(NewsArticle.published_date, NewsArticle.id, descending=False)
+    cursor = keyset.encode(SimpleNamespace(published_date=datetime(2026, 3, 14), id=uuid4()))
+
+    sql = compiled(keyset.apply(select(NewsArticle.id), cursor, limit=10))
+
+    assert "(news_articles.published_date, news_articles.id) > (" in sql
+    assert "news_articles.published_date >= '2026-03-14 00:00:00'" in sql
@@ -0,0 +1,102 @@
+# tests/test_services/test_partitions.py
+
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models.news import NewsArticleArchive
+from app.models.prompt import PromptType
+from app.services.news_archive import add_months, decode_article, encode_article, month_start
+from app.tasks.partitions import DEFAULT_PARTITION, NewsPartitionManager, partition_name
+
+# Long before any partition the migration creates
+OLD_MONTH = date(2001, 1, 1)
+
+async def table_of(db, article) -> str:
+    return await db.scalar(
+        text("SELECT tableoid::regclass::text FROM news_articles WHERE id = :id"), {"id": article.id}
+    )
+
+async def table_exists(db, name: str) -> bool:
+    return await db.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+
+@pytest.mark.asyncio
+async def test_new_partition_takes_its_rows_from_the_default_partition(db, make_prompt, add_article):
+    article = await add_article(await make_prompt(PromptType.PUBLIC), datetime(2001, 1, 15, 12))
+    assert await table_of(db, article) == DEFAULT_PARTITION
+
+    await NewsPartitionManager(db)._create_partition(OLD_MONTH)
+
+    assert OLD_MONTH in await NewsPartitionManager(db).list_partitions()
+    assert await table_of(db, article) == partition_name(OLD_MONTH)
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_missing_upcoming_months(db):
+    manager = NewsPartitionManager(db)
+    this_month = month_start(datetime.utcnow().date())
+    existing = set(await manager.list_partitions())
+
+    created = await manager.ensure_partitions(months_ahead=6)
+
+    months = [add_months(this_month, offset) for offset in range(7)]
+    assert created == [partition_name(month) for month in months if month not in existing]
+    assert set(months) <= set(await manager.list_partitions())
+    assert await manager.ensure_partitions(months_ahead=6) == []
+
+@pytest.mark.asyncio
+async def test_archive_month_moves_rows_in_batches_and_drops_the_partition(db, make_prompt, add_article):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    manager = NewsPartitionManager(db, batch_size=1)
+    await manager._create_partition(OLD_MONTH)
+    articles = [
+        await add_article(prompt, datetime(2001, 1, day, 8), title=f"Day {day}", ai_metadata={"day": day})
+        for day in (3, 17)
+    ]
+
+    archived = await manager.archive_month(OLD_MONTH)
+    rows = (await db.scalars(
+        select(NewsArticleArchive).where(NewsArticleArchive.id.in_([a.id for a in articles]))
+    )).all()
+
+    assert archived == 2
+    assert not await table_exists(db, partition_name(OLD_MONTH))
+    assert OLD_MONTH not in await manager.list_partitions()
+    restored = {row.id: decode_article(row.payload) for row in rows}
+    for article in articles:
+        assert restored[article.id]["title"] == article.title
+        assert restored[article.id]["published_date"] == article.published_date
+        assert restored[article.id]["ai_metadata"] == article.ai_metadata
+        assert "search_vector" not in restored[article.id]
+
+@pytest.mark.asyncio
+async def test_detached_month_is_archived_by_the_next_run(db, make_prompt, add_article):
+    manager = NewsPartitionManager(db)
+    await manager._create_partition(OLD_MONTH)
+    article = await add_article(await make_prompt(PromptType.PUBLIC), datetime(2001, 1, 9))
+    # A run that stopped right after detaching
+    await manager._detach(partition_name(OLD_MONTH))
+    assert OLD_MONTH in await manager.list_detached()
+    assert OLD_MONTH not in await manager.list_partitions()
+
+    report = await manager.archive_old_partitions()
+
+    assert report[partition_name(OLD_MONTH)]["rows_archived"] == 1
+    assert await db.get(NewsArticleArchive, article.id) is not None
+    assert OLD_MONTH not in await manager.list_detached()
+
+def test_archived_article_round_trip():
+    row = {
+        "id": uuid4(), "title": "Title", "content": "Content " * 200, "slug": "title",
+        "summary": None, "source_urls": ["https://example.com/a"], "image_url": None,
+        "image_variants": {"webp": {"480": "/media/a-480.webp"}}, "ai_metadata": {"model": "m"},
+        "prompt_id": uuid4(), "published_date": datetime(2001, 1, 9, 10, 30, 15, 250),
+        "created_at": datetime(2001, 1, 9, 10, 30), "updated_at": None
+    }
+
+    payload = encode_article(row)
+    restored = decode_article(payload)
+
+    assert len(payload) < len(row["content"])
+    assert restored == {**row, "id": str(row["id"]), "prompt_id": str(row["prompt_id"])}
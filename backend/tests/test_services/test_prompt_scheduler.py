@@ -0,0 +1,121 @@
+# tests/test_services/test_prompt_scheduler.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.models.prompt import Prompt, PromptType
+from app.models.task import Task, TaskStatus, TaskType
+from app.schemas.prompt import PromptUpdate
+from app.tasks import prompt_scheduler as scheduler_module
+from app.tasks.prompt_scheduler import PromptScheduler
+
+@pytest.fixture
+def scheduler(use_test_session) -> PromptScheduler:
+    use_test_session(scheduler_module)
+    return PromptScheduler()
+
+async def queued_runs(db, prompt: Prompt) -> list:
+    return (await db.scalars(
+        select(Task).where(Task.parameters['prompt_id'].as_string() == str(prompt.id))
+    )).all()
+
+def heap_of(scheduler: PromptScheduler, prompts: list) -> list:
+    ids = {prompt.id for prompt in prompts}
+    return [entry[2] for entry in sorted(scheduler.heap) if entry[2] in ids]
+
+@pytest.mark.asyncio
+async def test_refresh_orders_prompts_by_due_time_then_priority(scheduler, make_prompt):
+    due = datetime.utcnow() - timedelta(minutes=1)
+    late = await make_prompt(PromptType.PUBLIC, next_run_at=due + timedelta(seconds=30))
+    low = await make_prompt(PromptType.PUBLIC, next_run_at=due, priority=0)
+    high = await make_prompt(PromptType.PUBLIC, next_run_at=due, priority=5)
+    await make_prompt(PromptType.PUBLIC, next_run_at=due, is_active=False)
+
+    await scheduler.refresh()
+
+    assert heap_of(scheduler, [late, low, high]) == [high.id, low.id, late.id]
+
+@pytest.mark.asyncio
+async def test_refresh_schedules_new_prompts_within_one_period(db, scheduler, make_prompt):
+    before = datetime.utcnow()
+    prompt = await make_prompt(PromptType.PUBLIC, schedule_interval=600)
+
+    await scheduler.refresh()
+    await db.refresh(prompt)
+
+    assert before <= prompt.next_run_at <= before + timedelta(seconds=601)
+    assert heap_of(scheduler, [prompt]) == [prompt.id]
+
+@pytest.mark.asyncio
+async def test_due_prompt_is_queued_and_rescheduled(db, scheduler, make_prompt):
+    due = datetime.utcnow() - timedelta(seconds=5)
+    prompt = await make_prompt(PromptType.PUBLIC, next_run_at=due, schedule_interval=600)
+    await scheduler.refresh()
+
+    await scheduler.dispatch_due()
+    await db.refresh(prompt)
+    [run] = await queued_runs(db, prompt)
+
+    assert run.type == TaskType.NEWS_GENERATION
+    assert run.status == TaskStatus.PENDING
+    assert run.scheduled_at == due
+    jitter = 600 * settings.PROMPT_SCHEDULE_JITTER
+    assert prompt.next_run_at - datetime.utcnow() >= timedelta(seconds=600 - jitter - 5)
+    assert (prompt.next_run_at, prompt.id) in [(entry[0], entry[2]) for entry in scheduler.heap]
+
+@pytest.mark.asyncio
+async def test_run_dispatched_by_another_node_is_not_queued_again(db, scheduler, make_prompt):
+    due = datetime.utcnow() - timedelta(seconds=5)
+    prompt = await make_prompt(PromptType.PUBLIC, next_run_at=due)
+    await scheduler.refresh()
+    # The other node's compare-and-set moved next_run_at first
+    moved = due + timedelta(hours=1)
+    await db.execute(update(Prompt).where(Prompt.id == prompt.id).values(next_run_at=moved))
+
+    await scheduler.dispatch_due()
+    await db.refresh(prompt)
+
+    assert await queued_runs(db, prompt) == []
+    assert prompt.next_run_at == moved
+    assert prompt.id not in heap_of(scheduler, [prompt])
+
+@pytest.mark.asyncio
+async def test_run_is_skipped_while_the_previous_one_is_queued(db, scheduler, make_prompt):
+    due = datetime.utcnow() - timedelta(seconds=5)
+    prompt = await make_prompt(PromptType.PUBLIC, next_run_at=due)
+    previous = Task(
+        name="Previous run", type=TaskType.NEWS_GENERATION, status=TaskStatus.IN_PROGRESS,
+        parameters={"prompt_id": str(prompt.id)}
+    )
+    db.add(previous)
+    await db.flush()
+    await scheduler.refresh()
+
+    await scheduler.dispatch_due()
+    await db.refresh(prompt)
+
+    assert [run.id for run in await queued_runs(db, prompt)] == [previous.id]
+    assert prompt.next_run_at > due
+
+@pytest.mark.asyncio
+async def test_deactivated_prompt_leaves_the_heap(db, scheduler, make_prompt):
+    prompt = await make_prompt(PromptType.PUBLIC, next_run_at=datetime.utcnow() - timedelta(seconds=5))
+    await scheduler.refresh()
+    prompt.is_active = False
+    await db.flush()
+
+    await scheduler.dispatch_due()
+
+    assert await queued_runs(db, prompt) == []
+    assert heap_of(scheduler, [prompt]) == []
+
+def test_update_rejects_a_null_priority():
+    with pytest.raises(ValidationError):
+        PromptUpdate(priority=None)
+
+    assert "priority" not in PromptUpdate(name="renamed").model_dump(exclude_unset=True)
+    assert PromptUpdate(priority=3).priority == 3
@@ -0,0 +1,28 @@
+# tests/test_services/test_query_plans.py
+
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+from sqlalchemy import text
+
+from app.services.news_queries import public_news_query, news_for_day_query, user_news_query
+from app.utils.query_plans import explain, seq_scans
+
+TODAY = datetime.utcnow().date()
+USER_ID = UUID(int=0)
+
+READ_PATHS = [
+    ("public news", public_news_query().limit(20)),
+    ("public news by day", public_news_query(TODAY)),
+    ("news for day", news_for_day_query(TODAY, USER_ID)),
+    ("user news", user_news_query(USER_ID).limit(20)),
+]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, query", READ_PATHS, ids=[name for name, _ in READ_PATHS])
+async def test_read_path_is_planned_on_indexes(db, name, query):
+    # With sequential scans disabled the planner only falls back to one
+    # when no usable index exists, however small the tables are
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    assert seq_scans(await explain(db, query)) == []
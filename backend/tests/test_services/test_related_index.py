@@ -0,0 +1,91 @@
+# tests/test_services/test_related_index.py
+
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import delete
+
+from app.models.news import NewsArticle
+from app.models.prompt import PromptType
+from app.services.news_embeddings import HashingEmbedder, RelatedIndex
+
+VOCABULARY = [f"term{n}" for n in range(400)]
+
+def make_index(path, **values) -> RelatedIndex:
+    index = RelatedIndex(path=str(path), **values)
+    index._embedder = HashingEmbedder(64)
+    return index
+
+def story(rng, words: int = 40) -> str:
+    return " ".join(rng.choice(VOCABULARY, size=words))
+
+def make_article(title: str, content: str):
+    return SimpleNamespace(id=uuid4(), title=title, summary=None, content=content)
+
+@pytest.mark.asyncio
+async def test_rows_appended_during_a_rebuild_are_carried_over(db, make_prompt, add_article, tmp_path):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    rebuilt = await add_article(prompt, datetime.utcnow(), title="Harbour storm", content="storm floods the harbour")
+    writer = make_index(tmp_path)
+    # Another process adding an article while this one rebuilds
+    other = make_index(tmp_path)
+    await writer.rebuild(db)
+    appended = make_article("Harbour storm returns", "second storm floods the harbour")
+
+    corpus = writer._corpus
+
+    async def corpus_then_append(*args):
+        async for batch in corpus(*args):
+            yield batch
+        assert await other.add([appended]) == 1
+    writer._corpus = corpus_then_append
+    report = await writer.rebuild(db)
+    reader = make_index(tmp_path)
+
+    assert report["generation"] == 2
+    assert not (tmp_path / "vectors-1.bin").exists()
+    assert [article_id for article_id, _ in await reader.related(rebuilt)] == [appended.id]
+    assert [article_id for article_id, _ in await reader.related(appended)] == [rebuilt.id]
+
+@pytest.mark.asyncio
+async def test_reader_follows_the_switch_to_a_new_generation(db, make_prompt, add_article, tmp_path):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    kept = await add_article(prompt, datetime.utcnow(), title="Election results", content="votes counted in the election")
+    similar = await add_article(prompt, datetime.utcnow(), title="Election recount", content="votes counted again in the election")
+    removed = await add_article(prompt, datetime.utcnow(), title="Election turnout", content="record election votes")
+    writer = make_index(tmp_path)
+    reader = make_index(tmp_path)
+    await writer.rebuild(db)
+    assert {article_id for article_id, _ in await reader.related(kept)} == {similar.id, removed.id}
+
+    await db.execute(delete(NewsArticle).where(NewsArticle.id == removed.id))
+    await writer.rebuild(db)
+
+    assert [article_id for article_id, _ in await reader.related(kept)] == [similar.id]
+    assert reader._meta["generation"] == 2
+    assert reader.count == writer.count
+
+@pytest.mark.asyncio
+async def test_lsh_lookup_finds_the_exact_nearest_neighbours(tmp_path):
+    rng = np.random.default_rng(7)
+    query = make_article("Query", story(rng))
+    # Near duplicates of the query among unrelated articles
+    neighbours = [make_article("Query", " ".join([query.content] * 3 + [story(rng, 10)])) for _ in range(3)]
+    articles = [query] + neighbours + [make_article("Other", story(rng)) for _ in range(400)]
+    exact = make_index(tmp_path / "exact")
+    lsh = make_index(tmp_path / "lsh", lsh_tables=4, lsh_bits=8, exact_max_rows=0)
+    lsh.REINDEX_AFTER = 0
+    await exact.add(articles)
+    await lsh.add(articles)
+    await lsh._reindexing
+
+    exact_results = await exact.related(query, limit=3)
+    lsh_results = await lsh.related(query, limit=3)
+
+    assert lsh.sorted_codes
+    assert len(lsh._candidates(lsh.matrix[lsh.row_of[query.id.bytes]], 3)) < lsh.count
+    assert {article_id for article_id, _ in exact_results} == {article.id for article in neighbours}
+    assert lsh_results == exact_results
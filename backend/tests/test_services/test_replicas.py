@@ -0,0 +1,49 @@
+# tests/test_services/test_replicas.py
+
+import time
+
+import pytest
+import pytest_asyncio
+
+from app.core.database import make_engine
+from app.core.replicas import ReplicaRouter
+
+@pytest_asyncio.fixture
+async def router(database_url):
+    # The test database stands in for both the primary and its replica
+    primary = make_engine(database_url, name="test-primary")
+    router = ReplicaRouter(urls=[database_url], max_lag=2.0, check_interval=5, primary=primary)
+    try:
+        yield router
+    finally:
+        await router.close()
+        await primary.dispose()
+
+@pytest.mark.asyncio
+async def test_checked_replica_is_picked(router):
+    await router.check()
+    replica = router.replicas[0]
+
+    assert replica.error is None
+    assert replica.lag == 0
+    assert router.pick() is replica.engine
+
+@pytest.mark.asyncio
+async def test_stale_reading_falls_back_to_primary(router):
+    await router.check()
+    replica = router.replicas[0]
+    replica.checked_at = time.time() - router.STALE_CHECKS * router.check_interval - 1
+    router._checked_at = time.monotonic()  # keep pick from scheduling a fresh check
+
+    assert router.pick() is None
+    assert router.metrics()["replicas"][replica.name]["current"] is False
+
+@pytest.mark.asyncio
+async def test_unreachable_primary_leaves_readings_to_go_stale(router):
+    await router.primary.dispose()
+    router.primary = make_engine("postgresql+asyncpg://nobody@/missing?host=/nonexistent", name="test-missing")
+
+    await router.check()
+
+    assert router.replicas[0].checked_at is None
+    assert router.pick() is None
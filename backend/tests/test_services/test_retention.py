@@ -0,0 +1,110 @@
+# tests/test_services/test_retention.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.news import NewsArticle, NewsImage, NewsSnapshot
+from app.models.prompt import PromptType
+from app.models.stats import SystemStats
+from app.models.task import Task, TaskStatus, TaskType
+from app.tasks.retention import RetentionManager
+
+DAYS = 30
+# Clear of the cutoff, which moves with the clock while a purge runs
+MARGIN = timedelta(minutes=5)
+
+def days_ago(days: int, offset: timedelta = timedelta()) -> datetime:
+    return datetime.utcnow() - timedelta(days=days) + offset
+
+async def remaining(db, model, rows: list) -> set:
+    return set((await db.scalars(
+        select(model.id).where(model.id.in_([row.id for row in rows]))
+    )).all())
+
+async def add_task(db, status: TaskStatus, completed_at) -> Task:
+    task = Task(
+        name="Finished", type=TaskType.SYSTEM_MAINTENANCE, status=status,
+        parameters={}, completed_at=completed_at
+    )
+    db.add(task)
+    await db.flush()
+    return task
+
+@pytest.mark.asyncio
+async def test_articles_past_the_cutoff_go_with_their_images(db, make_prompt, add_article):
+    prompt = await make_prompt(PromptType.PUBLIC)
+    expired = await add_article(prompt, days_ago(5), created_at=days_ago(DAYS, -MARGIN))
+    kept = await add_article(prompt, days_ago(40), created_at=days_ago(DAYS, MARGIN))
+    images = [
+        NewsImage(news_article_id=article.id, image_prompt="p", provider="fake", storage_path="/media/a.png")
+        for article in (expired, kept)
+    ]
+    db.add_all(images)
+    await db.flush()
+
+    await RetentionManager(db).purge_articles(DAYS)
+
+    # Judged by when the article was written, not its published date
+    assert await remaining(db, NewsArticle, [expired, kept]) == {kept.id}
+    assert await remaining(db, NewsImage, images) == {images[1].id}
+
+@pytest.mark.asyncio
+async def test_snapshots_of_the_cutoff_day_are_kept(db):
+    cutoff = datetime.utcnow().date() - timedelta(days=DAYS)
+    snapshots = [
+        NewsSnapshot(snapshot_date=day, prompt_type=PromptType.PUBLIC, payload=b"", article_count=0, prompt_ids=[])
+        for day in (cutoff - timedelta(days=1), cutoff)
+    ]
+    db.add_all(snapshots)
+    await db.flush()
+
+    await RetentionManager(db).purge_snapshots(DAYS)
+
+    assert await remaining(db, NewsSnapshot, snapshots) == {snapshots[1].id}
+
+@pytest.mark.asyncio
+async def test_only_finished_tasks_past_the_cutoff_are_deleted(db):
+    expired = [
+        await add_task(db, status, days_ago(DAYS, -MARGIN))
+        for status in (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+    ]
+    recent = await add_task(db, TaskStatus.COMPLETED, days_ago(DAYS, MARGIN))
+    # Unfinished work stays however old it is
+    pending = await add_task(db, TaskStatus.PENDING, days_ago(90))
+    running = await add_task(db, TaskStatus.IN_PROGRESS, days_ago(90))
+    never_completed = await add_task(db, TaskStatus.FAILED, None)
+
+    await RetentionManager(db).purge_tasks(DAYS)
+
+    kept = [recent, pending, running, never_completed]
+    assert await remaining(db, Task, expired + kept) == {task.id for task in kept}
+
+@pytest.mark.asyncio
+async def test_purge_removes_every_batch(db):
+    stats = [SystemStats(timestamp=days_ago(DAYS + day)) for day in range(1, 6)]
+    recent = SystemStats(timestamp=days_ago(DAYS, MARGIN))
+    db.add_all(stats + [recent])
+    await db.flush()
+
+    removed = await RetentionManager(db, batch_size=2).purge_system_stats(DAYS)
+
+    assert removed >= len(stats)
+    assert await remaining(db, SystemStats, stats + [recent]) == {recent.id}
+
+@pytest.mark.asyncio
+async def test_run_skips_policies_kept_forever(db, monkeypatch):
+    monkeypatch.setattr(settings, "TASK_RETENTION_DAYS", DAYS)
+    monkeypatch.setattr(settings, "MONITORING_RETENTION_DAYS", 0)
+    monkeypatch.setattr(settings, "ARTICLE_RETENTION_DAYS", 0)
+    stats = SystemStats(timestamp=days_ago(365))
+    db.add(stats)
+    await db.flush()
+
+    report = await RetentionManager(db).run()
+
+    assert set(report) == {"tasks", "duration"}
+    assert report["tasks"]["retention_days"] == DAYS
+    assert await remaining(db, SystemStats, [stats]) == {stats.id}
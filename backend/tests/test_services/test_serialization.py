@@ -0,0 +1,83 @@
+# tests/test_services/test_serialization.py
+
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+import json
+
+import pytest
+from fastapi.responses import ORJSONResponse
+
+from app.core import serialization as serialization_module
+from app.core.serialization import ARTICLE_FIELDS, DefaultResponse, article_data, dumps
+from app.main import app
+from app.models.news import NewsArticle
+from app.models.prompt import PromptType
+from app.schemas.news import NewsArticleCard, NewsArticleResponse
+
+PROMPT = SimpleNamespace(type=PromptType.PUBLIC, name="World news")
+
+def make_article(**values) -> NewsArticle:
+    return NewsArticle(**{
+        "id": uuid4(),
+        "prompt_id": uuid4(),
+        "published_date": datetime(2026, 3, 4, 5, 6, 7, 890),
+        "slug": "storm-over-the-harbour",
+        "title": "Storm over the harbour",
+        "summary": None,
+        "content": 'Gusts of "100 km/h" — and more',
+        "source_urls": ["https://example.com/a"],
+        "image_url": "/media/images/a.webp",
+        "image_variants": {"webp": {"320w": "/media/images/a-320.webp"}},
+        "ai_metadata": {"model": "m", "tokens": 120},
+        "created_at": datetime(2026, 3, 4, 5, 6, 8),
+        "updated_at": datetime(2026, 3, 4, 5, 6, 9),
+        **values
+    })
+
+def schema_json(article: NewsArticle) -> dict:
+    return json.loads(NewsArticleResponse.model_validate({
+        **{name: getattr(article, name) for name in ARTICLE_FIELDS},
+        "prompt_type": PROMPT.type.value,
+        "prompt_name": PROMPT.name
+    }).model_dump_json())
+
+def test_article_bytes_match_the_response_schema():
+    article = make_article()
+
+    assert json.loads(dumps(article_data(article, PROMPT))) == schema_json(article)
+
+def test_stdlib_fallback_encodes_the_same_document(monkeypatch):
+    article = make_article()
+    encoded = dumps(article_data(article, PROMPT))
+    monkeypatch.setattr(serialization_module, "orjson", None)
+
+    fallback = dumps(article_data(article, PROMPT))
+
+    assert json.loads(fallback) == json.loads(encoded)
+    assert b", " not in fallback and b'": ' not in fallback
+
+def test_archived_row_dict_encodes_like_the_row():
+    article = make_article()
+    archived = {
+        **{name: getattr(article, name) for name in ARTICLE_FIELDS},
+        # Archive payloads hand ids back as strings
+        "id": str(article.id), "prompt_id": str(article.prompt_id)
+    }
+
+    assert dumps(article_data(archived, PROMPT)) == dumps(article_data(article, PROMPT))
+
+def test_card_holds_only_the_requested_fields():
+    article = make_article()
+    fields = ("id", "prompt_id", "published_date", "title")
+
+    card = json.loads(dumps(article_data(article, fields=fields)))
+
+    assert list(card) == list(fields)
+    expected = NewsArticleCard.model_validate(article, from_attributes=True).model_dump(mode="json", include=set(fields))
+    assert card == expected
+
+@pytest.mark.skipif(serialization_module.orjson is None, reason="orjson is not installed")
+def test_app_responds_with_orjson_by_default():
+    assert DefaultResponse is ORJSONResponse
+    assert app.router.default_response_class is ORJSONResponse
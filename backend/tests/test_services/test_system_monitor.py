@@ -0,0 +1,35 @@
+# tests/test_services/test_system_monitor.py
+
+from datetime import timedelta
+
+import pytest
+
+from app.tasks import system_monitor
+from app.tasks.system_monitor import SystemMonitor
+
+@pytest.fixture(autouse=True)
+def instant_cpu_sample(monkeypatch):
+    # psutil samples the CPU for a second otherwise
+    monkeypatch.setattr(system_monitor.psutil, "cpu_percent", lambda interval=None: 12.5)
+
+@pytest.mark.asyncio
+async def test_metrics_are_stored_once_per_interval(db):
+    monitor = SystemMonitor(db)
+
+    stored = await monitor.collect_metrics(interval=60)
+    assert stored.detailed_metrics["cpu_usage"] == 12.5
+    assert stored.memory_usage == stored.detailed_metrics["memory_usage"]
+
+    assert await monitor.collect_metrics(interval=60) is None
+
+@pytest.mark.asyncio
+async def test_metrics_are_stored_again_after_the_interval(db):
+    monitor = SystemMonitor(db)
+    first = await monitor.collect_metrics(interval=60)
+    first.timestamp -= timedelta(seconds=60)
+    await db.commit()
+
+    second = await monitor.collect_metrics(interval=60)
+
+    assert second is not None
+    assert second.id != first.id
@@ -0,0 +1,189 @@
+# tests/test_services/test_task_worker.py
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.models.task import Task, TaskStatus, TaskType
+from app.tasks import worker as worker_module
+from app.tasks.worker import TaskWorker
+
+@pytest_asyncio.fixture
+async def worker(db, use_test_session):
+    # Only this test's tasks are claimable
+    await db.execute(delete(Task))
+    use_test_session(worker_module)
+    return TaskWorker(worker_id="test-worker", lease_seconds=120, listen=False)
+
+@pytest_asyncio.fixture
+async def add_task(db):
+    async def add(**values) -> Task:
+        task = Task(**{
+            "name": f"task-{uuid4().hex[:8]}",
+            "type": TaskType.SYSTEM_MAINTENANCE,
+            "status": TaskStatus.PENDING,
+            "parameters": {},
+            "scheduled_at": datetime.utcnow() - timedelta(seconds=1),
+            **values
+        })
+        db.add(task)
+        await db.flush()
+        return task
+    return add
+
+@pytest.mark.asyncio
+async def test_claim_leases_a_due_task(db, worker, add_task):
+    task = await add_task()
+
+    assert await worker.claim() == task.id
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.IN_PROGRESS
+    assert task.locked_by == "test-worker"
+    assert task.locked_until > datetime.utcnow() + timedelta(seconds=110)
+    assert task.attempts == 1
+    assert task.started_at is not None
+
+@pytest.mark.asyncio
+async def test_claim_skips_future_tasks_and_live_leases(worker, add_task):
+    await add_task(scheduled_at=datetime.utcnow() + timedelta(minutes=5))
+    await add_task(
+        status=TaskStatus.IN_PROGRESS, attempts=1, locked_by="other",
+        locked_until=datetime.utcnow() + timedelta(minutes=1)
+    )
+
+    assert await worker.claim() is None
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(db, worker, add_task):
+    task = await add_task(
+        status=TaskStatus.IN_PROGRESS, attempts=1, locked_by="dead-worker",
+        locked_until=datetime.utcnow() - timedelta(seconds=1)
+    )
+
+    assert await worker.claim() == task.id
+    await db.refresh(task)
+
+    assert task.locked_by == "test-worker"
+    assert task.attempts == 2
+
+@pytest.mark.asyncio
+async def test_task_killing_its_workers_is_abandoned(db, worker, add_task):
+    task = await add_task(
+        status=TaskStatus.IN_PROGRESS, attempts=settings.MAX_TASK_RETRIES + 1, locked_by="dead-worker",
+        locked_until=datetime.utcnow() - timedelta(seconds=1)
+    )
+
+    assert await worker.claim() is None
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.FAILED
+    assert task.locked_by is None
+    assert "Abandoned" in task.error_message
+
+@pytest.mark.asyncio
+async def test_claiming_a_recurring_task_queues_its_next_run(db, worker, add_task):
+    task = await add_task(is_recurring=True, cron_expression="0 * * * *")
+
+    await worker.claim()
+    next_runs = (await db.scalars(
+        select(Task).where(Task.name == task.name, Task.id != task.id)
+    )).all()
+
+    assert len(next_runs) == 1
+    assert next_runs[0].status == TaskStatus.PENDING
+    assert next_runs[0].scheduled_at > datetime.utcnow()
+    assert next_runs[0].scheduled_at.minute == 0
+
+@pytest.mark.asyncio
+async def test_failed_run_is_retried_with_backoff(db, worker, add_task):
+    task = await add_task()
+    await worker.claim()
+
+    before = datetime.utcnow()
+    await worker._finish(task.id, "boom")
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.PENDING
+    assert task.error_message == "Attempt 1 failed: boom"
+    assert task.locked_by is None and task.locked_until is None
+    delay = (task.scheduled_at - before).total_seconds()
+    assert settings.TASK_RETRY_BACKOFF <= delay <= settings.TASK_RETRY_BACKOFF * 1.25 + 1
+
+@pytest.mark.asyncio
+async def test_last_failed_attempt_stays_failed(db, worker, add_task):
+    task = await add_task(attempts=settings.MAX_TASK_RETRIES)
+    await worker.claim()
+
+    await worker._finish(task.id, "boom")
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.FAILED
+    assert task.error_message == "boom"
+
+@pytest.mark.asyncio
+async def test_cancelled_run_failing_on_its_way_out_stays_cancelled(db, worker, add_task):
+    task = await add_task()
+    await worker.claim()
+    task.update_status(TaskStatus.CANCELLED)
+    await db.flush()
+
+    await worker._finish(task.id, "interrupted")
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.CANCELLED
+    assert task.locked_by is None
+
+@pytest.mark.asyncio
+async def test_run_past_its_deadline_is_stopped_and_retried(db, worker, add_task, monkeypatch):
+    class SlowScheduler:
+        def __init__(self, db):
+            pass
+
+        async def run_task(self, task):
+            await asyncio.sleep(10)
+    monkeypatch.setattr(worker_module, "TaskScheduler", SlowScheduler)
+    task = await add_task(parameters={"timeout": 0.05})
+    await worker.claim()
+
+    await worker.execute(task.id)
+    await db.refresh(task)
+
+    assert task.status == TaskStatus.PENDING
+    assert "deadline" in task.error_message
+
+@pytest.mark.asyncio
+async def test_claim_skips_tasks_locked_by_other_workers(database_url, monkeypatch):
+    # Needs committed rows and a second connection holding a row lock
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    monkeypatch.setattr(worker_module, "async_session", async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    old = datetime(2000, 1, 1)
+    ids = [uuid4(), uuid4()]
+    async with engine.begin() as conn:
+        for offset, task_id in enumerate(ids):
+            await conn.execute(
+                Task.__table__.insert().values(
+                    id=task_id, name=f"skip-locked-{task_id}", type=TaskType.SYSTEM_MAINTENANCE,
+                    status=TaskStatus.PENDING, parameters={}, scheduled_at=None, attempts=0,
+                    created_at=old + timedelta(seconds=offset)
+                )
+            )
+    try:
+        async with engine.connect() as other:
+            await other.execute(
+                text("SELECT id FROM tasks WHERE id = :id FOR UPDATE"), {"id": ids[0]}
+            )
+            claimed = await TaskWorker(worker_id="test-worker", listen=False).claim()
+            await other.rollback()
+        assert claimed == ids[1]
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(Task).where(Task.id.in_(ids)))
+        await engine.dispose()